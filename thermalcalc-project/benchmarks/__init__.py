@@ -0,0 +1,5 @@
+"""
+Suíte de benchmarks do ThermalCalc
+
+Execute a partir de thermalcalc-project com: python -m benchmarks --help
+"""
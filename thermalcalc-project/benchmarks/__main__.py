@@ -0,0 +1,108 @@
+"""
+Executa os benchmarks, grava o resultado em JSON e compara com a linha de base
+
+Exemplos (a partir de thermalcalc-project):
+    python -m benchmarks                       # tudo, compara com benchmarks/baseline.json
+    python -m benchmarks --group nucleo --quick
+    python -m benchmarks --save-baseline       # grava a execução como nova linha de base
+    python -m benchmarks --golden-only         # só confere o corpus de referência
+
+Sai com código 1 se houver regressão de tempo ou divergência do corpus golden.
+"""
+import argparse
+import logging
+import os
+import sys
+
+from benchmarks.golden import comparar_corpus, gerar_corpus
+from benchmarks.harness import (
+    TOLERANCIA_REGRESSAO, ambiente, carregar_json, comparar, formatar_tempo, medir, salvar_json
+)
+from benchmarks.suites import GRUPOS, criar_benchmarks
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+LINHA_DE_BASE = os.path.join(DIRETORIO, 'baseline.json')
+CORPUS_GOLDEN = os.path.join(DIRETORIO, 'golden_results.json')
+
+
+def _argumentos():
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description="Benchmarks do ThermalCalc")
+    parser.add_argument('--group', action='append', choices=sorted(GRUPOS), help="Grupo a executar (repetível)")
+    parser.add_argument('--filter', help="Executa apenas os casos cujo nome contém este texto")
+    parser.add_argument('--quick', action='store_true', help="Menos amostras (para verificação rápida)")
+    parser.add_argument('--output', help="Arquivo JSON com os resultados desta execução")
+    parser.add_argument('--baseline', default=LINHA_DE_BASE, help="Linha de base para comparação")
+    parser.add_argument('--save-baseline', action='store_true', help="Grava esta execução como linha de base")
+    parser.add_argument('--tolerance', type=float, default=TOLERANCIA_REGRESSAO,
+                        help="Aumento relativo do tempo mínimo considerado regressão (padrão: %(default)s)")
+    parser.add_argument('--no-golden', action='store_true', help="Não confere o corpus de referência")
+    parser.add_argument('--golden-only', action='store_true', help="Só confere o corpus de referência")
+    parser.add_argument('--golden-update', action='store_true', help="Regenera golden_results.json")
+    return parser.parse_args()
+
+
+def _conferir_golden(atualizar):
+    """Gera o corpus e compara com o de referência; retorna o número de divergências"""
+    corpus = gerar_corpus()
+    if atualizar or not os.path.exists(CORPUS_GOLDEN):
+        salvar_json(CORPUS_GOLDEN, corpus)
+        print(f"Corpus golden gravado em {CORPUS_GOLDEN} ({sum(len(c) for c in corpus.values())} casos)")
+        return 0
+    divergencias = comparar_corpus(corpus, carregar_json(CORPUS_GOLDEN))
+    total = sum(len(c) for c in corpus.values())
+    if divergencias:
+        print(f"Corpus golden: {len(divergencias)} divergência(s) em {total} casos")
+        for secao, chave, campo, atual, referencia in divergencias[:20]:
+            print(f"  {secao} {chave} {campo}: atual={atual!r} referência={referencia!r}")
+    else:
+        print(f"Corpus golden: {total} casos conferidos")
+    return len(divergencias)
+
+
+def main():
+    args = _argumentos()
+    # O solver registra não convergências em INFO; não polui a saída dos benchmarks
+    logging.disable(logging.INFO)
+
+    divergencias = 0
+    if not args.no_golden or args.golden_only or args.golden_update:
+        divergencias = _conferir_golden(args.golden_update)
+    if args.golden_only or args.golden_update:
+        return 1 if divergencias else 0
+
+    casos = criar_benchmarks(set(args.group) if args.group else None)
+    if args.filter:
+        casos = [c for c in casos if args.filter in c.nome]
+
+    fator_tempo = 0.25 if args.quick else 1.0
+    resultados = {}
+    for caso in casos:
+        resultados[caso.nome] = medir(caso, fator_tempo)
+        estatisticas = resultados[caso.nome]
+        print(f"{caso.nome:<45} mínimo {formatar_tempo(estatisticas['minimo']):>10}  "
+              f"mediana {formatar_tempo(estatisticas['mediana']):>10}  p95 {formatar_tempo(estatisticas['p95']):>10}  ({estatisticas['amostras']} amostras)")
+
+    execucao = {'ambiente': ambiente(), 'resultados': resultados}
+    regressoes = 0
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        comparacao = comparar(resultados, carregar_json(args.baseline), args.tolerance)
+        execucao['comparacao'] = comparacao
+        print(f"\nComparação com {os.path.relpath(args.baseline)} (tolerância {args.tolerance:.0%}):")
+        for nome, item in comparacao.items():
+            if item['status'] == 'novo':
+                print(f"  {nome:<45} novo")
+            else:
+                print(f"  {nome:<45} {item['razao']:6.2f}x  {item['status']}")
+        regressoes = sum(1 for item in comparacao.values() if item['status'] == 'regressao')
+
+    if args.output:
+        salvar_json(args.output, execucao)
+    if args.save_baseline:
+        salvar_json(args.baseline, execucao)
+        print(f"Linha de base gravada em {args.baseline}")
+
+    return 1 if regressoes or divergencias else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Corpus de resultados de referência ("golden") do núcleo de cálculo
+
+Uma grade determinística de casos (todos os materiais, duas geometrias, espessuras,
+emissividades e vento) é resolvida e comparada com golden_results.json. Assim uma
+otimização só é aceita se mantiver as respostas numéricas atuais dentro das
+tolerâncias abaixo. Mudanças intencionais no modelo físico exigem regenerar o
+corpus (python -m benchmarks --golden-update) no mesmo commit.
+"""
+import math
+
+# Tolerâncias da comparação
+TOL_TEMPERATURA = 0.01     # °C (absoluta)
+TOL_RELATIVA = 1e-4        # fluxo de calor, k(T), h_conv
+
+ESPESSURAS_MM = (25, 75)
+EMISSIVIDADES = (0.05, 0.9)
+VENTOS = (0.0, 5.0)
+DIAMETRO_TUBO_M = 0.1143
+UMIDADES = (60.0, 85.0)
+
+
+def _casos_face_fria(materiais):
+    """Casos (chave, Tq, To, L, k_func, geometria, diâmetro, emissividade, vento) da grade"""
+    for material in materiais:
+        To = 25.0
+        # Face quente a 3/4 da faixa do material (acima do ambiente) ou face fria abaixo dele
+        Tq = material['t_min'] + 0.75 * (material['t_max'] - material['t_min'])
+        if Tq <= To + 1:
+            Tq = max(material['t_min'], -40.0)
+        for geometria, diametro in (("Superfície Plana", None), ("Tubulação", DIAMETRO_TUBO_M)):
+            for L_mm in ESPESSURAS_MM:
+                for emissividade in EMISSIVIDADES:
+                    for vento in VENTOS:
+                        chave = f"{material['nome']}|{geometria}|{L_mm}mm|e={emissividade}|v={vento}"
+                        yield chave, Tq, To, L_mm / 1000, material['k_func'], geometria, diametro, emissividade, vento
+
+
+def gerar_corpus():
+    """Resolve a grade completa e retorna {secao: {chave: valores}}"""
+    from src.models.materials_internal import materials_db
+    from src.routes.thermal_calc import (
+        calcular_k, calcular_h_conv, resolver_temperatura_face_fria, resolver_multicamada,
+        encontrar_espessura_minima_condensacao, calcular_perda_sem_isolante
+    )
+
+    materiais = materials_db.get_materials()
+    corpus = {'k': {}, 'h_conv': {}, 'face_fria': {}, 'perda_sem_isolante': {}, 'condensacao': {}, 'multicamada': {}}
+
+    for material in materiais:
+        for T in (material['t_min'], (material['t_min'] + material['t_max']) / 2, material['t_max']):
+            corpus['k'][f"{material['nome']}|T={T:g}"] = {'k': calcular_k(material['k_func'], T)}
+
+    for Tf in (-10.0, 40.0, 60.0, 150.0):
+        for geometria, diametro in (("Superfície Plana", None), ("Tubulação", 0.2143)):
+            for vento in VENTOS:
+                chave = f"{geometria}|Tf={Tf:g}|v={vento}"
+                corpus['h_conv'][chave] = {'h': calcular_h_conv(Tf, 25.0, geometria, diametro, vento)}
+                if Tf > 25:
+                    corpus['perda_sem_isolante'][chave] = {
+                        'q': calcular_perda_sem_isolante(Tf, 25.0, geometria, 0.9, diametro, vento)
+                    }
+
+    for chave, Tq, To, L, k_func, geometria, diametro, emissividade, vento in _casos_face_fria(materiais):
+        Tf, q, convergiu, _ = resolver_temperatura_face_fria(Tq, To, L, k_func, geometria, emissividade, diametro, vento)
+        corpus['face_fria'][chave] = {'Tf': Tf, 'q': q, 'convergiu': convergiu}
+
+    # Condensação: materiais que suportam temperatura interna abaixo do ambiente
+    for material in materiais:
+        Ti = max(material['t_min'], -20.0)
+        if Ti >= 20:
+            continue
+        for geometria, diametro in (("Superfície Plana", None), ("Tubulação", 0.1)):
+            for umidade in UMIDADES:
+                espessura, T_orvalho = encontrar_espessura_minima_condensacao(
+                    Ti, 30.0, material['k_func'], geometria, diametro, 0.0, umidade
+                )
+                corpus['condensacao'][f"{material['nome']}|{geometria}|UR={umidade:g}"] = {
+                    'espessura': espessura, 'T_orvalho': T_orvalho
+                }
+
+    pilhas = (
+        (("Fibra Cerâmica 128kg/m³", "Lã de Rocha 64kg/m³"), (50, 50), 600.0),
+        (("Fibra Cerâmica 96kg/m³", "Lã de Rocha 48kg/m³", "Lã de Rocha 32kg/m³"), (25, 50, 25), 800.0),
+    )
+    for nomes, espessuras_mm, Tq in pilhas:
+        k_funcs = [materials_db.get_material_by_name(nome)['k_func'] for nome in nomes]
+        for geometria, diametro in (("Superfície Plana", None), ("Tubulação", DIAMETRO_TUBO_M)):
+            temperaturas, q, convergiu, _ = resolver_multicamada(
+                Tq, 25.0, [e / 1000 for e in espessuras_mm], k_funcs, geometria, 0.9, diametro
+            )
+            corpus['multicamada'][f"{' + '.join(nomes)}|{geometria}|Tq={Tq:g}"] = {
+                'temperaturas': temperaturas, 'q': q, 'convergiu': convergiu
+            }
+    return corpus
+
+
+def _difere(campo, atual, referencia):
+    """True se o valor atual está fora da tolerância da referência"""
+    if isinstance(referencia, list):
+        return not isinstance(atual, list) or len(atual) != len(referencia) or \
+            any(_difere(campo, a, r) for a, r in zip(atual, referencia))
+    if referencia is None or isinstance(referencia, (bool, str)):
+        return atual != referencia
+    if atual is None or isinstance(atual, bool):
+        return True
+    if campo.startswith('T') or campo == 'temperaturas':
+        return abs(atual - referencia) > TOL_TEMPERATURA
+    if campo == 'espessura':
+        return atual != referencia
+    return not math.isclose(atual, referencia, rel_tol=TOL_RELATIVA, abs_tol=1e-12)
+
+
+def comparar_corpus(atual, referencia):
+    """Retorna a lista de divergências [(secao, chave, campo, atual, referência)]"""
+    divergencias = []
+    for secao, casos in referencia.items():
+        casos_atuais = atual.get(secao, {})
+        for chave, valores in casos.items():
+            if chave not in casos_atuais:
+                divergencias.append((secao, chave, None, None, 'ausente'))
+                continue
+            for campo, valor in valores.items():
+                valor_atual = casos_atuais[chave].get(campo)
+                if _difere(campo, valor_atual, valor):
+                    divergencias.append((secao, chave, campo, valor_atual, valor))
+    return divergencias
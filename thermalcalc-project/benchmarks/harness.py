@@ -0,0 +1,142 @@
+"""
+Medição de tempos, relatório em JSON e comparação com a linha de base
+"""
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+# Limite padrão de regressão: tempo mais de 25% acima da linha de base
+TOLERANCIA_REGRESSAO = 0.25
+
+# Estatística comparada com a linha de base: o mínimo é a menos sensível à carga da máquina
+ESTATISTICA_COMPARADA = 'minimo'
+
+
+class Benchmark:
+    """Um caso de benchmark: função sem argumentos chamada repetidamente"""
+
+    __slots__ = ('nome', 'grupo', 'funcao', 'preparar', 'min_tempo', 'min_repeticoes')
+
+    def __init__(self, nome, grupo, funcao, preparar=None, min_tempo=0.5, min_repeticoes=5):
+        self.nome = nome
+        self.grupo = grupo
+        self.funcao = funcao
+        self.preparar = preparar
+        self.min_tempo = min_tempo
+        self.min_repeticoes = min_repeticoes
+
+
+def medir(benchmark, fator_tempo=1.0):
+    """
+    Executa o benchmark e retorna as estatísticas (segundos por chamada)
+
+    Calibra quantas chamadas cabem em ~20 ms para reduzir o ruído do relógio e
+    repete as amostras até atingir min_tempo (escalado por fator_tempo).
+    """
+    if benchmark.preparar is not None:
+        benchmark.preparar()
+    funcao = benchmark.funcao
+    funcao()  # aquecimento (caches, compilação de k(T), imports tardios)
+
+    # Calibração: chamadas por amostra
+    chamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        duracao = time.perf_counter() - inicio
+        if duracao >= 0.02 or chamadas >= 1 << 20:
+            break
+        chamadas *= 2
+
+    amostras = []
+    limite = benchmark.min_tempo * fator_tempo
+    gc_ativo = gc.isenabled()
+    gc.disable()
+    try:
+        total = 0.0
+        while len(amostras) < benchmark.min_repeticoes or total < limite:
+            inicio = time.perf_counter()
+            for _ in range(chamadas):
+                funcao()
+            duracao = time.perf_counter() - inicio
+            amostras.append(duracao / chamadas)
+            total += duracao
+    finally:
+        if gc_ativo:
+            gc.enable()
+
+    amostras.sort()
+    return {
+        'grupo': benchmark.grupo,
+        'mediana': statistics.median(amostras),
+        'minimo': amostras[0],
+        'p95': amostras[min(len(amostras) - 1, int(round(0.95 * (len(amostras) - 1))))],
+        'amostras': len(amostras),
+        'chamadasPorAmostra': chamadas
+    }
+
+
+def ambiente():
+    """Identificação da máquina e das versões, gravada junto aos resultados"""
+    try:
+        import numpy
+        versao_numpy = numpy.__version__
+    except ImportError:
+        versao_numpy = None
+    return {
+        'python': sys.version.split()[0],
+        'implementacao': platform.python_implementation(),
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'numpy': versao_numpy,
+        'data': datetime.now().isoformat(timespec='seconds')
+    }
+
+
+def comparar(resultados, linha_de_base, tolerancia=TOLERANCIA_REGRESSAO, estatistica=ESTATISTICA_COMPARADA):
+    """
+    Compara o tempo mínimo por chamada com o da linha de base
+
+    Retorna {nome: {'base', 'atual', 'razao', 'status'}} com status 'regressao',
+    'melhoria', 'estavel' ou 'novo'.
+    """
+    base = linha_de_base.get('resultados', {})
+    comparacao = {}
+    for nome, atual in resultados.items():
+        referencia = base.get(nome)
+        if referencia is None:
+            comparacao[nome] = {'base': None, 'atual': atual[estatistica], 'razao': None, 'status': 'novo'}
+            continue
+        razao = atual[estatistica] / referencia[estatistica] if referencia[estatistica] > 0 else float('inf')
+        if razao > 1 + tolerancia:
+            status = 'regressao'
+        elif razao < 1 / (1 + tolerancia):
+            status = 'melhoria'
+        else:
+            status = 'estavel'
+        comparacao[nome] = {'base': referencia[estatistica], 'atual': atual[estatistica], 'razao': razao, 'status': status}
+    return comparacao
+
+
+def formatar_tempo(segundos):
+    """Tempo legível (ns, µs, ms ou s)"""
+    for unidade, escala in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if segundos >= escala:
+            return f'{segundos / escala:.3g} {unidade}'
+    return f'{segundos / 1e-9:.3g} ns'
+
+
+def salvar_json(caminho, dados):
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(dados, arquivo, ensure_ascii=False, indent=2, sort_keys=True)
+        arquivo.write('\n')
+
+
+def carregar_json(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
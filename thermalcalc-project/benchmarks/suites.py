@@ -0,0 +1,209 @@
+"""
+Casos de benchmark: núcleo de cálculo, relatórios PDF, endpoints da API e inicialização
+
+Os casos são criados sob demanda (criar_benchmarks) para que importar o módulo
+não carregue a aplicação Flask nem o ReportLab.
+"""
+import os
+import subprocess
+import sys
+
+from benchmarks.harness import Benchmark
+
+MATERIAL_QUENTE = "Lã de Rocha 64kg/m³"
+MATERIAL_FRIO = "Espuma Elastomérica 50kg/m³"
+ACABAMENTO = "Alumínio Polido (Novo)"
+PLANA = "Superfície Plana"
+TUBO = "Tubulação"
+
+# Casos da face fria: (nome, Tq, To, L (m), material, geometria, diâmetro (m), vento (m/s))
+CASOS_FACE_FRIA = (
+    ('plana_quente', 300.0, 25.0, 0.05, MATERIAL_QUENTE, PLANA, None, 0.0),
+    ('tubo_quente', 300.0, 25.0, 0.05, MATERIAL_QUENTE, TUBO, 0.1143, 0.0),
+    ('tubo_quente_vento', 450.0, 20.0, 0.075, MATERIAL_QUENTE, TUBO, 0.2191, 5.0),
+    ('plana_fria', -20.0, 30.0, 0.03, MATERIAL_FRIO, PLANA, None, 0.0),
+    ('tubo_frio', -20.0, 30.0, 0.03, MATERIAL_FRIO, TUBO, 0.1, 0.0),
+)
+
+PAYLOAD_TERMICO = {
+    "material": MATERIAL_QUENTE, "finish": ACABAMENTO, "geometry": TUBO, "hotTemp": 300, "ambientTemp": 25,
+    "pipeDiameter": 114.3, "layerThicknesses": [50], "calculateFinancial": True,
+    "financialData": {"fuel": "Gás Natural (m³)", "area": 50}
+}
+
+PAYLOAD_MULTICAMADA = {
+    "finish": ACABAMENTO, "geometry": TUBO, "hotTemp": 600, "ambientTemp": 25, "pipeDiameter": 114.3,
+    "layerThicknesses": [50, 50], "layerMaterials": ["Fibra Cerâmica 128kg/m³", MATERIAL_QUENTE]
+}
+
+PAYLOAD_VARREDURA = {
+    "material": MATERIAL_QUENTE, "finish": ACABAMENTO, "geometry": TUBO, "hotTemp": 300, "ambientTemp": 25,
+    "pipeDiameter": 114.3, "insulationCost": 900,
+    "financialData": {"fuel": "Gás Natural (m³)", "area": 50, "hoursPerDay": 24, "daysPerWeek": 7},
+    "thicknessRange": {"start": 10, "stop": 200, "step": 5}
+}
+
+PAYLOAD_CONDENSACAO = {
+    "material": MATERIAL_FRIO, "geometry": TUBO, "internalTemp": -20, "ambientTemp": 30, "humidity": 80,
+    "pipeDiameter": 100
+}
+
+PAYLOAD_MONTECARLO = {
+    "material": MATERIAL_QUENTE, "finish": ACABAMENTO, "geometry": TUBO, "pipeDiameter": 114.3,
+    "layerThicknesses": [50], "hotTemp": {"type": "normal", "mean": 300, "std": 10},
+    "ambientTemp": {"type": "uniform", "min": 15, "max": 35},
+    "emissivity": {"type": "triangular", "min": 0.05, "mode": 0.1, "max": 0.3},
+    "windSpeed": {"type": "uniform", "min": 0, "max": 5}, "samples": 10000, "seed": 42,
+    "calculateFinancial": True, "financialData": {"fuel": "Gás Natural (m³)", "area": 50}
+}
+
+PAYLOAD_COMPARACAO = {
+    "geometry": TUBO, "hotTemp": 300, "ambientTemp": 25, "pipeDiameter": 114.3, "layerThicknesses": [50],
+    "criterion": "savings", "financialData": {"fuel": "Gás Natural (m³)", "area": 50}
+}
+
+PAYLOAD_TABELA = {"material": MATERIAL_QUENTE, "finish": ACABAMENTO, "hotTemp": 300, "ambientTemp": 25}
+
+RELATORIO_TERMICO = dict(PAYLOAD_TERMICO, results={
+    "temperatureFaceFria": 60.5, "perdaComIsolante": 0.178, "economiaMensal": 1000.5
+})
+
+RELATORIO_CONDENSACAO = dict(PAYLOAD_CONDENSACAO, results={
+    "temperaturaOrvalho": 26.2, "espessuraMinima": 39
+})
+
+
+def _itens_lote(n=1000):
+    """Itens determinísticos para o cálculo em lote (todos os materiais e acabamentos)"""
+    from src.models.materials_internal import materials_db
+
+    materiais = materials_db.get_materials()
+    acabamentos = materials_db.get_finishes()
+    itens = []
+    for i in range(n):
+        material = materiais[i % len(materiais)]
+        tubo = i % 2 == 1
+        item = {
+            "id": f"B{i}", "material": material['nome'], "finish": acabamentos[i % len(acabamentos)]['acabamento'],
+            "geometry": TUBO if tubo else PLANA,
+            "hotTemp": material['t_min'] + (material['t_max'] - material['t_min']) * ((i * 37) % 100) / 100,
+            "ambientTemp": 25, "layerThicknesses": [(25, 50, 75)[i % 3]], "windSpeed": (0, 3)[(i // 2) % 2]
+        }
+        if tubo:
+            item["pipeDiameter"] = (21.3, 114.3, 508)[i % 3]
+        itens.append(item)
+    return itens
+
+
+def benchmarks_nucleo():
+    from src.models.materials_internal import materials_db
+    from src.routes.thermal_calc import (
+        calcular_k, calcular_h_conv, encontrar_temperatura_face_fria, encontrar_espessura_minima_condensacao
+    )
+
+    k_quente = materials_db.get_material_by_name(MATERIAL_QUENTE)['k_func']
+    k_frio = materials_db.get_material_by_name(MATERIAL_FRIO)['k_func']
+    k_exp = materials_db.get_material_by_name("Manta de fibra de vidro 130Kg/m³ até 800°C")['k_func']
+    emissividade = materials_db.get_finish_by_name(ACABAMENTO)['emissividade']
+
+    casos = [
+        Benchmark('nucleo.calcular_k.polinomio', 'nucleo', lambda: calcular_k(k_quente, 162.5)),
+        Benchmark('nucleo.calcular_k.exponencial', 'nucleo', lambda: calcular_k(k_exp, 162.5)),
+        Benchmark('nucleo.calcular_h_conv.plana', 'nucleo', lambda: calcular_h_conv(60.0, 25.0, PLANA)),
+        Benchmark('nucleo.calcular_h_conv.tubo', 'nucleo', lambda: calcular_h_conv(60.0, 25.0, TUBO, 0.2143)),
+        Benchmark('nucleo.calcular_h_conv.tubo_vento', 'nucleo', lambda: calcular_h_conv(60.0, 25.0, TUBO, 0.2143, 5.0)),
+    ]
+    for nome, Tq, To, L, material, geometria, diametro, vento in CASOS_FACE_FRIA:
+        k_func = k_quente if material == MATERIAL_QUENTE else k_frio
+        casos.append(Benchmark(
+            f'nucleo.face_fria.{nome}', 'nucleo',
+            lambda Tq=Tq, To=To, L=L, k_func=k_func, geometria=geometria, diametro=diametro, vento=vento:
+                encontrar_temperatura_face_fria(Tq, To, L, k_func, geometria, emissividade, diametro, vento)
+        ))
+    casos += [
+        Benchmark('nucleo.espessura_condensacao.tubo', 'nucleo',
+                  lambda: encontrar_espessura_minima_condensacao(-20.0, 30.0, k_frio, TUBO, 0.1, 0.0, 80.0)),
+        Benchmark('nucleo.espessura_condensacao.plana', 'nucleo',
+                  lambda: encontrar_espessura_minima_condensacao(5.0, 28.0, k_frio, PLANA, None, 2.0, 85.0)),
+    ]
+    return casos
+
+
+def benchmarks_pdf():
+    from src.utils.pdf_generator import get_pdf_generator
+
+    gerador = get_pdf_generator()
+    return [
+        Benchmark('pdf.thermal', 'pdf', lambda: gerador.render_report('thermal', RELATORIO_TERMICO),
+                  min_tempo=1.0, min_repeticoes=3),
+        Benchmark('pdf.condensation', 'pdf', lambda: gerador.render_report('condensation', RELATORIO_CONDENSACAO),
+                  min_tempo=1.0, min_repeticoes=3),
+    ]
+
+
+def benchmarks_api():
+    from src.main import app
+    from src.models.thermal_engine import thermal_cache, tabela_cache
+
+    cliente = app.test_client()
+
+    def post(url, payload, limpar_cache=False, cache=thermal_cache):
+        def chamar():
+            if limpar_cache:
+                cache.clear()
+            resposta = cliente.post(url, json=payload)
+            if resposta.status_code != 200:
+                raise RuntimeError(f"{url} respondeu {resposta.status_code}: {resposta.get_data(as_text=True)[:200]}")
+        return chamar
+
+    itens = _itens_lote()
+    return [
+        Benchmark('api.thermal.cache', 'api', post('/api/calculate/thermal', PAYLOAD_TERMICO)),
+        Benchmark('api.thermal.sem_cache', 'api', post('/api/calculate/thermal', PAYLOAD_TERMICO, limpar_cache=True)),
+        Benchmark('api.thermal.multicamada', 'api',
+                  post('/api/calculate/thermal', PAYLOAD_MULTICAMADA, limpar_cache=True)),
+        Benchmark('api.thermal.sweep', 'api', post('/api/calculate/thermal/sweep', PAYLOAD_VARREDURA)),
+        Benchmark('api.thermal.batch_1000', 'api', post('/api/calculate/thermal/batch', {"items": itens}),
+                  min_tempo=1.0, min_repeticoes=3),
+        Benchmark('api.thermal.montecarlo_10000', 'api', post('/api/calculate/thermal/montecarlo', PAYLOAD_MONTECARLO),
+                  min_tempo=1.0, min_repeticoes=3),
+        Benchmark('api.thermal.compare', 'api', post('/api/calculate/thermal/compare', PAYLOAD_COMPARACAO)),
+        Benchmark('api.thermal.table', 'api', post('/api/calculate/thermal/table', PAYLOAD_TABELA)),
+        Benchmark('api.thermal.table.sem_cache', 'api',
+                  post('/api/calculate/thermal/table', PAYLOAD_TABELA, limpar_cache=True, cache=tabela_cache)),
+        Benchmark('api.condensation', 'api', post('/api/calculate/condensation', PAYLOAD_CONDENSACAO)),
+    ]
+
+
+def benchmarks_inicializacao():
+    """Cold start: import de src.main em um processo novo, sem e com o aquecimento"""
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def importar(modo):
+        def chamar():
+            ambiente = dict(os.environ, THERMALCALC_WARMUP=modo, PYTHONPATH=raiz)
+            subprocess.run([sys.executable, '-c', 'import src.main'], cwd=raiz, env=ambiente, check=True)
+        return chamar
+
+    return [
+        Benchmark('inicializacao.import', 'inicializacao', importar('off'), min_tempo=2.0, min_repeticoes=3),
+        Benchmark('inicializacao.import_aquecimento', 'inicializacao', importar('sync'),
+                  min_tempo=2.0, min_repeticoes=3),
+    ]
+
+
+GRUPOS = {
+    'nucleo': benchmarks_nucleo,
+    'pdf': benchmarks_pdf,
+    'api': benchmarks_api,
+    'inicializacao': benchmarks_inicializacao,
+}
+
+
+def criar_benchmarks(grupos=None):
+    """Instancia os casos dos grupos pedidos (todos por padrão)"""
+    casos = []
+    for nome, fabrica in GRUPOS.items():
+        if grupos is None or nome in grupos:
+            casos.extend(fabrica())
+    return casos
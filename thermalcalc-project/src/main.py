@@ -1,4 +1,7 @@
 # main.py - VERSÃO FINAL CORRIGIDA
+import time
+_inicio_import = time.perf_counter()
+
 import os
 import sys
 # ESSAS 3 LINHAS SÃO A CORREÇÃO CRÍTICA
@@ -9,23 +12,48 @@ from flask import Flask
 from flask_cors import CORS
 # Voltamos a usar o import com "src."
 from src.routes.api import api_bp
+from src.utils.warmup import estado_aquecimento, ORCAMENTO_IMPORT_MS, MODO_SINCRONO
+
+# Tempo de import dos módulos da aplicação (Flask, NumPy, catálogos, rotas)
+TEMPO_IMPORT = time.perf_counter() - _inicio_import
+
+
+def create_app(aquecimento=None, aquecimento_pdf=None):
+    """
+    Cria a aplicação Flask e executa o aquecimento de inicialização
+
+    aquecimento: 'sync' (padrão), 'background' ou 'off' (THERMALCALC_WARMUP);
+    aquecimento_pdf também pré-carrega o ReportLab e as imagens de fundo dos PDFs
+    (THERMALCALC_WARMUP_PDF=1). O estado fica disponível em /api/ready.
+    """
+    app = Flask(__name__)
+    app.config['THERMALCALC_WARMUP'] = aquecimento or os.environ.get('THERMALCALC_WARMUP', MODO_SINCRONO)
+    app.config['THERMALCALC_WARMUP_PDF'] = (aquecimento_pdf if aquecimento_pdf is not None
+                                            else os.environ.get('THERMALCALC_WARMUP_PDF') == '1')
+
+    # Configuração de CORS
+    vercel_url = os.environ.get('VERCEL_URL')
+    origins = [
+        "http://localhost:5173",
+        "http://127.0.0.1:5173",
+    ]
+    if vercel_url:
+        origins.append(f"https://{vercel_url}")
+        # ATENÇÃO: Verifique se o nome do projeto está correto aqui
+        origins.append(r"https://thermalcalc-app-.*\.vercel\.app")
+
+    CORS(app, resources={r"/api/*": {"origins": origins}})
 
-app = Flask(__name__)
+    app.register_blueprint(api_bp)
 
-# Configuração de CORS
-vercel_url = os.environ.get('VERCEL_URL')
-origins = [
-    "http://localhost:5173",
-    "http://127.0.0.1:5173",
-]
-if vercel_url:
-    origins.append(f"https://{vercel_url}")
-    # ATENÇÃO: Verifique se o nome do projeto está correto aqui
-    origins.append(r"https://thermalcalc-app-.*\.vercel\.app")
+    estado_aquecimento.registrar_import(
+        TEMPO_IMPORT, int(os.environ.get('THERMALCALC_IMPORT_BUDGET_MS', ORCAMENTO_IMPORT_MS))
+    )
+    estado_aquecimento.iniciar(app.config['THERMALCALC_WARMUP'], app.config['THERMALCALC_WARMUP_PDF'])
+    return app
 
-CORS(app, resources={r"/api/*": {"origins": origins}})
 
-app.register_blueprint(api_bp)
+app = create_app()
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 5000)), debug=os.environ.get('FLASK_DEBUG') == '1')
@@ -1,10 +1,119 @@
 import sqlite3
 import os
+import threading
+from types import MappingProxyType
+
+from src.utils.k_func import k_func_registry, KFuncError
+
+# Consultas usadas nas leituras (texto constante, reaproveitado pelo cache de statements do sqlite3)
+SQL_MATERIALS = 'SELECT id, nome, k_func, t_min, t_max FROM materials ORDER BY id'
+SQL_FINISHES = 'SELECT id, acabamento, emissividade FROM finishes ORDER BY id'
+
+# Bancos já inicializados neste processo (a DDL roda uma única vez por arquivo)
+_initialized_paths = set()
+_init_lock = threading.Lock()
 
 class MaterialsDB:
-    def __init__(self):
-        self.db_path = os.path.join(os.path.dirname(__file__), '..', 'database', 'app.db')
-        self.init_db()
+    """
+    Acesso ao SQLite de materiais e acabamentos
+
+    Cada thread mantém uma conexão persistente (modo WAL, cache de statements).
+    As leituras são servidas de um snapshot em memória, invalidado quando
+    outra conexão altera o banco (PRAGMA data_version).
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = os.path.abspath(db_path or os.path.join(os.path.dirname(__file__), '..', 'database', 'app.db'))
+        self._local = threading.local()
+        self._snapshot = None
+        self._generation = 0
+        self._snapshot_lock = threading.Lock()
+        with _init_lock:
+            if self.db_path not in _initialized_paths:
+                self.init_db()
+                _initialized_paths.add(self.db_path)
+        self.compile_k_funcs()
+
+    def compile_k_funcs(self):
+        """Compila as fórmulas k(T) cadastradas, falhando já no carregamento se alguma for inválida"""
+        # Fórmulas do banco podem ser personalizadas: ficam no cache LRU do registro, não no catálogo fixo
+        for material in self.get_materials():
+            try:
+                k_func_registry.obter(material['k_func'])
+            except KFuncError as ex:
+                raise KFuncError(f"Material '{material['nome']}': {ex}") from None
+
+    def _connection(self):
+        """Retorna a conexão persistente da thread atual (criada na primeira chamada)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, cached_statements=64)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.data_version = None
+        return conn
+
+    def close(self):
+        """Fecha a conexão da thread atual"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _check_external_changes(self, conn):
+        """Invalida o snapshot se outra conexão tiver alterado o banco desde a última leitura desta thread"""
+        data_version = conn.execute('PRAGMA data_version').fetchone()[0]
+        if self._local.data_version is not None and data_version != self._local.data_version:
+            self.invalidate()
+        self._local.data_version = data_version
+
+    def invalidate(self):
+        """Descarta o snapshot em memória (a próxima leitura recarrega do banco)"""
+        with self._snapshot_lock:
+            self._snapshot = None
+            self._generation += 1
+
+    def _get_snapshot(self):
+        """Retorna o snapshot em memória, recarregando do banco se necessário"""
+        conn = self._connection()
+        self._check_external_changes(conn)
+        with self._snapshot_lock:
+            snapshot = self._snapshot
+            generation = self._generation
+        if snapshot is not None:
+            return snapshot
+
+        materials = [
+            {
+                'id': m[0],
+                'nome': m[1],
+                'k_func': m[2],
+                't_min': m[3],
+                't_max': m[4]
+            }
+            for m in conn.execute(SQL_MATERIALS)
+        ]
+        finishes = [
+            {
+                'id': f[0],
+                'acabamento': f[1],
+                'emissividade': f[2]
+            }
+            for f in conn.execute(SQL_FINISHES)
+        ]
+        # Com nomes duplicados, a busca por nome retorna o menor id
+        snapshot = {
+            'materials': materials,
+            'finishes': finishes,
+            'materials_by_name': MappingProxyType({m['nome']: m for m in reversed(materials)}),
+            'finishes_by_name': MappingProxyType({f['acabamento']: f for f in reversed(finishes)})
+        }
+        # Um invalidate() durante a leitura torna este snapshot obsoleto: ele é usado, mas não guardado
+        with self._snapshot_lock:
+            if self._generation == generation:
+                self._snapshot = snapshot
+        return snapshot
     
     def init_db(self):
         """Inicializa o banco de dados com as tabelas necessárias"""
@@ -69,73 +178,17 @@ class MaterialsDB:
     
     def get_materials(self):
         """Retorna todos os materiais"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM materials')
-        materials = cursor.fetchall()
-        conn.close()
-        
-        return [
-            {
-                'id': m[0],
-                'nome': m[1],
-                'k_func': m[2],
-                't_min': m[3],
-                't_max': m[4]
-            }
-            for m in materials
-        ]
+        return self._get_snapshot()['materials']
     
     def get_finishes(self):
         """Retorna todos os acabamentos"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM finishes')
-        finishes = cursor.fetchall()
-        conn.close()
-        
-        return [
-            {
-                'id': f[0],
-                'acabamento': f[1],
-                'emissividade': f[2]
-            }
-            for f in finishes
-        ]
+        return self._get_snapshot()['finishes']
     
     def get_material_by_name(self, name):
         """Retorna um material específico pelo nome"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM materials WHERE nome = ?', (name,))
-        material = cursor.fetchone()
-        conn.close()
-        
-        if material:
-            return {
-                'id': material[0],
-                'nome': material[1],
-                'k_func': material[2],
-                't_min': material[3],
-                't_max': material[4]
-            }
-        return None
+        return self._get_snapshot()['materials_by_name'].get(name)
     
     def get_finish_by_name(self, name):
         """Retorna um acabamento específico pelo nome"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM finishes WHERE acabamento = ?', (name,))
-        finish = cursor.fetchone()
-        conn.close()
-        
-        if finish:
-            return {
-                'id': finish[0],
-                'acabamento': finish[1],
-                'emissividade': finish[2]
-            }
-        return None
-
-
+        return self._get_snapshot()['finishes_by_name'].get(name)
 
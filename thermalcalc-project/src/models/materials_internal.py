@@ -1,6 +1,12 @@
 # Base de dados interna de materiais isolantes e acabamentos
 # Todas as informações são armazenadas localmente para uso offline
 
+import hashlib
+import json
+from types import MappingProxyType
+
+from src.utils.k_func import k_func_registry, KFuncError
+
 MATERIALS = [
 
     # --- FIBRAS CERÂMICAS ---
@@ -209,6 +215,35 @@ COMBUSTIVEIS = {
     "Lenha de Eucalipto (ton)":          {"v": 200.00,"pc": 3500.00,"ef": 0.70, "fator_emissao": 0.05},
 }
 
+# Diâmetros externos padronizados de tubos de aço (ASME B36.10M), em mm
+TUBULACOES_NPS = [
+    {'nps': '1/2"', 'dn': 15, 'diametro_externo': 21.3},
+    {'nps': '3/4"', 'dn': 20, 'diametro_externo': 26.7},
+    {'nps': '1"', 'dn': 25, 'diametro_externo': 33.4},
+    {'nps': '1.1/4"', 'dn': 32, 'diametro_externo': 42.2},
+    {'nps': '1.1/2"', 'dn': 40, 'diametro_externo': 48.3},
+    {'nps': '2"', 'dn': 50, 'diametro_externo': 60.3},
+    {'nps': '2.1/2"', 'dn': 65, 'diametro_externo': 73.0},
+    {'nps': '3"', 'dn': 80, 'diametro_externo': 88.9},
+    {'nps': '3.1/2"', 'dn': 90, 'diametro_externo': 101.6},
+    {'nps': '4"', 'dn': 100, 'diametro_externo': 114.3},
+    {'nps': '5"', 'dn': 125, 'diametro_externo': 141.3},
+    {'nps': '6"', 'dn': 150, 'diametro_externo': 168.3},
+    {'nps': '8"', 'dn': 200, 'diametro_externo': 219.1},
+    {'nps': '10"', 'dn': 250, 'diametro_externo': 273.0},
+    {'nps': '12"', 'dn': 300, 'diametro_externo': 323.8},
+    {'nps': '14"', 'dn': 350, 'diametro_externo': 355.6},
+    {'nps': '16"', 'dn': 400, 'diametro_externo': 406.4},
+    {'nps': '18"', 'dn': 450, 'diametro_externo': 457.0},
+    {'nps': '20"', 'dn': 500, 'diametro_externo': 508.0},
+    {'nps': '24"', 'dn': 600, 'diametro_externo': 610.0},
+]
+
+# Espessuras comerciais de mantas, placas e calhas (frações de polegada, mm); o
+# arredondamento comercial do dimensionamento (thermal_calc.espessura_comercial) usa as mesmas
+ESPESSURAS_COMERCIAIS_MM = (13, 19, 25, 32, 38, 51, 64, 76, 89, 102, 114, 127, 152, 178, 203, 229, 254, 305)
+ESPESSURAS_COMERCIAIS = list(ESPESSURAS_COMERCIAIS_MM)
+
 class MaterialsDatabase:
     """Classe para gerenciar a base de dados de materiais e acabamentos"""
     
@@ -216,6 +251,35 @@ class MaterialsDatabase:
         self.materials = MATERIALS
         self.finishes = FINISHES
         self.fuels = COMBUSTIVEIS
+        self.pipes = TUBULACOES_NPS
+        self.thicknesses = ESPESSURAS_COMERCIAIS
+        self.compile_k_funcs()
+        self.build_indexes()
+        self.serialize_catalogs()
+
+    def compile_k_funcs(self):
+        """Compila as fórmulas k(T) do catálogo, falhando já no carregamento se alguma for inválida"""
+        for material in self.materials:
+            try:
+                k_func_registry.registrar(material['k_func'])
+            except KFuncError as ex:
+                raise KFuncError(f"Material '{material['nome']}': {ex}") from None
+
+    def build_indexes(self):
+        """Cria índices imutáveis nome -> registro para buscas em O(1)"""
+        self._materials_by_name = MappingProxyType({m['nome']: m for m in self.materials})
+        self._finishes_by_name = MappingProxyType({f['acabamento']: f for f in self.finishes})
+        self._pipes_by_nps = MappingProxyType({p['nps']: p for p in self.pipes})
+
+    def serialize_catalogs(self):
+        """Pré-serializa as respostas dos catálogos (bytes JSON + ETag forte)"""
+        catalogs = {'materials': self.materials, 'finishes': self.finishes, 'fuels': self.fuels,
+                    'pipes': {'tubulacoes': self.pipes, 'espessuras': self.thicknesses}}
+        self._catalog_json = {}
+        for name, data in catalogs.items():
+            body = json.dumps({"success": True, "data": data}, ensure_ascii=False, sort_keys=True,
+                              separators=(',', ':')).encode('utf-8')
+            self._catalog_json[name] = (body, hashlib.sha256(body).hexdigest()[:32])
     
     def get_materials(self):
         """Retorna lista de materiais disponíveis"""
@@ -228,25 +292,34 @@ class MaterialsDatabase:
     def get_fuels(self):
         """Retorna lista de combustíveis disponíveis"""
         return self.fuels
+
+    def get_catalog_json(self, name):
+        """Retorna (bytes JSON, ETag) pré-serializados de um catálogo ('materials', 'finishes', 'fuels' ou 'pipes')"""
+        return self._catalog_json[name]
     
     def get_material_by_name(self, name):
         """Busca material por nome"""
-        for material in self.materials:
-            if material['nome'] == name:
-                return material
-        return None
+        return self._materials_by_name.get(name) if isinstance(name, str) else None
     
     def get_finish_by_name(self, name):
         """Busca acabamento por nome"""
-        for finish in self.finishes:
-            if finish['acabamento'] == name:
-                return finish
-        return None
+        return self._finishes_by_name.get(name) if isinstance(name, str) else None
     
     def get_fuel_by_name(self, name):
         """Busca combustível por nome"""
         return self.fuels.get(name, None)
 
+    def get_pipes(self):
+        """Retorna os diâmetros padronizados de tubulação (NPS)"""
+        return self.pipes
+
+    def get_thicknesses(self):
+        """Retorna as espessuras comerciais de isolante (mm)"""
+        return self.thicknesses
+
+    def get_pipe_by_nps(self, nps):
+        """Busca tubulação pela designação NPS (ex.: '4"')"""
+        return self._pipes_by_nps.get(nps) if isinstance(nps, str) else None
+
 # Instância global para uso na aplicação
 materials_db = MaterialsDatabase()
-
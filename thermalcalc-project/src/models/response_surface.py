@@ -0,0 +1,385 @@
+"""
+Índice de superfícies de resposta por (material, acabamento, geometria)
+
+Para cada combinação do catálogo a temperatura da face fria é tabelada numa grade
+(Tq, To, espessura[, diâmetro]) resolvida pelo solver vetorizado. A grandeza
+tabelada é log θ, com θ = (Tf - To)/(Tq - To), quase linear em log(espessura) e
+bem mais suave que Tf. Consultas dentro da grade são respondidas por interpolação
+multilinear; o erro da interpolação é
+medido na montagem no centro de cada célula (onde ele é máximo) e fica gravado
+junto com a tabela. Consultas fora da grade, com vento ou em células com erro
+acima da tolerância voltam para o solve exato.
+
+As tabelas são montadas em segundo plano na primeira consulta de cada combinação
+e gravadas como arrays .npy em THERMALCALC_SUPERFICIE_DIR; outros workers as
+abrem com mmap, sem recalcular. O índice fica desligado se a variável não estiver
+definida. Para montar todas as combinações de uma vez:
+
+    python -m src.models.response_surface [diretório]
+"""
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from src.models.materials_internal import materials_db
+from src.routes.thermal_calc import calcular_h_conv, SIGMA, METODO_PADRAO
+from src.routes.thermal_calc_vetorial import (
+    resolver_face_fria_vetorial,
+    calcular_h_conv_vetorial,
+    GEOMETRIA_PLANA,
+    GEOMETRIAS
+)
+from src.utils.k_func import normalizar_k_func
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+METODO_SUPERFICIE = "superficie"
+
+# Versão do formato e do modelo físico: mudanças no solver exigem incrementar
+VERSAO = 1
+
+# Tolerâncias para aceitar a interpolação de uma célula
+TOLERANCIA_TF = 0.05            # °C
+TOLERANCIA_Q_RELATIVA = 5e-3    # perda com isolante
+
+# Células a menos disto de Tq = To não são usadas: lá h_conv natural ~ ΔT^¼ torna θ
+# irregular e o erro no centro da célula não representa a célula (°C)
+DELTA_T_MINIMO = 15.0
+
+# Eixos: (nome, transformação, mínimo, máximo, pontos); Tq usa a faixa do material
+PASSO_TQ = 25.0
+EIXO_TO = ('To', 'lin', -10.0, 50.0, 13)
+EIXO_ESPESSURA = ('L', 'log', 0.010, 0.300, 48)
+EIXO_DIAMETRO = ('D', 'log', 0.015, 1.100, 24)
+
+superficie_consultas = metrics.counter(
+    'thermalcalc_superficie_consultas_total',
+    'Consultas ao índice de superfícies de resposta',
+    rotulos=('resultado',)
+)
+
+
+def _eixo_tq(t_min, t_max):
+    pontos = max(2, int(math.ceil((t_max - t_min) / PASSO_TQ)) + 1)
+    return ('Tq', 'lin', float(t_min), float(t_max), pontos)
+
+
+def _transformar(tipo, x):
+    return np.log(x) if tipo == 'log' else x
+
+
+def _nos(eixo):
+    _, tipo, lo, hi, n = eixo
+    if tipo == 'log':
+        return np.exp(np.linspace(math.log(lo), math.log(hi), n))
+    return np.linspace(lo, hi, n)
+
+
+def _q_superficie(Tf, To, plana, outer_diameter_m, emissividade):
+    """Perda pela superfície externa (W/m²) para uma Tf, sem vento (vetorizado)"""
+    h_conv = calcular_h_conv_vetorial(Tf, To, plana, outer_diameter_m, 0.0)
+    return h_conv * (Tf - To) + emissividade * SIGMA * ((Tf + 273.15)**4 - (To + 273.15)**4)
+
+
+class SuperficieResposta:
+    """
+    Tabela de log θ de uma combinação (k_func, emissividade, geometria)
+
+    log_theta tem um valor por nó da grade; erro_tf (°C) e erro_q (relativo) têm um
+    valor por célula. Os arrays podem ser memmaps somente leitura.
+    """
+
+    def __init__(self, eixos, log_theta, erro_tf, erro_q, emissividade, geometry):
+        self.eixos = [tuple(e) for e in eixos]
+        self.log_theta = log_theta
+        self.erro_tf = erro_tf
+        self.erro_q = erro_q
+        self.emissividade = emissividade
+        self.geometry = geometry
+        self.plana = geometry == GEOMETRIA_PLANA
+
+        self._inicio = [float(_transformar(t, lo)) for _, t, lo, _, _ in self.eixos]
+        self._passo = [(float(_transformar(t, hi)) - a) / (n - 1)
+                       for (_, t, _, hi, n), a in zip(self.eixos, self._inicio)]
+        self._n = [n for *_, n in self.eixos]
+        self._plano = np.asarray(log_theta).reshape(-1)
+        estrides = np.array([int(np.prod(self._n[i + 1:])) for i in range(len(self._n))])
+        self._cantos = np.array(list(itertools.product((0, 1), repeat=len(self._n))))
+        self._deslocamentos = self._cantos @ estrides
+        self._estrides = estrides
+
+    @classmethod
+    def construir(cls, k_func, emissividade, geometry, t_min, t_max):
+        """Resolve a grade e mede o erro da interpolação no centro de cada célula"""
+        eixos = [_eixo_tq(t_min, t_max), EIXO_TO, EIXO_ESPESSURA]
+        if geometry != GEOMETRIA_PLANA:
+            eixos.append(EIXO_DIAMETRO)
+
+        nos = [_nos(e) for e in eixos]
+        log_theta = cls._resolver(nos, k_func, emissividade, geometry)[1].reshape([len(n) for n in nos])
+        superficie = cls(eixos, log_theta, None, None, emissividade, geometry)
+
+        # Centros das células: transformados de volta para as variáveis físicas
+        centros = []
+        for n, (_, tipo, *_) in zip(nos, eixos):
+            c = (_transformar(tipo, n[:-1]) + _transformar(tipo, n[1:])) / 2
+            centros.append(np.exp(c) if tipo == 'log' else c)
+        forma_celulas = [len(c) for c in centros]
+        pontos = [m.ravel() for m in np.meshgrid(*centros, indexing='ij')]
+        exato = cls._resolver(centros, k_func, emissividade, geometry)[0]
+        aproximado = superficie.Tf_vetorial(*pontos)
+
+        To, L = pontos[1], pontos[2]
+        D = pontos[3] if len(pontos) > 3 else np.full_like(L, np.nan)
+        diametro_externo = L if superficie.plana else D + 2 * L
+        with np.errstate(all='ignore'):
+            q_exato = _q_superficie(exato, To, superficie.plana, diametro_externo, emissividade)
+            q_aproximado = _q_superficie(aproximado, To, superficie.plana, diametro_externo, emissividade)
+            erro_tf = np.abs(aproximado - exato)
+            erro_q = np.abs(q_aproximado / q_exato - 1)
+        # Células com nó ou centro sem solução nunca são usadas (q nulo só com Tq = To, sem erro)
+        erro_tf = np.where(np.isfinite(erro_tf), erro_tf, np.inf)
+        erro_q = np.where(np.isfinite(erro_q), erro_q, np.where(erro_tf == 0, 0.0, np.inf))
+        # Distância mínima entre Tq e To dentro de cada célula
+        Tq_lo, Tq_hi = nos[0][:-1, None], nos[0][1:, None]
+        To_lo, To_hi = nos[1][None, :-1], nos[1][None, 1:]
+        delta_min = np.maximum(np.maximum(Tq_lo - To_hi, To_lo - Tq_hi), 0.0)
+        proxima = np.broadcast_to((delta_min < DELTA_T_MINIMO).reshape(delta_min.shape + (1,) * (len(nos) - 2)),
+                                  forma_celulas).ravel()
+        erro_tf = np.where(proxima, np.inf, erro_tf)
+        erro_q = np.where(proxima, np.inf, erro_q)
+        superficie.erro_tf = erro_tf.reshape(forma_celulas).astype(np.float32)
+        superficie.erro_q = erro_q.reshape(forma_celulas).astype(np.float32)
+        return superficie
+
+    @staticmethod
+    def _resolver(eixos_reais, k_func, emissividade, geometry):
+        """(Tf, log θ) exatos em todos os pontos da malha (NaN onde o solver não convergiu)"""
+        Tq, To, L, *D = [m.ravel() for m in np.meshgrid(*eixos_reais, indexing='ij')]
+        # Com Tq = To θ é o limite para Tq -> To: resolve com um pequeno afastamento
+        Tq_theta = np.where(Tq == To, To + 0.01, Tq)
+        Tf, _, convergiu, _ = resolver_face_fria_vetorial(Tq_theta, To, L, k_func, geometry, emissividade,
+                                                         D[0] if D else None, 0.0)
+        Tf = np.where(convergiu, Tf, np.nan)
+        with np.errstate(all='ignore'):
+            log_theta = np.log((Tf - To) / (Tq_theta - To))
+        return np.where(Tq == To, To, Tf), log_theta
+
+    def _posicoes(self, argumentos):
+        posicoes = []
+        for valor, (_, tipo, *_), a, p in zip(argumentos, self.eixos, self._inicio, self._passo):
+            with np.errstate(divide='ignore', invalid='ignore'):
+                posicoes.append((_transformar(tipo, np.asarray(valor, dtype=float)) - a) / p)
+        return posicoes
+
+    def Tf_vetorial(self, Tq, To, *argumentos):
+        """Tf interpolada por raia (NaN fora da grade)"""
+        posicoes = self._posicoes((Tq, To) + argumentos)
+        dentro = np.ones(np.shape(posicoes[0]), dtype=bool)
+        indices, fracoes = [], []
+        for posicao, n in zip(posicoes, self._n):
+            dentro &= (posicao >= 0) & (posicao <= n - 1)
+            posicao = np.clip(np.nan_to_num(posicao), 0, n - 1)
+            i = np.minimum(posicao.astype(np.intp), n - 2)
+            indices.append(i)
+            fracoes.append(posicao - i)
+        base = sum(i * s for i, s in zip(indices, self._estrides))
+        fracoes = np.stack(fracoes, axis=-1)[..., None, :]
+        pesos = np.prod(np.where(self._cantos, fracoes, 1 - fracoes), axis=-1)
+        valores = self._plano[base[..., None] + self._deslocamentos]
+        theta = np.exp(np.sum(pesos * valores, axis=-1))
+        return np.where(dentro, To + theta * (np.asarray(Tq) - To), np.nan)
+
+    def consultar(self, Tq, To, L, D=None, tolerancia_tf=TOLERANCIA_TF, tolerancia_q=TOLERANCIA_Q_RELATIVA):
+        """
+        Interpola um caso: retorna (Tf, q, erro_tf) ou uma string com o motivo da recusa
+
+        Motivos: 'fora_da_grade' ou 'erro_alto' (erro estimado da célula acima da tolerância).
+        """
+        argumentos = (Tq, To, L) if self.plana else (Tq, To, L, D)
+        indices, fracoes = [], []
+        for valor, (_, tipo, *_), a, p, n in zip(argumentos, self.eixos, self._inicio, self._passo, self._n):
+            if valor is None or (tipo == 'log' and valor <= 0):
+                return 'fora_da_grade'
+            posicao = ((math.log(valor) if tipo == 'log' else valor) - a) / p
+            if not 0 <= posicao <= n - 1:
+                return 'fora_da_grade'
+            i = min(int(posicao), n - 2)
+            indices.append(i)
+            fracoes.append(posicao - i)
+
+        celula = tuple(indices)
+        erro_tf = float(self.erro_tf[celula])
+        if erro_tf > tolerancia_tf or float(self.erro_q[celula]) > tolerancia_q:
+            return 'erro_alto'
+
+        base = int(np.dot(indices, self._estrides))
+        valores = self._plano[base + self._deslocamentos]
+        pesos = np.prod(np.where(self._cantos, fracoes, np.subtract(1, fracoes)), axis=1)
+        Tf = To + math.exp(float(np.dot(pesos, valores))) * (Tq - To)
+        if not math.isfinite(Tf):
+            return 'erro_alto'
+
+        diametro_externo = L if self.plana else D + 2 * L
+        h_conv = calcular_h_conv(Tf, To, self.geometry, diametro_externo, 0)
+        q = h_conv * (Tf - To) + self.emissividade * SIGMA * ((Tf + 273.15)**4 - (To + 273.15)**4)
+        return Tf, q, erro_tf
+
+    def salvar(self, diretorio, nome, metadados):
+        """Grava os arrays (.npy) e os metadados (.json, por último: marca a tabela como completa)"""
+        os.makedirs(diretorio, exist_ok=True)
+        for sufixo, array in (('log_theta', self.log_theta), ('erro_tf', self.erro_tf), ('erro_q', self.erro_q)):
+            caminho = os.path.join(diretorio, f'{nome}.{sufixo}.npy')
+            with open(caminho + '.tmp', 'wb') as arquivo:
+                np.save(arquivo, np.ascontiguousarray(array))
+            os.replace(caminho + '.tmp', caminho)
+        caminho = os.path.join(diretorio, f'{nome}.json')
+        with open(caminho + '.tmp', 'w', encoding='utf-8') as arquivo:
+            json.dump(dict(metadados, versao=VERSAO, eixos=self.eixos), arquivo, ensure_ascii=False)
+        os.replace(caminho + '.tmp', caminho)
+
+    @classmethod
+    def carregar(cls, diretorio, nome, emissividade, geometry):
+        """Abre uma tabela gravada (arrays em mmap somente leitura) ou retorna None"""
+        try:
+            with open(os.path.join(diretorio, f'{nome}.json'), encoding='utf-8') as arquivo:
+                metadados = json.load(arquivo)
+            if metadados.get('versao') != VERSAO:
+                return None
+            arrays = [np.load(os.path.join(diretorio, f'{nome}.{sufixo}.npy'), mmap_mode='r')
+                      for sufixo in ('log_theta', 'erro_tf', 'erro_q')]
+        except (OSError, ValueError):
+            return None
+        return cls(metadados['eixos'], *arrays, emissividade, geometry)
+
+
+class IndiceSuperficies:
+    """
+    Superfícies de resposta das combinações do catálogo, carregadas ou montadas sob demanda
+
+    consultar(caso) responde um CasoTermico elegível (uma camada, sem vento, solver
+    padrão, material e acabamento do catálogo) ou retorna None para o solve exato.
+    Combinações ainda sem tabela são enfileiradas para montagem em segundo plano.
+    """
+
+    def __init__(self, diretorio, tolerancia_tf=TOLERANCIA_TF, tolerancia_q=TOLERANCIA_Q_RELATIVA):
+        self.diretorio = diretorio
+        self.tolerancia_tf = tolerancia_tf
+        self.tolerancia_q = tolerancia_q
+        self._superficies = {}
+        self._pendentes = set()
+        self._catalogo = None
+        self._lock = threading.Lock()
+        self._executor = None
+
+    @property
+    def ativo(self):
+        return bool(self.diretorio)
+
+    def _combinacoes(self):
+        """{(k_func normalizada, emissividade): (material, acabamento)} do catálogo"""
+        if self._catalogo is None:
+            self._catalogo = {
+                (normalizar_k_func(m['k_func']), float(a['emissividade'])): (m, a)
+                for m in materials_db.get_materials() for a in materials_db.get_finishes()
+            }
+        return self._catalogo
+
+    @staticmethod
+    def _nome(material, acabamento, geometry):
+        identificacao = json.dumps([VERSAO, normalizar_k_func(material['k_func']), float(acabamento['emissividade']),
+                                    geometry, material['t_min'], material['t_max'], PASSO_TQ, EIXO_TO,
+                                    EIXO_ESPESSURA, EIXO_DIAMETRO])
+        return hashlib.sha1(identificacao.encode('utf-8')).hexdigest()[:20]
+
+    def obter(self, material, acabamento, geometry, construir=True):
+        """Superfície da combinação: memória, disco ou (com construir) montagem em segundo plano"""
+        nome = self._nome(material, acabamento, geometry)
+        superficie = self._superficies.get(nome)
+        if superficie is not None:
+            return superficie
+        superficie = SuperficieResposta.carregar(self.diretorio, nome, acabamento['emissividade'], geometry)
+        if superficie is not None:
+            self._superficies[nome] = superficie
+            return superficie
+        if construir:
+            with self._lock:
+                if nome in self._pendentes:
+                    return None
+                self._pendentes.add(nome)
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='superficie')
+            self._executor.submit(self._construir, nome, material, acabamento, geometry)
+        return None
+
+    def _construir(self, nome, material, acabamento, geometry):
+        try:
+            superficie = SuperficieResposta.construir(
+                material['k_func'], acabamento['emissividade'], geometry, material['t_min'], material['t_max']
+            )
+            superficie.salvar(self.diretorio, nome, {
+                'material': material['nome'], 'acabamento': acabamento['acabamento'], 'geometry': geometry,
+                'k_func': material['k_func'], 'emissividade': acabamento['emissividade']
+            })
+            self._superficies[nome] = superficie
+            return superficie
+        except Exception as ex:
+            logger.warning("Falha ao montar superfície de resposta %s (%s, %s, %s): %s",
+                           nome, material['nome'], acabamento['acabamento'], geometry, ex)
+            return None
+        finally:
+            with self._lock:
+                self._pendentes.discard(nome)
+
+    def consultar(self, caso):
+        """(Tf, q, erro_tf) interpolados para o caso, ou None se ele deve ser resolvido exatamente"""
+        if not self.ativo or caso.multicamada or caso.wind_speed_ms or caso.metodo != METODO_PADRAO \
+                or caso.geometry not in GEOMETRIAS:
+            return None
+        combinacao = self._combinacoes().get((normalizar_k_func(caso.k_funcs[0]), float(caso.emissividade)))
+        if combinacao is None:
+            return None
+
+        superficie = self.obter(*combinacao, caso.geometry)
+        if superficie is None:
+            superficie_consultas.inc(resultado='indisponivel')
+            return None
+        resposta = superficie.consultar(caso.Tq, caso.To, caso.L_total, caso.pipe_diameter_m,
+                                        self.tolerancia_tf, self.tolerancia_q)
+        if isinstance(resposta, str):
+            superficie_consultas.inc(resultado=resposta)
+            return None
+        superficie_consultas.inc(resultado='interpolado')
+        return resposta
+
+    def construir_todas(self):
+        """Monta (no processo atual) as superfícies que ainda não estão gravadas; retorna quantas montou"""
+        montadas = 0
+        for material, acabamento in self._combinacoes().values():
+            for geometry in GEOMETRIAS:
+                if self.obter(material, acabamento, geometry, construir=False) is None:
+                    nome = self._nome(material, acabamento, geometry)
+                    if self._construir(nome, material, acabamento, geometry) is not None:
+                        montadas += 1
+        return montadas
+
+
+# Índice global (desligado sem THERMALCALC_SUPERFICIE_DIR)
+indice_superficies = IndiceSuperficies(os.environ.get('THERMALCALC_SUPERFICIE_DIR', ''))
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    diretorio = sys.argv[1] if len(sys.argv) > 1 else indice_superficies.diretorio
+    if not diretorio:
+        sys.exit("Informe o diretório (argumento ou THERMALCALC_SUPERFICIE_DIR)")
+    print(f"{IndiceSuperficies(diretorio).construir_todas()} superfícies montadas em {diretorio}")
@@ -0,0 +1,1128 @@
+"""
+Motor de cálculo térmico: ponto único de entrada para a API, os relatórios PDF e ThermalCalculations
+
+Casos e resultados são dataclasses com __slots__. A física fica em
+src/routes/thermal_calc.py (solve escalar e multicamadas) e em
+src/routes/thermal_calc_vetorial.py (lotes); o cache dos resultados físicos, o
+catálogo de combustíveis e a etapa financeira ficam aqui, uma única vez.
+"""
+import math
+import os
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.models.materials_internal import materials_db, COMBUSTIVEIS, ESPESSURAS_COMERCIAIS_MM
+from src.models.response_surface import indice_superficies, METODO_SUPERFICIE
+from src.routes.thermal_calc import (
+    resolver_temperatura_face_fria,
+    resolver_multicamada,
+    calcular_perda_sem_isolante,
+    calcular_economia_financeira,
+    calcular_volume_isolante,
+    calcular_indicadores_investimento,
+    varrer_espessuras,
+    encontrar_espessura_minima_condensacao,
+    calcular_temperatura_orvalho,
+    dimensionar_espessura_minima,
+    espessura_comercial,
+    ESPESSURA_MAX_CONDENSACAO_MM,
+    ESPESSURA_MAX_PROJETO_MM,
+    METODO_MULTICAMADA,
+    METODOS_SOLVER,
+    METODO_PADRAO
+)
+from src.routes.thermal_calc_vetorial import (
+    resolver_face_fria_vetorial,
+    calcular_perda_sem_isolante_vetorial,
+    GEOMETRIA_PLANA,
+    GEOMETRIA_TUBO,
+    GEOMETRIAS,
+    METODO_VETORIAL
+)
+from src.utils.cache import LRUTTLCache, canonizar_float
+from src.utils.k_func import normalizar_k_func
+
+COMBUSTIVEL_PADRAO = "Eletricidade (kWh)"
+
+# Nomes da antiga tabela de ThermalCalculations -> nome no catálogo COMBUSTIVEIS
+ALIASES_COMBUSTIVEL = {
+    "Óleo BPF (kg)": "Óleo Combustível BPF (kg)",
+    "Lenha Eucalipto 30% umidade (ton)": "Lenha de Eucalipto (ton)",
+}
+
+# Cache dos resultados físicos (independe dos dados financeiros)
+thermal_cache = LRUTTLCache(
+    'thermal',
+    tamanho_maximo=int(os.environ.get('THERMALCALC_CACHE_SIZE', 4096)),
+    ttl=float(os.environ.get('THERMALCALC_CACHE_TTL', 3600))
+)
+
+
+# Cache das tabelas de projeto (NPS × espessura) por material, acabamento e condição
+tabela_cache = LRUTTLCache(
+    'design_table',
+    tamanho_maximo=int(os.environ.get('THERMALCALC_TABLE_CACHE_SIZE', 256)),
+    ttl=float(os.environ.get('THERMALCALC_CACHE_TTL', 3600))
+)
+
+
+class EntradaInvalida(ValueError):
+    """Dados de entrada inválidos ou caso sem solução (mensagem pronta para o cliente)"""
+
+
+class CombustivelDesconhecido(EntradaInvalida):
+    """Combustível de financialData fora do catálogo"""
+
+
+@dataclass(slots=True, frozen=True)
+class CasoTermico:
+    """Entradas físicas de um cálculo: camadas da face quente para a fria, espessuras em metros"""
+    Tq: float
+    To: float
+    espessuras_m: tuple
+    k_funcs: tuple
+    geometry: str
+    emissividade: float
+    pipe_diameter_m: float = None
+    wind_speed_ms: float = 0.0
+    metodo: str = METODO_PADRAO
+
+    @property
+    def L_total(self):
+        return sum(self.espessuras_m)
+
+    @property
+    def multicamada(self):
+        return len(self.espessuras_m) > 1
+
+    def chave(self):
+        """Chave do cache térmico: apenas as entradas físicas normalizadas"""
+        if self.multicamada:
+            return (
+                tuple(normalizar_k_func(k) for k in self.k_funcs),
+                tuple(canonizar_float(L) for L in self.espessuras_m),
+                canonizar_float(self.emissividade),
+                self.geometry,
+                canonizar_float(self.Tq),
+                canonizar_float(self.To),
+                canonizar_float(self.pipe_diameter_m),
+                canonizar_float(self.wind_speed_ms),
+                METODO_MULTICAMADA
+            )
+        return (
+            normalizar_k_func(self.k_funcs[0]),
+            canonizar_float(self.emissividade),
+            self.geometry,
+            canonizar_float(self.Tq),
+            canonizar_float(self.To),
+            canonizar_float(self.L_total),
+            canonizar_float(self.pipe_diameter_m),
+            canonizar_float(self.wind_speed_ms),
+            self.metodo
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class ResultadoTermico:
+    """
+    Resultado físico (W/m²); temperaturas são as das interfaces e a da face fria
+
+    erro_estimado (°C) só existe nas respostas interpoladas do índice de superfícies.
+    """
+    Tf: float
+    q_com: float
+    q_sem: float
+    convergiu: bool
+    iteracoes: int
+    temperaturas: tuple
+    metodo: str
+    erro_estimado: float = None
+
+    @property
+    def perda_com_kw(self):
+        return self.q_com / 1000
+
+    @property
+    def perda_sem_kw(self):
+        return self.q_sem / 1000
+
+
+@dataclass(slots=True, frozen=True)
+class DadosFinanceiros:
+    """Parâmetros da etapa financeira, com os dados do combustível já resolvidos no catálogo"""
+    combustivel: str
+    valor_combustivel: float
+    pc: float
+    ef: float
+    fator_emissao: float
+    area_m2: float = 10
+    horas_dia: float = 8
+    dias_semana: float = 5
+
+    @classmethod
+    def de_requisicao(cls, financial_data):
+        """
+        Monta a partir do 'financialData' da API
+
+        Levanta EntradaInvalida se financialData não for um objeto, se o combustível
+        não existir ou se fuelCost, area, hoursPerDay ou daysPerWeek não forem numéricos.
+        """
+        if not isinstance(financial_data, dict):
+            raise EntradaInvalida("financialData deve ser um objeto JSON")
+
+        def numero(campo, padrao):
+            valor = _numero_opcional(financial_data, campo)
+            return padrao if valor is None else financial_data[campo]
+
+        nome = financial_data.get('fuel', COMBUSTIVEL_PADRAO)
+        nome = ALIASES_COMBUSTIVEL.get(nome, nome)
+        combustivel = COMBUSTIVEIS.get(nome) if isinstance(nome, str) else None
+        if combustivel is None:
+            raise CombustivelDesconhecido("Combustível não encontrado")
+        return cls(
+            combustivel=nome,
+            valor_combustivel=numero('fuelCost', combustivel['v']),
+            pc=combustivel['pc'],
+            ef=combustivel['ef'],
+            fator_emissao=combustivel['fator_emissao'],
+            area_m2=numero('area', 10),
+            horas_dia=numero('hoursPerDay', 8),
+            dias_semana=numero('daysPerWeek', 5)
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class ResultadoFinanceiro:
+    economia_mensal: float
+    economia_anual: float
+    co2_ton_ano: float
+    reducao_pct: float
+    economia_kwh_ano: float
+
+
+def resolver(caso):
+    """
+    Ponto único de entrada do solver: resolve um caso (uma ou várias camadas)
+
+    Casos cobertos pelo índice de superfícies (quando ativo) são interpolados; os
+    demais vão para o solve exato. Retorna (ResultadoTermico, 'HIT' | 'MISS').
+    Só resultados convergidos entram no cache.
+    """
+    chave = caso.chave()
+    resultado = thermal_cache.get(chave)
+    if resultado is not None:
+        return resultado, 'HIT'
+
+    interpolado = indice_superficies.consultar(caso)
+    if interpolado is not None:
+        Tf, q_com, erro = interpolado
+        q_sem = calcular_perda_sem_isolante(caso.Tq, caso.To, caso.geometry, caso.emissividade,
+                                            caso.pipe_diameter_m, caso.wind_speed_ms)
+        resultado = ResultadoTermico(Tf, q_com, q_sem, True, 0, (Tf,), METODO_SUPERFICIE, erro)
+        thermal_cache.set(chave, resultado)
+        return resultado, 'MISS'
+
+    if caso.multicamada:
+        metodo = METODO_MULTICAMADA
+        temperaturas, q_com, convergiu, iteracoes = resolver_multicamada(
+            caso.Tq, caso.To, list(caso.espessuras_m), list(caso.k_funcs), caso.geometry, caso.emissividade,
+            caso.pipe_diameter_m, caso.wind_speed_ms
+        )
+        Tf = temperaturas[-1] if convergiu else None
+    else:
+        metodo = caso.metodo
+        Tf, q_com, convergiu, iteracoes = resolver_temperatura_face_fria(
+            caso.Tq, caso.To, caso.L_total, caso.k_funcs[0], caso.geometry, caso.emissividade,
+            caso.pipe_diameter_m, caso.wind_speed_ms, metodo=metodo
+        )
+        temperaturas = [Tf]
+
+    if not convergiu:
+        return ResultadoTermico(None, None, None, False, iteracoes, (), metodo), 'MISS'
+
+    q_sem = calcular_perda_sem_isolante(caso.Tq, caso.To, caso.geometry, caso.emissividade, caso.pipe_diameter_m,
+                                        caso.wind_speed_ms)
+    resultado = ResultadoTermico(Tf, q_com, q_sem, True, iteracoes, tuple(temperaturas), metodo)
+    thermal_cache.set(chave, resultado)
+    return resultado, 'MISS'
+
+
+def perda_sem_isolante_vetorial(Tq, To, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0.0):
+    """Perda da superfície nua (W/m²) por raia (escalares são expandidos)"""
+    Tq, To, geometry, emissividade, pipe_diameter_m, wind_speed_ms = np.broadcast_arrays(
+        np.asarray(Tq, dtype=float), np.asarray(To, dtype=float), np.asarray(geometry, dtype=object),
+        np.asarray(emissividade, dtype=float), np.asarray(np.nan if pipe_diameter_m is None else pipe_diameter_m, dtype=float),
+        np.asarray(wind_speed_ms, dtype=float)
+    )
+    return calcular_perda_sem_isolante_vetorial(Tq.ravel(), To.ravel(), (geometry == GEOMETRIA_PLANA).ravel(),
+                                                pipe_diameter_m.ravel(), emissividade.ravel(), wind_speed_ms.ravel())
+
+
+def resolver_vetorial(Tq, To, L_total, k_funcs, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0.0,
+                     Tf_inicial=None, k_multiplicador=1.0, perda_sem=True):
+    """
+    Solve vetorizado sem cache: uma raia por elemento (escalares são expandidos)
+
+    Usado por resolver_lote e pelos cálculos em lote do motor (Monte Carlo,
+    simulação anual). Retorna (Tf, q_com, q_sem, convergiu, iteracoes) em W/m²;
+    raias que não convergiram têm Tf e q_com NaN. Com perda_sem=False q_sem é None
+    (quem chama calcula a superfície nua só para as raias distintas).
+    """
+    Tq, To, L_total, k_funcs, geometry, emissividade, pipe_diameter_m, wind_speed_ms = np.broadcast_arrays(
+        np.asarray(Tq, dtype=float), np.asarray(To, dtype=float), np.asarray(L_total, dtype=float),
+        np.asarray(k_funcs, dtype=object), np.asarray(geometry, dtype=object), np.asarray(emissividade, dtype=float),
+        np.asarray(np.nan if pipe_diameter_m is None else pipe_diameter_m, dtype=float),
+        np.asarray(wind_speed_ms, dtype=float)
+    )
+    Tf, q_com, convergiu, iteracoes = resolver_face_fria_vetorial(
+        Tq.ravel(), To.ravel(), L_total.ravel(), k_funcs.ravel(), geometry.ravel(), emissividade.ravel(),
+        pipe_diameter_m.ravel(), wind_speed_ms.ravel(), Tf_inicial=Tf_inicial, k_multiplicador=k_multiplicador
+    )
+    q_sem = None
+    if perda_sem:
+        q_sem = perda_sem_isolante_vetorial(Tq, To, geometry, emissividade, pipe_diameter_m, wind_speed_ms)
+    Tf = np.where(convergiu, Tf, np.nan)
+    q_com = np.where(convergiu, q_com, np.nan)
+    return Tf, q_com, q_sem, convergiu, iteracoes
+
+
+def resolver_lote(casos):
+    """
+    Resolve casos de uma camada em uma passada vetorizada (um ResultadoTermico por caso)
+
+    Casos com várias espessuras são tratados pela espessura total (mesmo material).
+    """
+    n = len(casos)
+    Tq = np.fromiter((c.Tq for c in casos), float, n)
+    To = np.fromiter((c.To for c in casos), float, n)
+    L_total = np.fromiter((c.L_total for c in casos), float, n)
+    emissividade = np.fromiter((c.emissividade for c in casos), float, n)
+    pipe_diameter_m = np.fromiter((np.nan if c.pipe_diameter_m is None else c.pipe_diameter_m for c in casos), float, n)
+    wind = np.fromiter((c.wind_speed_ms for c in casos), float, n)
+    geometry = np.array([c.geometry for c in casos], dtype=object)
+    k_funcs = np.array([c.k_funcs[0] for c in casos], dtype=object)
+
+    Tf, q_com, q_sem, convergiu, iteracoes = resolver_vetorial(
+        Tq, To, L_total, k_funcs, geometry, emissividade, pipe_diameter_m, wind
+    )
+
+    resultados = []
+    for j in range(n):
+        if convergiu[j]:
+            Tf_j = float(Tf[j])
+            resultados.append(ResultadoTermico(Tf_j, float(q_com[j]), float(q_sem[j]), True, int(iteracoes[j]),
+                                               (Tf_j,), METODO_VETORIAL))
+        else:
+            resultados.append(ResultadoTermico(None, None, None, False, int(iteracoes[j]), (), METODO_VETORIAL))
+    return resultados
+
+
+def calcular_financeiro(perda_com_kw, perda_sem_kw, dados):
+    """Etapa financeira única: economia e CO₂ evitado para perdas em kW/m² (escalares ou arrays)"""
+    return ResultadoFinanceiro(**calcular_economia_financeira(
+        perda_com_kw, perda_sem_kw, dados.area_m2, dados.horas_dia, dados.dias_semana,
+        dados.valor_combustivel, dados.pc, dados.ef, dados.fator_emissao
+    ))
+
+
+# Validação compartilhada pelos cálculos do motor (mensagens prontas para o cliente)
+def _exigir_campos(data, campos):
+    """Levanta EntradaInvalida se o payload não for um objeto ou se faltar algum dos campos"""
+    if not isinstance(data, dict):
+        raise EntradaInvalida("O corpo da requisição deve ser um objeto JSON")
+    for field in campos:
+        if field not in data:
+            raise EntradaInvalida(f"Campo obrigatório: {field}")
+
+
+def _material_e_acabamento(data):
+    """Registros do catálogo para 'material' e 'finish'; levanta EntradaInvalida"""
+    material = materials_db.get_material_by_name(data['material'])
+    finish = materials_db.get_finish_by_name(data['finish'])
+    if not material:
+        raise EntradaInvalida("Material não encontrado")
+    if not finish:
+        raise EntradaInvalida("Acabamento não encontrado")
+    return material, finish
+
+
+def _validar_faixa_material(material, Tq):
+    """Levanta EntradaInvalida se Tq estiver fora da faixa de uso do material"""
+    if not (material['t_min'] <= Tq <= material['t_max']):
+        raise EntradaInvalida(f"Temperatura fora dos limites do material ({material['t_min']}°C a {material['t_max']}°C)")
+
+
+def _validar_servico_quente(Tq, To):
+    if Tq <= To:
+        raise EntradaInvalida("A temperatura da face quente deve ser maior que a temperatura ambiente")
+
+
+def _geometria_e_diametro(data):
+    """(geometria, diâmetro do tubo em m ou None); levanta EntradaInvalida"""
+    geometry = data['geometry']
+    if geometry not in GEOMETRIAS:
+        raise EntradaInvalida("Geometria inválida")
+    pipe_diameter = _numero_opcional(data, 'pipeDiameter')
+    pipe_diameter_m = pipe_diameter / 1000 if pipe_diameter else None
+    if geometry != GEOMETRIA_PLANA and not (pipe_diameter_m or 0) > 0:
+        raise EntradaInvalida("Campo obrigatório para tubulação: pipeDiameter")
+    return geometry, pipe_diameter_m
+
+
+def _espessuras_mm(data):
+    """layerThicknesses (mm) como lista de floats; levanta EntradaInvalida"""
+    espessuras = data['layerThicknesses']
+    if not isinstance(espessuras, list) or not espessuras:
+        raise EntradaInvalida("layerThicknesses deve ser uma lista não vazia")
+    if not all(isinstance(e, (int, float)) and not isinstance(e, bool) and math.isfinite(e) for e in espessuras):
+        raise EntradaInvalida("layerThicknesses deve conter apenas números")
+    return [float(e) for e in espessuras]
+
+
+def _espessura_total_m(data):
+    """Soma de layerThicknesses (mm) em metros; levanta EntradaInvalida"""
+    L_total = sum(_espessuras_mm(data)) / 1000
+    if L_total <= 0:
+        raise EntradaInvalida("Espessura total deve ser maior que zero")
+    return L_total
+
+
+def _numero_opcional(data, campo, minimo=None):
+    """Valor numérico opcional do payload (None se ausente); levanta EntradaInvalida"""
+    valor = data.get(campo)
+    if valor is None:
+        return None
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)) or not math.isfinite(valor):
+        raise EntradaInvalida(f"{campo} deve ser numérico")
+    if minimo is not None and valor <= minimo:
+        raise EntradaInvalida(f"{campo} deve ser maior que {minimo:g}")
+    return float(valor)
+
+
+def _temperaturas(data):
+    """(hotTemp, ambientTemp) numéricos; levanta EntradaInvalida"""
+    Tq, To = _numero_opcional(data, 'hotTemp'), _numero_opcional(data, 'ambientTemp')
+    if Tq is None or To is None:
+        raise EntradaInvalida("hotTemp e ambientTemp devem ser numéricos")
+    return Tq, To
+
+
+def _velocidade_vento(data):
+    wind_speed = data.get('windSpeed', 0)
+    if isinstance(wind_speed, bool) or not isinstance(wind_speed, (int, float)) or not wind_speed >= 0:
+        raise EntradaInvalida("windSpeed deve ser um número não negativo")
+    return wind_speed
+
+
+def caso_do_item(item):
+    """
+    Valida um item de lote (mesmos campos de /calculate/thermal, uma camada) e monta o caso
+
+    As espessuras do item são somadas. Levanta EntradaInvalida.
+    """
+    _exigir_campos(item, ['material', 'finish', 'geometry', 'hotTemp', 'ambientTemp', 'layerThicknesses'])
+    material, finish = _material_e_acabamento(item)
+    geometry, pipe_diameter_m = _geometria_e_diametro(item)
+    Tq, To = _temperaturas(item)
+    _validar_faixa_material(material, Tq)
+    _validar_servico_quente(Tq, To)
+    return CasoTermico(
+        Tq=Tq,
+        To=To,
+        espessuras_m=(_espessura_total_m(item),),
+        k_funcs=(material['k_func'],),
+        geometry=geometry,
+        emissividade=finish['emissividade'],
+        pipe_diameter_m=pipe_diameter_m,
+        wind_speed_ms=_velocidade_vento(item)
+    )
+
+
+def _caso_da_requisicao(data):
+    """
+    Valida o payload de /calculate/thermal e monta o caso
+
+    Retorna (caso, nomes, materiais) das camadas; levanta EntradaInvalida.
+    """
+    # Com layerMaterials, 'material' é opcional
+    required_fields = ['finish', 'geometry', 'hotTemp', 'ambientTemp', 'layerThicknesses']
+    if isinstance(data, dict) and 'layerMaterials' not in data:
+        required_fields.insert(0, 'material')
+    _exigir_campos(data, required_fields)
+
+    layer_thicknesses = _espessuras_mm(data)
+
+    # Material de cada camada (da face quente para a fria); sem layerMaterials todas usam 'material'
+    layer_names = data.get('layerMaterials') or [data.get('material')] * len(layer_thicknesses)
+    if not isinstance(layer_names, list) or len(layer_names) != len(layer_thicknesses):
+        raise EntradaInvalida("layerMaterials deve ter um material por camada")
+
+    layer_materials = [materials_db.get_material_by_name(nome) for nome in layer_names]
+    finish = materials_db.get_finish_by_name(data['finish'])
+    for nome, material in zip(layer_names, layer_materials):
+        if not material:
+            raise EntradaInvalida(f"Material não encontrado: {nome}")
+    if not finish:
+        raise EntradaInvalida("Acabamento não encontrado")
+
+    # Temperatura da primeira camada; as demais são verificadas após o cálculo
+    Tq, To = _temperaturas(data)
+    _validar_faixa_material(layer_materials[0], Tq)
+    _validar_servico_quente(Tq, To)
+    geometry, pipe_diameter_m = _geometria_e_diametro(data)
+
+    # Método do solver (o solver por passos original continua disponível para comparação);
+    # com várias camadas as temperaturas das interfaces são resolvidas juntas (Newton)
+    metodo = data.get('solver', METODO_PADRAO)
+    if metodo not in METODOS_SOLVER:
+        raise EntradaInvalida(f"Solver inválido: {metodo}")
+
+    caso = CasoTermico(
+        Tq=Tq,
+        To=To,
+        espessuras_m=tuple(espessura / 1000 for espessura in layer_thicknesses),
+        k_funcs=tuple(m['k_func'] for m in layer_materials),
+        geometry=geometry,
+        emissividade=finish['emissividade'],
+        pipe_diameter_m=pipe_diameter_m,
+        wind_speed_ms=_velocidade_vento(data),
+        metodo=metodo
+    )
+    return caso, layer_names, layer_materials
+
+
+def calcular_termico(data):
+    """
+    Cálculo térmico e financeiro completo de um payload de /calculate/thermal
+
+    Retorna (resultado no formato da API, 'HIT' | 'MISS'); levanta EntradaInvalida.
+    """
+    caso, layer_names, layer_materials = _caso_da_requisicao(data)
+    resultado, cache_status = resolver(caso)
+    if not resultado.convergiu:
+        raise EntradaInvalida("Não foi possível convergir o cálculo")
+
+    # Perfil por camada e verificação da temperatura máxima de cada material
+    camadas = []
+    T_quente = caso.Tq
+    for nome, material, espessura, T_fria in zip(layer_names, layer_materials, data['layerThicknesses'],
+                                                 resultado.temperaturas):
+        camadas.append({
+            'material': nome,
+            'thickness': espessura,
+            'hotFaceTemp': round(T_quente, 1),
+            'coldFaceTemp': round(T_fria, 1),
+            'tMax': material['t_max']
+        })
+        if T_quente > material['t_max']:
+            raise EntradaInvalida(
+                f"Camada {len(camadas)} ({nome}) operando a {T_quente:.1f}°C, acima do limite de {material['t_max']}°C"
+            )
+        T_quente = T_fria
+
+    perda_com_kw, perda_sem_kw = resultado.perda_com_kw, resultado.perda_sem_kw
+    result = {
+        'temperatureFaceFria': round(resultado.Tf, 1),
+        'perdaComIsolante': round(perda_com_kw, 3),
+        'perdaSemIsolante': round(perda_sem_kw, 3),
+        'reducaoPercentual': round((perda_sem_kw - perda_com_kw) / perda_sem_kw * 100, 1) if perda_sem_kw > 0 else 0,
+        'convergiu': True,
+        'solver': resultado.metodo,
+        'iteracoes': resultado.iteracoes,
+        'layerTemperatures': [round(T, 1) for T in resultado.temperaturas[:-1]],
+        'layers': camadas
+    }
+    if resultado.erro_estimado is not None:
+        result['erroEstimado'] = round(resultado.erro_estimado, 4)
+
+    # Cálculo financeiro (se solicitado; combustível desconhecido apenas omite a economia)
+    if data.get('calculateFinancial', False):
+        try:
+            dados = DadosFinanceiros.de_requisicao(data.get('financialData', {}))
+        except CombustivelDesconhecido:
+            dados = None
+        if dados is not None:
+            economia = calcular_financeiro(perda_com_kw, perda_sem_kw, dados)
+            result.update({
+                'economiaMensal': round(economia.economia_mensal, 2),
+                'economiaAnual': round(economia.economia_anual, 2),
+                'co2EvitadoTonAno': round(economia.co2_ton_ano, 2),
+                'reducaoPercentual': round(economia.reducao_pct, 1)
+            })
+    return result, cache_status
+
+
+def calcular_condensacao(data):
+    """Espessura mínima contra condensação de um payload de /calculate/condensation; levanta EntradaInvalida"""
+    _exigir_campos(data, ['material', 'geometry', 'internalTemp', 'ambientTemp', 'humidity'])
+
+    material = materials_db.get_material_by_name(data['material'])
+    if not material:
+        raise EntradaInvalida("Material não encontrado")
+
+    Ti = data['internalTemp']
+    Ta = data['ambientTemp']
+    if Ta <= Ti:
+        raise EntradaInvalida("A temperatura ambiente deve ser maior que a temperatura interna")
+
+    pipe_diameter_m = data['pipeDiameter'] / 1000 if data.get('pipeDiameter') else None
+    espessura_mm, T_orvalho = encontrar_espessura_minima_condensacao(
+        Ti, Ta, material['k_func'], data['geometry'], pipe_diameter_m, data.get('windSpeed', 0), data['humidity'],
+        ESPESSURA_MAX_CONDENSACAO_MM
+    )
+    if espessura_mm is None:
+        raise EntradaInvalida(
+            f"Não foi possível encontrar espessura que evite condensação até {ESPESSURA_MAX_CONDENSACAO_MM}mm"
+        )
+
+    return {
+        'temperaturaOrvalho': round(T_orvalho, 1),
+        'espessuraMinima': espessura_mm,
+        'success': True
+    }
+
+
+def calcular_dimensionamento(data):
+    """
+    Espessura mínima para um limite de temperatura superficial e/ou de perda de calor
+
+    Payload de /calculate/thermal/design: maxSurfaceTemp (°C, serviço quente),
+    maxHeatLoss (W/m²) e, em serviço frio, humidity (+ dewPointMargin) para manter a
+    superfície acima do ponto de orvalho. commercialThicknesses (true ou lista em mm)
+    arredonda para a espessura comercial seguinte. Levanta EntradaInvalida.
+    """
+    _exigir_campos(data, ['material', 'finish', 'geometry', 'hotTemp', 'ambientTemp'])
+    material, finish = _material_e_acabamento(data)
+    Tq, To = _temperaturas(data)
+    _validar_faixa_material(material, Tq)
+    if Tq == To:
+        raise EntradaInvalida("A temperatura de operação deve ser diferente da temperatura ambiente")
+    servico_quente = Tq > To
+    geometry, pipe_diameter_m = _geometria_e_diametro(data)
+    wind_speed = _velocidade_vento(data)
+
+    T_superficie_max = _numero_opcional(data, 'maxSurfaceTemp')
+    if T_superficie_max is not None:
+        if not servico_quente:
+            raise EntradaInvalida("maxSurfaceTemp só se aplica a serviço quente (hotTemp > ambientTemp)")
+        if T_superficie_max <= To:
+            raise EntradaInvalida("maxSurfaceTemp deve ser maior que a temperatura ambiente")
+    q_max = _numero_opcional(data, 'maxHeatLoss', minimo=0)
+
+    # Ponto de orvalho: só limita a espessura em serviço frio (superfície abaixo do ambiente)
+    umidade = _numero_opcional(data, 'humidity', minimo=0)
+    if umidade is not None and umidade > 100:
+        raise EntradaInvalida("humidity deve estar entre 0 e 100")
+    T_orvalho = calcular_temperatura_orvalho(To, umidade) if umidade is not None else None
+    T_superficie_min = None
+    if T_orvalho is not None and not servico_quente:
+        T_superficie_min = T_orvalho + (_numero_opcional(data, 'dewPointMargin') or 0.0)
+        if T_superficie_min >= To:
+            raise EntradaInvalida("Ponto de orvalho (com margem) acima da temperatura ambiente: nenhuma espessura evita condensação")
+
+    if T_superficie_max is None and q_max is None and T_superficie_min is None:
+        raise EntradaInvalida("Informe maxSurfaceTemp, maxHeatLoss ou humidity (serviço frio)")
+
+    max_espessura_mm = _numero_opcional(data, 'maxThickness', minimo=0) or ESPESSURA_MAX_PROJETO_MM
+    comerciais = data.get('commercialThicknesses', False)
+    if comerciais is True:
+        comerciais = ESPESSURAS_COMERCIAIS_MM
+    elif comerciais:
+        if not isinstance(comerciais, list) or not all(
+                isinstance(e, (int, float)) and not isinstance(e, bool) and e > 0 for e in comerciais):
+            raise EntradaInvalida("commercialThicknesses deve ser true ou uma lista de espessuras positivas (mm)")
+
+    espessura_mm, Tf, q, restricao, sondagens = dimensionar_espessura_minima(
+        Tq, To, material['k_func'], geometry, finish['emissividade'], pipe_diameter_m, wind_speed,
+        T_superficie_max, q_max, T_superficie_min, max_espessura_mm
+    )
+    if espessura_mm is None:
+        raise EntradaInvalida(f"Nenhuma espessura até {max_espessura_mm:g}mm atende às restrições")
+
+    result = {
+        'espessuraMinima': round(espessura_mm, 1),
+        'temperatureFaceFria': round(Tf, 1),
+        'perdaComIsolante': round(q / 1000, 4),
+        'restricaoDeterminante': restricao,
+        'temperaturaOrvalho': round(T_orvalho, 1) if T_orvalho is not None else None,
+        'sondagens': sondagens,
+    }
+
+    if comerciais:
+        espessura = espessura_comercial(espessura_mm, comerciais)
+        result['comercial'] = None
+        if espessura is not None:
+            resultado, _ = resolver(CasoTermico(
+                Tq=Tq, To=To, espessuras_m=(espessura / 1000,), k_funcs=(material['k_func'],), geometry=geometry,
+                emissividade=finish['emissividade'], pipe_diameter_m=pipe_diameter_m, wind_speed_ms=wind_speed
+            ))
+            if resultado.convergiu:
+                result['comercial'] = {
+                    'espessura': espessura,
+                    'temperatureFaceFria': round(resultado.Tf, 1),
+                    'perdaComIsolante': round(resultado.q_com / 1000, 4)
+                }
+    return result
+
+
+# Critérios de ordenação da comparação: (campo do resultado, maior é melhor)
+CRITERIOS_COMPARACAO = {
+    'surfaceTemp': ('temperatureFaceFria', False),
+    'heatLoss': ('perdaComIsolante', False),
+    'savings': ('economiaAnual', True),
+}
+
+
+def calcular_comparacao(data):
+    """
+    Compara materiais × acabamentos do catálogo para uma mesma condição de operação
+
+    Materiais cuja faixa (t_min, t_max) não inclui hotTemp são excluídos; as demais
+    combinações são resolvidas numa única passada de resolver_vetorial e a perda sem
+    isolante é calculada uma vez por acabamento. materials/finishes (listas de nomes) restringem
+    a comparação; criterion ordena por 'surfaceTemp', 'heatLoss' (padrão) ou 'savings'
+    (exige calculateFinancial). Levanta EntradaInvalida.
+    """
+    _exigir_campos(data, ['geometry', 'hotTemp', 'ambientTemp', 'layerThicknesses'])
+    Tq, To = _temperaturas(data)
+    _validar_servico_quente(Tq, To)
+    L_total = _espessura_total_m(data)
+    geometry, pipe_diameter_m = _geometria_e_diametro(data)
+    wind_speed = _velocidade_vento(data)
+
+    criterio = data.get('criterion', 'heatLoss')
+    if criterio not in CRITERIOS_COMPARACAO:
+        raise EntradaInvalida(f"Critério inválido (use {', '.join(CRITERIOS_COMPARACAO)})")
+    financeiro = None
+    if data.get('calculateFinancial', False) or criterio == 'savings':
+        financeiro = DadosFinanceiros.de_requisicao(data.get('financialData', {}))
+
+    # Catálogo (opcionalmente restrito por nome) e filtro de temperatura dos materiais
+    materiais = materials_db.get_materials()
+    acabamentos = materials_db.get_finishes()
+    for campo, catalogo, chave in (('materials', materiais, 'nome'), ('finishes', acabamentos, 'acabamento')):
+        nomes = data.get(campo)
+        if nomes is None:
+            continue
+        if not isinstance(nomes, list):
+            raise EntradaInvalida(f"{campo} deve ser uma lista de nomes")
+        desconhecidos = [nome for nome in nomes if not any(item[chave] == nome for item in catalogo)]
+        if desconhecidos:
+            raise EntradaInvalida(f"Não encontrados no catálogo ({campo}): {', '.join(map(str, desconhecidos))}")
+    if data.get('materials') is not None:
+        materiais = [m for m in materiais if m['nome'] in data['materials']]
+    if data.get('finishes') is not None:
+        acabamentos = [a for a in acabamentos if a['acabamento'] in data['finishes']]
+    excluidos = [m['nome'] for m in materiais if not (m['t_min'] <= Tq <= m['t_max'])]
+    materiais = [m for m in materiais if m['t_min'] <= Tq <= m['t_max']]
+    if not acabamentos:
+        raise EntradaInvalida("Nenhum acabamento selecionado")
+    if not materiais:
+        raise EntradaInvalida("Nenhum material do catálogo suporta a temperatura informada")
+
+    # Raias: material i × acabamento j, na ordem (i, j)
+    n_materiais, n_acabamentos = len(materiais), len(acabamentos)
+    k_funcs = np.repeat(np.array([m['k_func'] for m in materiais], dtype=object), n_acabamentos)
+    emissividade = np.tile(np.array([a['emissividade'] for a in acabamentos], dtype=float), n_materiais)
+    Tf, q_com, _, convergiu, _ = resolver_vetorial(
+        Tq, To, L_total, k_funcs, geometry, emissividade, pipe_diameter_m, wind_speed, perda_sem=False
+    )
+
+    # Perda sem isolante: depende só do acabamento
+    q_sem_acabamento = perda_sem_isolante_vetorial(
+        Tq, To, geometry, emissividade[:n_acabamentos], pipe_diameter_m, wind_speed
+    )
+    q_sem = np.tile(q_sem_acabamento, n_materiais)
+    perda_com_kw, perda_sem_kw = q_com / 1000, q_sem / 1000
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reducao = np.where(perda_sem_kw > 0, (perda_sem_kw - perda_com_kw) / perda_sem_kw * 100, 0.0)
+    if financeiro is not None:
+        por_kw = calcular_financeiro(0.0, 1.0, financeiro)
+        economia_anual = (perda_sem_kw - perda_com_kw) * por_kw.economia_anual
+        co2 = (perda_sem_kw - perda_com_kw) * por_kw.co2_ton_ano
+
+    resultados = []
+    for lane in np.flatnonzero(convergiu).tolist():
+        i, j = divmod(lane, n_acabamentos)
+        item = {
+            'material': materiais[i]['nome'],
+            'finish': acabamentos[j]['acabamento'],
+            'emissividade': acabamentos[j]['emissividade'],
+            'temperatureFaceFria': round(float(Tf[lane]), 1),
+            'perdaComIsolante': round(float(perda_com_kw[lane]), 3),
+            'perdaSemIsolante': round(float(perda_sem_kw[lane]), 3),
+            'reducaoPercentual': round(float(reducao[lane]), 1)
+        }
+        if financeiro is not None:
+            item['economiaAnual'] = round(float(economia_anual[lane]), 2)
+            item['co2EvitadoTonAno'] = round(float(co2[lane]), 2)
+        resultados.append(item)
+
+    campo, maior_melhor = CRITERIOS_COMPARACAO[criterio]
+    resultados.sort(key=lambda item: -item[campo] if maior_melhor else item[campo])
+    for posicao, item in enumerate(resultados, 1):
+        item['posicao'] = posicao
+
+    limite = data.get('limit')
+    if isinstance(limite, int) and not isinstance(limite, bool) and limite > 0:
+        resultados = resultados[:limite]
+
+    return {
+        'criterio': criterio,
+        'combinacoes': int(convergiu.size),
+        'naoConvergidos': int((~convergiu).sum()),
+        'materiaisExcluidos': excluidos,
+        'perdaSemIsolante': {a['acabamento']: round(float(q) / 1000, 3)
+                             for a, q in zip(acabamentos, q_sem_acabamento)},
+        'ranking': resultados
+    }
+
+
+def calcular_tabela_projeto(data):
+    """
+    Tabela de projeto de tubulações: todas as bitolas NPS × espessuras comerciais
+
+    Para material, acabamento, hotTemp, ambientTemp (e windSpeed) resolve todos os pares
+    numa única passada vetorizada e retorna, por bitola, a temperatura superficial (°C) e a
+    perda por metro linear (W/m) em cada espessura. pipeSizes (designações NPS) e
+    thicknesses (mm) restringem a tabela. As tabelas ficam em tabela_cache pelas entradas.
+
+    Retorna (tabela, 'HIT' | 'MISS'); levanta EntradaInvalida.
+    """
+    _exigir_campos(data, ['material', 'finish', 'hotTemp', 'ambientTemp'])
+    material, finish = _material_e_acabamento(data)
+    Tq, To = _temperaturas(data)
+    _validar_faixa_material(material, Tq)
+    if Tq == To:
+        raise EntradaInvalida("A temperatura de operação deve ser diferente da temperatura ambiente")
+    wind_speed = _velocidade_vento(data)
+
+    tubulacoes = materials_db.get_pipes()
+    if data.get('pipeSizes') is not None:
+        nomes = data['pipeSizes']
+        if not isinstance(nomes, list) or not nomes:
+            raise EntradaInvalida("pipeSizes deve ser uma lista não vazia de designações NPS")
+        tubulacoes = [materials_db.get_pipe_by_nps(nps) for nps in nomes]
+        if None in tubulacoes:
+            desconhecidas = [str(nps) for nps, tubo in zip(nomes, tubulacoes) if tubo is None]
+            raise EntradaInvalida(f"Bitolas NPS não encontradas: {', '.join(desconhecidas)}")
+    espessuras = materials_db.get_thicknesses()
+    if data.get('thicknesses') is not None:
+        espessuras = data['thicknesses']
+        if (not isinstance(espessuras, list) or not espessuras
+                or not all(isinstance(e, (int, float)) and not isinstance(e, bool) and 0 < e <= ESPESSURA_MAX_PROJETO_MM
+                           for e in espessuras)):
+            raise EntradaInvalida(f"thicknesses deve ser uma lista de espessuras entre 0 e {ESPESSURA_MAX_PROJETO_MM} mm")
+
+    chave = (
+        material['k_func'], canonizar_float(finish['emissividade']), canonizar_float(Tq), canonizar_float(To),
+        canonizar_float(wind_speed), tuple(tubo['nps'] for tubo in tubulacoes),
+        tuple(canonizar_float(e) for e in espessuras)
+    )
+    tabela = tabela_cache.get(chave)
+    if tabela is not None:
+        return tabela, 'HIT'
+
+    # Raias: bitola i × espessura j, na ordem (i, j)
+    n_espessuras = len(espessuras)
+    diametros_m = np.array([tubo['diametro_externo'] for tubo in tubulacoes], dtype=float) / 1000
+    espessuras_m = np.array(espessuras, dtype=float) / 1000
+    D = np.repeat(diametros_m, n_espessuras)
+    L = np.tile(espessuras_m, len(tubulacoes))
+    Tf, q_com, _, convergiu, _ = resolver_vetorial(
+        Tq, To, L, material['k_func'], GEOMETRIA_TUBO, finish['emissividade'], D, wind_speed, perda_sem=False
+    )
+    # Perda por metro: fluxo na superfície externa × perímetro externo (isolante e tubo nu)
+    perda_metro = (q_com * np.pi * (D + 2 * L)).reshape(len(tubulacoes), n_espessuras)
+    Tf = Tf.reshape(len(tubulacoes), n_espessuras)
+    # A perda do tubo nu não depende da espessura: uma por bitola
+    q_sem = perda_sem_isolante_vetorial(Tq, To, GEOMETRIA_TUBO, finish['emissividade'], diametros_m, wind_speed)
+
+    def arredondar(valores, casas):
+        return [round(float(v), casas) if math.isfinite(v) else None for v in valores]
+
+    tabela = {
+        'material': material['nome'],
+        'finish': finish['acabamento'],
+        'hotTemp': Tq,
+        'ambientTemp': To,
+        'windSpeed': wind_speed,
+        'espessuras': list(espessuras),
+        'naoConvergidos': int((~convergiu).sum()),
+        'tubulacoes': [
+            {
+                'nps': tubo['nps'],
+                'dn': tubo['dn'],
+                'diametroExterno': tubo['diametro_externo'],
+                'perdaSemIsolantePorMetro': round(float(q_sem[i] * np.pi * diametros_m[i]), 1),
+                'temperaturaSuperficie': arredondar(Tf[i], 1),
+                'perdaPorMetro': arredondar(perda_metro[i], 1)
+            }
+            for i, tubo in enumerate(tubulacoes)
+        ]
+    }
+    tabela_cache.set(chave, tabela)
+    return tabela, 'MISS'
+
+
+# Limite de passos na varredura de espessuras
+MAX_PASSOS_VARREDURA = 500
+
+CRITERIOS_VARREDURA = ('payback', 'npv')
+
+# Horizonte máximo do VPL (anos)
+MAX_ANOS_VARREDURA = 100
+
+
+def calcular_varredura(data):
+    """
+    Varre uma faixa de espessuras e indica a espessura econômica (melhor payback ou VPL)
+
+    Espessuras já no cache térmico são reaproveitadas; as demais são resolvidas em
+    ordem por varrer_espessuras (continuação) e entram no cache como os casos de
+    resolver. A perda sem isolante é calculada uma vez para a curva. Levanta EntradaInvalida.
+    """
+    _exigir_campos(data, ['material', 'finish', 'geometry', 'hotTemp', 'ambientTemp', 'insulationCost'])
+    material, finish = _material_e_acabamento(data)
+    Tq, To = _temperaturas(data)
+    _validar_faixa_material(material, Tq)
+    _validar_servico_quente(Tq, To)
+    geometry, pipe_diameter_m = _geometria_e_diametro(data)
+    wind_speed = _velocidade_vento(data)
+
+    # Faixa de espessuras (mm)
+    faixa = data.get('thicknessRange', {})
+    if not isinstance(faixa, dict):
+        raise EntradaInvalida("thicknessRange deve ser um objeto com start, stop e step")
+    for campo in ('start', 'stop', 'step'):
+        _numero_opcional(faixa, campo, 0)
+    # Valores originais (não convertidos) para que espessuras inteiras sigam inteiras na resposta;
+    # zero já foi recusado, então 'or' só troca ausentes e nulos pelo padrão
+    inicio = faixa.get('start') or 10
+    fim = faixa.get('stop') or 200
+    passo = faixa.get('step') or 10
+    if fim < inicio:
+        raise EntradaInvalida("Faixa de espessuras inválida")
+    n_passos = int((fim - inicio) // passo) + 1
+    if n_passos > MAX_PASSOS_VARREDURA:
+        raise EntradaInvalida(f"Máximo de {MAX_PASSOS_VARREDURA} passos por varredura")
+    espessuras_mm = [round(inicio + i * passo, 3) for i in range(n_passos)]
+
+    criterio = data.get('criterion', 'payback')
+    if criterio not in CRITERIOS_VARREDURA:
+        raise EntradaInvalida("Critério inválido (use 'payback' ou 'npv')")
+
+    financeiro = DadosFinanceiros.de_requisicao(data.get('financialData', {}))
+    custo_isolante_m3 = _numero_opcional(data, 'insulationCost')
+    if custo_isolante_m3 is None or custo_isolante_m3 < 0:
+        raise EntradaInvalida("insulationCost deve ser um número não negativo")
+    taxa_desconto = _numero_opcional(data, 'discountRate', -1)
+    taxa_desconto = 0.10 if taxa_desconto is None else taxa_desconto
+    anos = _numero_opcional(data, 'years', 0)
+    anos = 10 if anos is None else anos
+    if anos > MAX_ANOS_VARREDURA:
+        raise EntradaInvalida(f"years deve ser no máximo {MAX_ANOS_VARREDURA}")
+
+    # Casos da curva: os que já estão no cache não são resolvidos de novo
+    casos = {
+        espessura_mm: CasoTermico(
+            Tq=Tq, To=To, espessuras_m=(espessura_mm / 1000,), k_funcs=(material['k_func'],), geometry=geometry,
+            emissividade=finish['emissividade'], pipe_diameter_m=pipe_diameter_m, wind_speed_ms=wind_speed
+        )
+        for espessura_mm in espessuras_mm
+    }
+    resolvidos = {}
+    for espessura_mm, caso in casos.items():
+        resultado = thermal_cache.get(caso.chave())
+        if resultado is not None:
+            resolvidos[espessura_mm] = (resultado.Tf, resultado.q_com, True, resultado.iteracoes)
+    pendentes = [e for e in espessuras_mm if e not in resolvidos]
+
+    # Perda sem isolante: calculada uma única vez para toda a curva
+    q_sem = calcular_perda_sem_isolante(Tq, To, geometry, finish['emissividade'], pipe_diameter_m, wind_speed)
+    for espessura_mm, Tf, q_com, convergiu, iteracoes in varrer_espessuras(
+        Tq, To, pendentes, material['k_func'], geometry, finish['emissividade'], pipe_diameter_m, wind_speed
+    ):
+        resolvidos[espessura_mm] = (Tf, q_com, convergiu, iteracoes)
+        if convergiu:
+            thermal_cache.set(casos[espessura_mm].chave(),
+                              ResultadoTermico(Tf, q_com, q_sem, True, iteracoes, (Tf,), METODO_PADRAO))
+
+    perda_sem_kw = q_sem / 1000
+    steps = []
+    for espessura_mm in espessuras_mm:
+        Tf, q_com, convergiu, iteracoes = resolvidos[espessura_mm]
+        if not convergiu:
+            steps.append({'espessura': espessura_mm, 'convergiu': False, 'iteracoes': iteracoes})
+            continue
+
+        perda_com_kw = q_com / 1000
+        economia = calcular_financeiro(perda_com_kw, perda_sem_kw, financeiro)
+        investimento = calcular_volume_isolante(
+            financeiro.area_m2, espessura_mm / 1000, geometry, pipe_diameter_m
+        ) * custo_isolante_m3
+        payback, vpl = calcular_indicadores_investimento(investimento, economia.economia_anual, taxa_desconto, anos)
+
+        steps.append({
+            'espessura': espessura_mm,
+            'temperatureFaceFria': round(Tf, 1),
+            'perdaComIsolante': round(perda_com_kw, 3),
+            'economiaMensal': round(economia.economia_mensal, 2),
+            'economiaAnual': round(economia.economia_anual, 2),
+            'co2EvitadoTonAno': round(economia.co2_ton_ano, 2),
+            'reducaoPercentual': round(economia.reducao_pct, 1),
+            'investimento': round(investimento, 2),
+            'paybackAnos': round(payback, 2) if payback is not None else None,
+            'vpl': round(vpl, 2),
+            'convergiu': True,
+            'iteracoes': iteracoes
+        })
+
+    validos = [p for p in steps if p['convergiu']]
+    if criterio == 'payback':
+        candidatos = [p for p in validos if p['paybackAnos'] is not None]
+        melhor = min(candidatos, key=lambda p: p['paybackAnos']) if candidatos else None
+    else:
+        melhor = max(validos, key=lambda p: p['vpl']) if validos else None
+
+    return {
+        'perdaSemIsolante': round(perda_sem_kw, 3),
+        'criterio': criterio,
+        'melhorEspessura': melhor['espessura'] if melhor else None,
+        'melhor': melhor,
+        'steps': steps
+    }
+
+
+def calcular_montecarlo(data):
+    """
+    Análise de incerteza: amostra os parâmetros incertos e resolve todas as amostras de uma vez
+
+    hotTemp, ambientTemp, emissivity, kMultiplier e windSpeed aceitam números ou
+    distribuições (ver src/utils/uncertainty.py); as validações usam os valores nominais.
+    As amostras vão para resolver_vetorial numa única passada. Levanta EntradaInvalida.
+    """
+    from src.utils.uncertainty import (
+        amostrar, valor_nominal, resumir, DistribuicaoInvalida,
+        MAX_AMOSTRAS, AMOSTRAS_PADRAO, PERCENTIS_PADRAO
+    )
+
+    _exigir_campos(data, ['material', 'finish', 'geometry', 'hotTemp', 'ambientTemp', 'layerThicknesses'])
+    material, finish = _material_e_acabamento(data)
+    geometry, pipe_diameter_m = _geometria_e_diametro(data)
+
+    # Validações sobre os valores nominais (centrais) das distribuições
+    try:
+        Tq_nominal = valor_nominal(data['hotTemp'], 'hotTemp')
+        To_nominal = valor_nominal(data['ambientTemp'], 'ambientTemp')
+    except DistribuicaoInvalida as ex:
+        raise EntradaInvalida(str(ex)) from None
+    if Tq_nominal is None or To_nominal is None:
+        raise EntradaInvalida("hotTemp e ambientTemp devem ser números ou distribuições")
+    _validar_faixa_material(material, Tq_nominal)
+    _validar_servico_quente(Tq_nominal, To_nominal)
+    L_total = _espessura_total_m(data)
+
+    n = data.get('samples', AMOSTRAS_PADRAO)
+    if isinstance(n, bool) or not isinstance(n, int) or not 1 <= n <= MAX_AMOSTRAS:
+        raise EntradaInvalida(f"samples deve ser um inteiro entre 1 e {MAX_AMOSTRAS}")
+    percentis = data.get('percentiles', list(PERCENTIS_PADRAO))
+    if not isinstance(percentis, list) or not percentis or not all(
+            isinstance(p, (int, float)) and not isinstance(p, bool) and 0 <= p <= 100 for p in percentis):
+        raise EntradaInvalida("percentiles deve ser uma lista de valores entre 0 e 100")
+    limite = _numero_opcional(data, 'surfaceTempLimit') if 'surfaceTempLimit' in data else 60
+    financeiro = None
+    if data.get('calculateFinancial', False):
+        financeiro = DadosFinanceiros.de_requisicao(data.get('financialData', {}))
+
+    # Amostras (seed opcional para resultados reproduzíveis)
+    seed = data.get('seed')
+    if seed is not None and (isinstance(seed, bool) or not isinstance(seed, int) or seed < 0):
+        raise EntradaInvalida("seed deve ser um inteiro não negativo")
+    rng = np.random.default_rng(seed)
+    try:
+        Tq = amostrar(data['hotTemp'], n, rng, 'hotTemp')
+        To = amostrar(data['ambientTemp'], n, rng, 'ambientTemp')
+        emissividade = amostrar(data.get('emissivity'), n, rng, 'emissivity',
+                                padrao=finish['emissividade'], minimo=0.0, maximo=1.0)
+        k_multiplicador = amostrar(data.get('kMultiplier'), n, rng, 'kMultiplier', padrao=1.0, minimo=1e-3)
+        wind = amostrar(data.get('windSpeed'), n, rng, 'windSpeed', padrao=0.0, minimo=0.0)
+    except DistribuicaoInvalida as ex:
+        raise EntradaInvalida(str(ex)) from None
+
+    # Amostras com face quente abaixo do ambiente não têm sentido físico e são descartadas
+    validas = Tq > To
+    Tf, q_com, q_sem, convergiu, _ = resolver_vetorial(
+        Tq, To, L_total, material['k_func'], geometry, emissividade, pipe_diameter_m, wind,
+        k_multiplicador=k_multiplicador
+    )
+    ok = validas & convergiu
+    if not ok.any():
+        raise EntradaInvalida("Nenhuma amostra convergiu")
+    Tf, perda_com_kw, perda_sem_kw = Tf[ok], q_com[ok] / 1000, q_sem[ok] / 1000
+
+    result = {
+        'samples': n,
+        'validSamples': int(validas.sum()),
+        'convergedSamples': int(ok.sum()),
+        'surfaceTemp': resumir(Tf, percentis, 1),
+        'heatLoss': resumir(perda_com_kw, percentis, 3),
+        'heatLossWithoutInsulation': resumir(perda_sem_kw, percentis, 3)
+    }
+    if limite is not None:
+        result['surfaceTempLimit'] = limite
+        result['probabilityBelowLimit'] = round(float(np.mean(Tf <= limite)), 4)
+
+    # Economia anual: linear na perda evitada, então basta a economia de 1 kW/m²
+    if financeiro is not None:
+        por_kw = calcular_financeiro(0.0, 1.0, financeiro)
+        result['annualSavings'] = resumir((perda_sem_kw - perda_com_kw) * por_kw.economia_anual, percentis, 2)
+    return result
+
+
+def calcular_anual(data, blocos):
+    """
+    Simulação anual hora a hora (ver src/routes/thermal_calc_anual.py)
+
+    data: dados do isolamento e financeiros; blocos: iterável de blocos do perfil CSV.
+    As horas são resolvidas por resolver_vetorial. Levanta EntradaInvalida (erros do
+    perfil inclusive); CSVInvalido da leitura dos blocos é propagado.
+    """
+    from src.routes.thermal_calc_anual import simular_ano, PerfilInvalido
+
+    _exigir_campos(data, ['material', 'finish', 'geometry', 'hotTemp', 'layerThicknesses'])
+    material, finish = _material_e_acabamento(data)
+    geometry, pipe_diameter_m = _geometria_e_diametro(data)
+    Tq = _numero_opcional(data, 'hotTemp')
+    if Tq is None:
+        raise EntradaInvalida("hotTemp deve ser numérico")
+    _validar_faixa_material(material, Tq)
+    L_total = _espessura_total_m(data)
+    financeiro = DadosFinanceiros.de_requisicao(data.get('financialData', {}))
+
+    try:
+        result = simular_ano(
+            blocos, Tq, L_total, material['k_func'], geometry, finish['emissividade'], pipe_diameter_m,
+            financeiro, resolver_vetorial, _numero_opcional(data, 'surfaceTempLimit')
+        )
+    except PerfilInvalido as ex:
+        raise EntradaInvalida(str(ex)) from None
+    result['combustivel'] = financeiro.combustivel
+    return result
+
+
+# Cálculo usado para preencher os resultados de cada tipo de relatório
+CALCULOS_RELATORIO = {
+    'thermal': lambda data: calcular_termico(data)[0],
+    'condensation': calcular_condensacao,
+}
+
+
+def completar_resultados(report_type, data):
+    """Payload do relatório com 'results' calculados pelo motor quando o cliente não os envia; levanta EntradaInvalida"""
+    if not isinstance(data, dict):
+        raise EntradaInvalida("Os dados do relatório devem ser um objeto JSON")
+    if data.get('results') or report_type not in CALCULOS_RELATORIO:
+        return data
+    return {**data, 'results': CALCULOS_RELATORIO[report_type](data)}
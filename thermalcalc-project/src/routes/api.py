@@ -1,36 +1,84 @@
 # api.py - Início do arquivo
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g, Response, stream_with_context
 # Garanta que estes imports comecem com "src."
 from src.models.materials_internal import materials_db
-from src.routes.thermal_calc import (
-    encontrar_temperatura_face_fria, 
-    calcular_h_conv, 
-    calcular_economia_financeira,
-    encontrar_espessura_minima_condensacao,
-    SIGMA
+from src.models.thermal_engine import (
+    EntradaInvalida,
+    resolver_lote,
+    caso_do_item,
+    calcular_termico,
+    calcular_varredura,
+    calcular_dimensionamento,
+    calcular_comparacao,
+    calcular_tabela_projeto,
+    calcular_montecarlo,
+    calcular_anual,
+    calcular_condensacao,
+    completar_resultados
 )
-import os
-import tempfile
+from src.utils.metrics import metrics, request_latency
+from src.utils.warmup import estado_aquecimento
+import time
 from datetime import datetime
+from io import BytesIO
 
 # O resto do seu arquivo continua aqui...
 # (Não precisa colar o resto, apenas garanta que as importações acima estão corretas)
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
-# Dados de combustíveis atualizados
-COMBUSTIVEIS = {
-    "Óleo BPF (kg)": {"v": 3.50, "pc": 11.34, "ef": 0.80, "fator_emissao": 3.15},
-    "Gás Natural (m³)": {"v": 3.60, "pc": 9.65, "ef": 0.75, "fator_emissao": 2.0},
-    "Lenha Eucalipto 30% umidade (ton)": {"v": 200.00, "pc": 3500.00, "ef": 0.70, "fator_emissao": 1260},
-    "Eletricidade (kWh)": {"v": 0.75, "pc": 1.00, "ef": 1.00, "fator_emissao": 0.0358}
-}
+def _resposta_condicional(response, etag=None):
+    """Adiciona ETag forte à resposta e devolve 304 se o cliente já tiver esta versão (vale também para POST)"""
+    if etag is None:
+        response.add_etag()
+        etag, _ = response.get_etag()
+    else:
+        response.set_etag(etag)
+    if request.if_none_match.contains(etag):
+        not_modified = Response(status=304)
+        for header in ('ETag', 'Cache-Control', 'X-Cache'):
+            if header in response.headers:
+                not_modified.headers[header] = response.headers[header]
+        return not_modified
+    return response
+
+# Os catálogos mudam apenas com um novo deploy
+CACHE_CONTROL_CATALOGO = 'public, max-age=86400'
+
+def _resposta_catalogo(catalogo):
+    """Serve o JSON pré-serializado de um catálogo com ETag forte e Cache-Control longo"""
+    corpo, etag = materials_db.get_catalog_json(catalogo)
+    response = Response(corpo, content_type='application/json')
+    response.headers['Cache-Control'] = CACHE_CONTROL_CATALOGO
+    return _resposta_condicional(response, etag)
+
+@api_bp.before_request
+def _iniciar_cronometro():
+    """Marca o início da requisição para a métrica de latência"""
+    g.inicio_requisicao = time.perf_counter()
+
+@api_bp.after_request
+def _registrar_latencia(response):
+    """Registra a latência da requisição por endpoint"""
+    inicio = g.pop('inicio_requisicao', None)
+    if inicio is not None:
+        request_latency.observe(time.perf_counter() - inicio, endpoint=request.endpoint or 'desconhecido', method=request.method)
+    return response
+
+@api_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Retorna as métricas da aplicação no formato texto do Prometheus"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@api_bp.route('/ready', methods=['GET'])
+def get_ready():
+    """Prontidão da instância: estado do aquecimento e tempo de import (503 enquanto não estiver pronta)"""
+    return jsonify({"success": True, "data": estado_aquecimento.resumo()}), 200 if estado_aquecimento.pronto else 503
 
 @api_bp.route('/materials', methods=['GET'])
 def get_materials():
     """Retorna todos os materiais isolantes"""
     try:
-        materials = materials_db.get_materials()
-        return jsonify({"success": True, "data": materials})
+        return _resposta_catalogo('materials')
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -38,8 +86,7 @@ def get_materials():
 def get_finishes():
     """Retorna todos os acabamentos"""
     try:
-        finishes = materials_db.get_finishes()
-        return jsonify({"success": True, "data": finishes})
+        return _resposta_catalogo('finishes')
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -47,8 +94,15 @@ def get_finishes():
 def get_fuels():
     """Retorna todos os tipos de combustível"""
     try:
-        fuels = materials_db.get_fuels()
-        return jsonify({"success": True, "data": fuels})
+        return _resposta_catalogo('fuels')
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@api_bp.route('/pipes', methods=['GET'])
+def get_pipes():
+    """Retorna as bitolas NPS padronizadas e as espessuras comerciais de isolante"""
+    try:
+        return _resposta_catalogo('pipes')
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -58,210 +112,408 @@ def calculate_thermal():
     try:
         data = request.get_json()
         
-        # Validação dos dados obrigatórios
-        required_fields = ['material', 'finish', 'geometry', 'hotTemp', 'ambientTemp', 'layerThicknesses']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"success": False, "error": f"Campo obrigatório: {field}"}), 400
+        try:
+            result, cache_status = calcular_termico(data)
+        except EntradaInvalida as ex:
+            return jsonify({"success": False, "error": str(ex)}), 400
         
-        # Buscar dados do material e acabamento
-        materials = materials_db.get_materials()
-        finishes = materials_db.get_finishes()
+        # ETag sobre o corpo da resposta: clientes que repetem o payload recebem 304
+        response = jsonify({"success": True, "data": result})
+        response.headers['X-Cache'] = cache_status
+        return _resposta_condicional(response)
         
-        material = next((m for m in materials if m['nome'] == data['material']), None)
-        finish = next((f for f in finishes if f['acabamento'] == data['finish']), None)
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@api_bp.route('/calculate/thermal/sweep', methods=['POST'])
+def calculate_thermal_sweep():
+    """Varre uma faixa de espessuras e indica a espessura econômica (melhor payback ou VPL)"""
+    try:
+        data = request.get_json()
         
-        if not material:
-            return jsonify({"success": False, "error": "Material não encontrado"}), 400
-        if not finish:
-            return jsonify({"success": False, "error": "Acabamento não encontrado"}), 400
-        
-        # Validar temperatura do material
-        if not (material['t_min'] <= data['hotTemp'] <= material['t_max']):
-            return jsonify({
-                "success": False, 
-                "error": f"Temperatura fora dos limites do material ({material['t_min']}°C a {material['t_max']}°C)"
-            }), 400
-        
-        if data['hotTemp'] <= data['ambientTemp']:
-            return jsonify({
-                "success": False, 
-                "error": "A temperatura da face quente deve ser maior que a temperatura ambiente"
-            }), 400
-        
-        # Parâmetros do cálculo
-        Tq = data['hotTemp']
-        To = data['ambientTemp']
-        geometry = data['geometry']
-        emissividade = finish['emissividade']
-        k_func_str = material['k_func']
-        
-        # Calcular espessura total
-        L_total = sum(data['layerThicknesses']) / 1000  # Converter mm para m
-        
-        # Diâmetro da tubulação (se aplicável)
-        pipe_diameter_m = data.get('pipeDiameter', 0) / 1000 if data.get('pipeDiameter') else None
-        
-        # Calcular temperatura da face fria
-        Tf, q_com_isolante, convergiu = encontrar_temperatura_face_fria(
-            Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m
-        )
+        try:
+            result = calcular_varredura(data)
+        except EntradaInvalida as ex:
+            return jsonify({"success": False, "error": str(ex)}), 400
         
-        if not convergiu:
-            return jsonify({"success": False, "error": "Não foi possível convergir o cálculo"}), 400
-        
-        # Calcular perda sem isolante
-        h_sem = calcular_h_conv(Tq, To, geometry, pipe_diameter_m)
-        q_rad_sem = emissividade * SIGMA * ((Tq + 273.15)**4 - (To + 273.15)**4)
-        q_conv_sem = h_sem * (Tq - To)
-        q_sem_isolante = q_conv_sem + q_rad_sem
-        
-        # Converter para kW/m²
-        perda_com_kw = q_com_isolante / 1000
-        perda_sem_kw = q_sem_isolante / 1000
-        
-        result = {
-            'temperatureFaceFria': round(Tf, 1),
-            'perdaComIsolante': round(perda_com_kw, 3),
-            'perdaSemIsolante': round(perda_sem_kw, 3),
-            'convergiu': convergiu
-        }
-        
-        # Cálculo financeiro (se solicitado)
-        if data.get('calculateFinancial', False):
-            financial_data = data.get('financialData', {})
-            combustivel = financial_data.get('fuel', 'Eletricidade (kWh)')
-            
-            fuels = materials_db.get_fuels()
-            if combustivel in fuels:
-                comb_data = fuels[combustivel]
-                valor_combustivel = financial_data.get('fuelCost', comb_data['v'])
-                
-                economia = calcular_economia_financeira(
-                    perda_com_kw, perda_sem_kw,
-                    financial_data.get('area', 10),
-                    financial_data.get('hoursPerDay', 8),
-                    financial_data.get('daysPerWeek', 5),
-                    valor_combustivel,
-                    comb_data['pc'],
-                    comb_data['ef'],
-                    comb_data['fator_emissao']
-                )
-                
-                result.update({
-                    'economiaMensal': round(economia['economia_mensal'], 2),
-                    'economiaAnual': round(economia['economia_anual'], 2),
-                    'co2EvitadoTonAno': round(economia['co2_ton_ano'], 2),
-                    'reducaoPercentual': round(economia['reducao_pct'], 1)
-                })
+        return jsonify({"success": True, "data": result})
+        
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@api_bp.route('/calculate/thermal/design', methods=['POST'])
+def calculate_thermal_design():
+    """Dimensionamento inverso: espessura mínima para um limite de temperatura superficial ou de perda"""
+    try:
+        data = request.get_json()
+        
+        try:
+            result = calcular_dimensionamento(data)
+        except EntradaInvalida as ex:
+            return jsonify({"success": False, "error": str(ex)}), 400
         
         return jsonify({"success": True, "data": result})
         
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
-@api_bp.route('/calculate/condensation', methods=['POST'])
-def calculate_condensation():
-    """Realiza o cálculo de condensação"""
+@api_bp.route('/calculate/thermal/compare', methods=['POST'])
+def calculate_thermal_compare():
+    """Compara todos os materiais × acabamentos do catálogo em uma passada vetorizada, ordenados pelo critério"""
     try:
         data = request.get_json()
         
-        # Validação dos dados obrigatórios
-        required_fields = ['material', 'geometry', 'internalTemp', 'ambientTemp', 'humidity']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({"success": False, "error": f"Campo obrigatório: {field}"}), 400
+        try:
+            result = calcular_comparacao(data)
+        except EntradaInvalida as ex:
+            return jsonify({"success": False, "error": str(ex)}), 400
         
-        # Buscar dados do material
-        materials = materials_db.get_materials()
-        material = next((m for m in materials if m['nome'] == data['material']), None)
+        return jsonify({"success": True, "data": result})
         
-        if not material:
-            return jsonify({"success": False, "error": "Material não encontrado"}), 400
-        
-        # Validar temperaturas
-        Ti = data['internalTemp']
-        Ta = data['ambientTemp']
-        
-        if Ta <= Ti:
-            return jsonify({
-                "success": False, 
-                "error": "A temperatura ambiente deve ser maior que a temperatura interna"
-            }), 400
-        
-        # Parâmetros do cálculo
-        geometry = data['geometry']
-        k_func_str = material['k_func']
-        pipe_diameter_m = data.get('pipeDiameter', 0) / 1000 if data.get('pipeDiameter') else None
-        wind_speed = data.get('windSpeed', 0)
-        humidity = data['humidity']
-        
-        # Calcular espessura mínima
-        espessura_mm, T_orvalho = encontrar_espessura_minima_condensacao(
-            Ti, Ta, k_func_str, geometry, pipe_diameter_m, wind_speed, humidity
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@api_bp.route('/calculate/thermal/table', methods=['POST'])
+def calculate_thermal_table():
+    """Tabela de projeto: perda por metro e temperatura superficial para todas as bitolas NPS × espessuras"""
+    try:
+        data = request.get_json()
+        
+        try:
+            result, cache_status = calcular_tabela_projeto(data)
+        except EntradaInvalida as ex:
+            return jsonify({"success": False, "error": str(ex)}), 400
+        
+        response = jsonify({"success": True, "data": result})
+        response.headers['X-Cache'] = cache_status
+        return _resposta_condicional(response)
+        
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+# Limite de itens por requisição no cálculo em lote
+MAX_ITENS_LOTE = 20000
+
+def _validar_item_lote(item):
+    """Valida um item do lote e retorna (caso, None) ou (None, mensagem de erro)"""
+    try:
+        return caso_do_item(item), None
+    except EntradaInvalida as ex:
+        return None, str(ex)
+
+def _resolver_casos_lote(casos):
+    """Resolve casos validados por _validar_item_lote em uma passada vetorizada (um resultado por caso)"""
+    resultados = []
+    for resultado in resolver_lote(casos):
+        if resultado.convergiu:
+            perda_com_kw = resultado.perda_com_kw
+            perda_sem_kw = resultado.perda_sem_kw
+            resultados.append({
+                'success': True,
+                'temperatureFaceFria': round(resultado.Tf, 1),
+                'perdaComIsolante': round(perda_com_kw, 3),
+                'perdaSemIsolante': round(perda_sem_kw, 3),
+                'reducaoPercentual': round((perda_sem_kw - perda_com_kw) / perda_sem_kw * 100, 1) if perda_sem_kw > 0 else 0,
+                'convergiu': True,
+                'iteracoes': resultado.iteracoes
+            })
+        else:
+            resultados.append({
+                'success': False,
+                'error': "Não foi possível convergir o cálculo",
+                'convergiu': False,
+                'iteracoes': resultado.iteracoes
+            })
+    return resultados
+
+@api_bp.route('/calculate/thermal/batch', methods=['POST'])
+def calculate_thermal_batch():
+    """Realiza o cálculo térmico de vários itens em uma única passada vetorizada"""
+    try:
+        data = request.get_json()
+        items = data.get('items') if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            return jsonify({"success": False, "error": "Campo obrigatório: items"}), 400
+        if len(items) > MAX_ITENS_LOTE:
+            return jsonify({"success": False, "error": f"Máximo de {MAX_ITENS_LOTE} itens por requisição"}), 400
+
+        results = [None] * len(items)
+        casos, indices = [], []
+        for i, item in enumerate(items):
+            caso, erro = _validar_item_lote(item) if isinstance(item, dict) else (None, "Item inválido")
+            if erro:
+                results[i] = {'index': i, 'success': False, 'error': erro}
+            else:
+                casos.append(caso)
+                indices.append(i)
+
+        if casos:
+            for i, resultado in zip(indices, _resolver_casos_lote(casos)):
+                results[i] = {'index': i, **resultado}
+
+        for i, item in enumerate(items):
+            if isinstance(item, dict) and 'id' in item:
+                results[i]['id'] = item['id']
+
+        return jsonify({
+            "success": True,
+            "data": {
+                'results': results,
+                'total': len(items),
+                'convergidos': sum(1 for r in results if r.get('convergiu'))
+            }
+        })
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@api_bp.route('/import/inventory', methods=['POST'])
+def import_inventory():
+    """
+    Importa um inventário CSV e transmite os resultados em NDJSON (uma linha por item)
+    
+    multipart/form-data: 'inventory' (CSV com tag, geometry, diameter, temperature,
+    material, finish e thickness) e 'params' opcional (JSON com os padrões finish,
+    ambientTemp e windSpeed).
+    """
+    try:
+        import json
+        from itertools import chain
+        from src.utils.csv_stream import ler_csv_em_blocos, CSVInvalido
+        from src.utils.inventory_import import (
+            importar_inventario, COLUNAS_OBRIGATORIAS, TAMANHO_BLOCO_IMPORTACAO
         )
         
-        if espessura_mm is None:
-            return jsonify({
-                "success": False, 
-                "error": "Não foi possível encontrar espessura que evite condensação até 500mm"
-            }), 400
+        inventario = request.files.get('inventory')
+        if inventario is None:
+            return jsonify({"success": False, "error": "Campo obrigatório: inventory (arquivo CSV)"}), 400
+        try:
+            padroes = json.loads(request.form.get('params') or '{}')
+        except ValueError:
+            return jsonify({"success": False, "error": "params deve ser um JSON válido"}), 400
+        if not isinstance(padroes, dict):
+            return jsonify({"success": False, "error": "params deve ser um objeto JSON"}), 400
+        
+        # O Flask fecha os arquivos do upload ao fim da view, antes da resposta ser transmitida:
+        # o stream é desacoplado da requisição e fechado pelo próprio gerador
+        arquivo, inventario.stream = inventario.stream, BytesIO()
+        
+        # Lê o primeiro bloco antes de responder: erros de cabeçalho ainda viram 400
+        blocos = ler_csv_em_blocos(arquivo, TAMANHO_BLOCO_IMPORTACAO, COLUNAS_OBRIGATORIAS)
+        try:
+            primeiro = next(blocos, None)
+        except CSVInvalido as ex:
+            arquivo.close()
+            return jsonify({"success": False, "error": str(ex)}), 400
+        blocos = chain([primeiro], blocos) if primeiro else iter(())
+        
+        def gerar():
+            try:
+                yield from importar_inventario(blocos, padroes, _validar_item_lote, _resolver_casos_lote)
+            finally:
+                arquivo.close()
+        
+        return Response(stream_with_context(gerar()), mimetype='application/x-ndjson')
+        
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@api_bp.route('/calculate/thermal/montecarlo', methods=['POST'])
+def calculate_thermal_montecarlo():
+    """Análise de incerteza: amostra os parâmetros incertos e resolve todas as amostras de uma vez"""
+    try:
+        data = request.get_json()
+        
+        try:
+            result = calcular_montecarlo(data)
+        except EntradaInvalida as ex:
+            return jsonify({"success": False, "error": str(ex)}), 400
+        
+        return jsonify({"success": True, "data": result})
+        
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@api_bp.route('/calculate/thermal/annual', methods=['POST'])
+def calculate_thermal_annual():
+    """
+    Simulação anual hora a hora a partir de um perfil CSV
+    
+    multipart/form-data: 'profile' (CSV com ambientTemp e, opcionalmente, windSpeed,
+    operating e timestamp) e 'params' (JSON com os dados do isolamento e financeiros).
+    """
+    try:
+        import json
+        from src.utils.csv_stream import ler_csv_em_blocos, CSVInvalido
+        
+        perfil = request.files.get('profile')
+        if perfil is None:
+            return jsonify({"success": False, "error": "Campo obrigatório: profile (arquivo CSV)"}), 400
+        try:
+            data = json.loads(request.form.get('params') or '{}')
+        except ValueError:
+            return jsonify({"success": False, "error": "params deve ser um JSON válido"}), 400
+        
+        # O CSV é lido em blocos direto do upload; só os acumuladores ficam em memória
+        try:
+            result = calcular_anual(data, ler_csv_em_blocos(perfil.stream, obrigatorias=('ambientTemp',)))
+        except (CSVInvalido, EntradaInvalida) as ex:
+            return jsonify({"success": False, "error": str(ex)}), 400
+        
+        return jsonify({"success": True, "data": result})
+        
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@api_bp.route('/calculate/condensation', methods=['POST'])
+def calculate_condensation():
+    """Realiza o cálculo de condensação"""
+    try:
+        data = request.get_json()
         
-        result = {
-            'temperaturaOrvalho': round(T_orvalho, 1),
-            'espessuraMinima': espessura_mm,
-            'success': True
-        }
+        try:
+            result = calcular_condensacao(data)
+        except EntradaInvalida as ex:
+            return jsonify({"success": False, "error": str(ex)}), 400
         
         return jsonify({"success": True, "data": result})
         
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
+# Prefixo do nome do arquivo por tipo de relatório
+PDF_FILENAME_PREFIXES = {
+    'thermal': 'relatorio_termico',
+    'condensation': 'relatorio_condensacao',
+}
+
+def _pdf_filename(report_type):
+    """Nome do arquivo PDF para download"""
+    return f"{PDF_FILENAME_PREFIXES[report_type]}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
+
 @api_bp.route('/download/pdf/<report_type>', methods=['POST'])
 def download_pdf(report_type):
     """Gera e retorna um PDF do relatório"""
     try:
-        from src.utils.pdf_generator import PDFGenerator
+        from src.utils.pdf_generator import get_pdf_generator
         from flask import send_file
         
         data = request.get_json()
         
         # Validar tipo de relatório
-        if report_type not in ['thermal', 'condensation']:
+        if report_type not in PDF_FILENAME_PREFIXES:
             return jsonify({"success": False, "error": "Tipo de relatório inválido"}), 400
         
-        # Criar gerador de PDF
-        pdf_generator = PDFGenerator()
+        # Gerar o PDF em memória (sem arquivo temporário) com o gerador compartilhado;
+        # sem 'results' no payload, os resultados são calculados pelo motor
+        try:
+            pdf_bytes = get_pdf_generator().render_report(report_type, data)
+        except EntradaInvalida as ex:
+            return jsonify({"success": False, "error": str(ex)}), 400
+        
+        return send_file(
+            BytesIO(pdf_bytes),
+            as_attachment=True,
+            download_name=_pdf_filename(report_type),
+            mimetype='application/pdf'
+        )
+            
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+# Limite de relatórios por ZIP
+MAX_RELATORIOS_LOTE = 1000
+
+@api_bp.route('/download/pdf/batch', methods=['POST'])
+def download_pdf_batch():
+    """Gera vários relatórios em paralelo e os transmite em um único ZIP"""
+    try:
+        from src.utils.pdf_batch import generate_zip, REPORT_TYPES
         
-        # Criar arquivo temporário
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            tmp_path = tmp_file.name
+        data = request.get_json()
+        reports = data.get('reports') if isinstance(data, dict) else None
+        if not isinstance(reports, list) or not reports:
+            return jsonify({"success": False, "error": "Campo obrigatório: reports"}), 400
+        if len(reports) > MAX_RELATORIOS_LOTE:
+            return jsonify({"success": False, "error": f"Máximo de {MAX_RELATORIOS_LOTE} relatórios por requisição"}), 400
+        
+        for i, report in enumerate(reports):
+            if not isinstance(report, dict) or report.get('type') not in REPORT_TYPES:
+                return jsonify({"success": False, "error": f"Tipo de relatório inválido no item {i}"}), 400
+        
+        workers = data.get('workers')
+        if workers is not None and (not isinstance(workers, int) or workers < 1):
+            return jsonify({"success": False, "error": "workers deve ser um inteiro positivo"}), 400
+        
+        filename = f"relatorios_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
+        return Response(
+            stream_with_context(generate_zip(reports, workers)),
+            mimetype='application/zip',
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
         
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@api_bp.route('/reports', methods=['POST'])
+def enqueue_report():
+    """Enfileira a geração de um relatório PDF e retorna o id do job imediatamente"""
+    try:
+        from src.utils.report_jobs import report_queue, QueueFullError
+
+        data = request.get_json()
+        report_type = data.get('type') if isinstance(data, dict) else None
+        if report_type not in PDF_FILENAME_PREFIXES:
+            return jsonify({"success": False, "error": "Tipo de relatório inválido"}), 400
+
+        # Mesma validação de /download/pdf/<type>: os resultados são calculados agora,
+        # então entradas inválidas viram 400 em vez de um job que falha depois
         try:
-            if report_type == 'thermal':
-                # Gerar relatório térmico
-                pdf_generator.generate_thermal_report(data, tmp_path)
-                filename = f"relatorio_termico_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            else:
-                # Gerar relatório de condensação
-                pdf_generator.generate_condensation_report(data, tmp_path)
-                filename = f"relatorio_condensacao_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf"
-            
-            # Retornar o arquivo PDF
+            payload = completar_resultados(report_type, data.get('data', {}))
+        except EntradaInvalida as ex:
+            return jsonify({"success": False, "error": str(ex)}), 400
+
+        try:
+            job = report_queue.submit(report_type, payload)
+        except QueueFullError as ex:
+            response = jsonify({"success": False, "error": str(ex)})
+            response.headers['Retry-After'] = str(ex.retry_after)
+            return response, 429
+
+        response = jsonify({"success": True, "data": job.to_dict()})
+        response.headers['Location'] = f"{request.script_root}/api/reports/{job.id}"
+        return response, 202
+
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+@api_bp.route('/reports/<job_id>', methods=['GET'])
+def get_report(job_id):
+    """Retorna o estado do job ou, se concluído, o PDF gerado"""
+    try:
+        from src.utils.report_jobs import report_queue, STATUS_DONE, STATUS_FAILED
+        from flask import send_file
+
+        job = report_queue.get(job_id)
+        if job is None:
+            return jsonify({"success": False, "error": "Job não encontrado ou expirado"}), 404
+
+        if job.status == STATUS_DONE:
             return send_file(
-                tmp_path,
+                BytesIO(job.result),
                 as_attachment=True,
-                download_name=filename,
+                download_name=_pdf_filename(job.report_type),
                 mimetype='application/pdf'
             )
-            
-        except Exception as e:
-            # Limpar arquivo temporário em caso de erro
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-            raise e
-            
+        # Job com falha: o estado ('failed') e o erro vêm em data
+        if job.status == STATUS_FAILED:
+            return jsonify({"success": True, "data": job.to_dict()})
+
+        # Ainda na fila ou em renderização
+        response = jsonify({"success": True, "data": job.to_dict()})
+        response.headers['Retry-After'] = '1'
+        return response, 202
+
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -273,8 +525,7 @@ def validate_temperature():
         material_name = data.get('material')
         temperature = data.get('temperature')
         
-        materials = materials_db.get_materials()
-        material = next((m for m in materials if m['nome'] == material_name), None)
+        material = materials_db.get_material_by_name(material_name)
         
         if not material:
             return jsonify({"success": False, "error": "Material não encontrado"}), 404
@@ -1,32 +1,34 @@
 """
 Módulo de cálculos térmicos baseado na lógica do Streamlit
 """
+import logging
 import math
 
+from src.models.materials_internal import ESPESSURAS_COMERCIAIS_MM
+from src.utils.air_properties import grupos_conveccao, obter_tabela_h_conv, L_C_PLACA
+from src.utils.k_func import k_func_registry, KFuncError
+from src.utils.metrics import solver_iterations, solver_nonconvergence, k_evaluations
+
+logger = logging.getLogger(__name__)
+
 # Constante global
 SIGMA = 5.67e-8
 
 def calcular_k(k_func_str, T_media):
     """Calcula a condutividade térmica baseada na função e temperatura média"""
     try:
-        k_func_safe = str(k_func_str).replace(',', '.')
-        return eval(k_func_safe, {"math": math, "T": T_media})
+        return k_func_registry.obter(k_func_str)(T_media)
     except Exception as ex:
-        print(f"Erro na fórmula k(T) '{k_func_str}': {ex}")
+        logger.warning("Erro na fórmula k(T) k_func=%r erro=%s", k_func_str, ex)
         return None
 
 def calcular_h_conv(Tf, To, geometry, outer_diameter_m=None, wind_speed_ms=0):
-    """Calcula o coeficiente de convecção"""
-    Tf_K, To_K = Tf + 273.15, To + 273.15
-    T_film_K = (Tf_K + To_K) / 2
-    g, beta = 9.81, 1 / T_film_K
-    nu = 1.589e-5 * (T_film_K / 293.15)**0.7
-    alpha = 2.25e-5 * (T_film_K / 293.15)**0.8
-    k_ar = 0.0263
-    Pr = nu / alpha
+    """Calcula o coeficiente de convecção (propriedades do ar tabeladas pela temperatura de filme)"""
     delta_T = abs(Tf - To)
     if delta_T == 0: 
         return 0
+    T_film_K = (Tf + To) / 2 + 273.15
+    nu, k_ar, fator_ra, pr_terco, fator_tubo = grupos_conveccao(T_film_K)
     
     if wind_speed_ms >= 1.0:
         L_c = 1.0 if geometry == "Superfície Plana" else outer_diameter_m
@@ -34,64 +36,451 @@ def calcular_h_conv(Tf, To, geometry, outer_diameter_m=None, wind_speed_ms=0):
             L_c = 1.0
         Re = (wind_speed_ms * L_c) / nu
         if Re < 5e5:
-            Nu = 0.664 * (Re**0.5) * (Pr**(1/3))
+            Nu = 0.664 * (Re**0.5) * pr_terco
         else:
-            Nu = (0.037 * (Re**0.8) - 871) * (Pr**(1/3))
+            Nu = (0.037 * (Re**0.8) - 871) * pr_terco
     else:
+        tabela = obter_tabela_h_conv(geometry)
+        if tabela is not None:
+            h = tabela.h_escalar(delta_T, T_film_K, outer_diameter_m)
+            if h is not None:
+                return h
         if geometry == "Superfície Plana":
-            L_c = 0.1
-            Ra = (g * beta * delta_T * L_c**3) / (nu * alpha)
-            Nu = 0.27 * Ra**(1/4)
+            L_c = L_C_PLACA
+            Ra = fator_ra * delta_T * L_c**3
+            Nu = 0.27 * Ra**0.25
         elif geometry == "Tubulação":
             L_c = outer_diameter_m
-            Ra = (g * beta * delta_T * L_c**3) / (nu * alpha)
-            term1 = 0.60
-            term2 = (0.387 * Ra**(1/6)) / ((1 + (0.559 / Pr)**(9/16))**(8/27))
-            Nu = (term1 + term2)**2
+            Ra = fator_ra * delta_T * L_c**3
+            Nu = (0.60 + fator_tubo * Ra**(1/6))**2
         else:
             Nu = 0
     
     return (Nu * k_ar) / L_c
 
-def encontrar_temperatura_face_fria(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0):
-    """Encontra a temperatura da face fria através de iteração"""
-    Tf = To + 10.0
+def _fator_geometrico(L_total, geometry, pipe_diameter_m):
+    """Retorna (divisor da condução, diâmetro da superfície externa) ou None se a geometria for inválida"""
+    if geometry == "Superfície Plana":
+        return L_total, L_total
+    if geometry == "Tubulação":
+        if not pipe_diameter_m:
+            return None
+        r_inner = pipe_diameter_m / 2
+        r_outer = r_inner + L_total
+        if r_inner <= 0 or r_outer <= r_inner:
+            return None
+        return r_outer * math.log(r_outer / r_inner), r_outer * 2
+    return None
+
+def _balanco_face_fria(Tf, Tq, To, k_media, divisor, outer_surface_diameter, geometry, emissividade, wind_speed_ms):
+    """
+    Retorna (condução - transferência superficial, transferência) para uma Tf, ou (None, None) se k for inválido
+
+    A condução usa a condutividade média integral k̄(Tq, Tf) = ∫ k dT / (Tq - Tf).
+    """
+    try:
+        k = k_media(Tq, Tf)
+    except (ArithmeticError, ValueError):
+        return None, None
+    if k is None or not k > 0:
+        return None, None
+
+    q_conducao = k * (Tq - Tf) / divisor
+    Tf_K, To_K = Tf + 273.15, To + 273.15
+    h_conv = calcular_h_conv(Tf, To, geometry, outer_surface_diameter, wind_speed_ms)
+    q_rad = emissividade * SIGMA * (Tf_K**4 - To_K**4)
+    q_conv = h_conv * (Tf - To)
+    q_transferencia = q_conv + q_rad
+    return q_conducao - q_transferencia, q_transferencia
+
+def _face_fria_passo(balanco, To, Tf_inicial=None):
+    """Solver original: passos fixos a partir de To + 10, reduzidos à metade a cada troca de sinal"""
+    Tf = To + 10.0 if Tf_inicial is None else Tf_inicial
     max_iter, step, min_step, tolerancia = 1000, 50.0, 0.001, 0.5
     erro_anterior = None
-    
+
     for i in range(max_iter):
-        T_media = (Tq + Tf) / 2
-        k = calcular_k(k_func_str, T_media)
-        if k is None or k <= 0: 
-            return None, None, False
+        erro, q_transferencia = balanco(Tf)
+        if erro is None:
+            return None, None, False, i + 1
 
-        if geometry == "Superfície Plana":
-            q_conducao = k * (Tq - Tf) / L_total
-            outer_surface_diameter = L_total
-        elif geometry == "Tubulação":
-            r_inner = pipe_diameter_m / 2
-            r_outer = r_inner + L_total
-            if r_inner <= 0 or r_outer <= r_inner: 
-                return None, None, False
-            q_conducao = (k * (Tq - Tf)) / (r_outer * math.log(r_outer / r_inner))
-            outer_surface_diameter = r_outer * 2
-
-        Tf_K, To_K = Tf + 273.15, To + 273.15
-        h_conv = calcular_h_conv(Tf, To, geometry, outer_surface_diameter, wind_speed_ms)
-        q_rad = emissividade * SIGMA * (Tf_K**4 - To_K**4)
-        q_conv = h_conv * (Tf - To)
-        q_transferencia = q_conv + q_rad
-        
-        erro = q_conducao - q_transferencia
-        if abs(erro) < tolerancia: 
-            return Tf, q_transferencia, True
+        if abs(erro) < tolerancia:
+            return Tf, q_transferencia, True, i + 1
 
         if erro_anterior is not None and erro * erro_anterior < 0:
             step = max(min_step, step * 0.5)
         Tf += step if erro > 0 else -step
         erro_anterior = erro
-        
-    return Tf, None, False
+
+    return Tf, None, False, max_iter
+
+def _intervalo_estreito(balanco, T_min, T_max, Tf_inicial, margem):
+    """
+    Intervalo [Tf_inicial - margem, Tf_inicial + margem] (limitado a [T_min, T_max])
+
+    Se a raiz não estiver nele, o balanço decrescente indica o lado e o intervalo
+    vira o restante do intervalo completo (uma avaliação a mais, no extremo).
+    """
+    x1 = min(max(Tf_inicial - margem, T_min), T_max)
+    x2 = min(max(Tf_inicial + margem, T_min), T_max)
+    f1, q1 = balanco(x1)
+    if f1 is None:
+        return None, 1
+    f2, q2 = balanco(x2)
+    if f2 is None:
+        return None, 2
+    if f1 * f2 <= 0:
+        return ((x1, f1, q1), (x2, f2, q2)), 2
+    # Raiz acima de x2 (balanço ainda positivo) ou abaixo de x1
+    x3 = T_max if f2 > 0 else T_min
+    f3, q3 = balanco(x3)
+    if f3 is None:
+        return None, 3
+    return (((x2, f2, q2), (x3, f3, q3)) if f2 > 0 else ((x3, f3, q3), (x1, f1, q1))), 3
+
+def _intervalo_aquecido(balanco, Tq, To, Tf_inicial, margem=None):
+    """
+    Estreita o intervalo [To, Tq] em torno de uma estimativa inicial de Tf
+
+    Com margem (erro esperado da estimativa, ex.: preditor da varredura) usa o
+    intervalo estreito de _intervalo_estreito. Sem ela, o sinal do balanço
+    (decrescente com Tf) em Tf_inicial indica o lado da raiz e a busca caminha com
+    passos dobrando até a troca de sinal (ou o extremo).
+    Retorna ((x1, f1, q1), (x2, f2, q2), avaliações) ou None se k for inválido.
+    """
+    T_min, T_max = min(To, Tq), max(To, Tq)
+    if margem is not None and margem > 0:
+        return _intervalo_estreito(balanco, T_min, T_max, Tf_inicial, margem)
+    x1 = min(max(Tf_inicial, T_min), T_max)
+    f1, q1 = balanco(x1)
+    avaliacoes = 1
+    if f1 is None:
+        return None, avaliacoes
+    if f1 == 0:
+        return ((x1, f1, q1), (x1, f1, q1)), avaliacoes
+
+    sentido = 1.0 if f1 > 0 else -1.0
+    limite = T_max if sentido > 0 else T_min
+    passo = max(1e-3 * (T_max - T_min), 1e-3)
+    while True:
+        x2 = x1 + sentido * passo
+        if (x2 - limite) * sentido >= 0:
+            x2 = limite
+        f2, q2 = balanco(x2)
+        avaliacoes += 1
+        if f2 is None:
+            return None, avaliacoes
+        if f2 * f1 <= 0 or x2 == limite:
+            return ((x1, f1, q1), (x2, f2, q2)), avaliacoes
+        x1, f1, q1 = x2, f2, q2
+        passo *= 2.0
+
+def _face_fria_brent(balanco, Tq, To, tolerancia_relativa, max_iter=100, Tf_inicial=None, Tf_margem=None):
+    """
+    Solver de Brent com intervalo garantido entre To e Tq
+
+    Com k > 0 o balanço tem sinais opostos em Tf = To (só condução) e Tf = Tq
+    (só transferência superficial), então a raiz está sempre nesse intervalo.
+    Usa interpolação inversa quadrática/secante com salvaguarda por bisseção.
+    Com Tf_inicial (ex.: solução de um caso vizinho) o intervalo é estreitado antes;
+    Tf_margem (erro esperado da estimativa) dá um intervalo inicial de largura 2·Tf_margem.
+    """
+    if Tf_inicial is not None and Tq != To:
+        intervalo, iteracoes = _intervalo_aquecido(balanco, Tq, To, Tf_inicial, Tf_margem)
+        if intervalo is None:
+            return None, None, False, iteracoes
+        (a, fa, qa), (b, fb, qb) = intervalo
+    else:
+        a, b = To, Tq
+        fa, qa = balanco(a)
+        if fa is None:
+            return None, None, False, 1
+        fb, qb = balanco(b)
+        if fb is None:
+            return None, None, False, 2
+        iteracoes = 2
+
+    if fa == 0:
+        return a, qa, True, iteracoes
+    if fb == 0:
+        return b, qb, True, iteracoes
+    if fa * fb > 0:
+        return None, None, False, iteracoes
+
+    tol_T = tolerancia_relativa * max(abs(Tq - To), 1.0)
+    c, fc, qc = a, fa, qa
+    d = e = b - a
+
+    while iteracoes < max_iter:
+        if fb * fc > 0:
+            c, fc, qc = a, fa, qa
+            d = e = b - a
+        if abs(fc) < abs(fb):
+            a, fa, qa = b, fb, qb
+            b, fb, qb = c, fc, qc
+            c, fc, qc = a, fa, qa
+
+        tol1 = 2.0 * 1e-15 * abs(b) + 0.5 * tol_T
+        xm = 0.5 * (c - b)
+        if abs(xm) <= tol1 or fb == 0:
+            return b, qb, True, iteracoes
+
+        if abs(e) >= tol1 and abs(fa) > abs(fb):
+            s = fb / fa
+            if a == c:
+                # Passo secante
+                p = 2.0 * xm * s
+                q = 1.0 - s
+            else:
+                # Interpolação inversa quadrática
+                q = fa / fc
+                r = fb / fc
+                p = s * (2.0 * xm * q * (q - r) - (b - a) * (r - 1.0))
+                q = (q - 1.0) * (r - 1.0) * (s - 1.0)
+            if p > 0:
+                q = -q
+            p = abs(p)
+            if 2.0 * p < min(3.0 * xm * q - abs(tol1 * q), abs(e * q)):
+                e, d = d, p / q
+            else:
+                d = e = xm
+        else:
+            d = e = xm
+
+        a, fa, qa = b, fb, qb
+        if abs(d) > tol1:
+            b += d
+        else:
+            b += tol1 if xm > 0 else -tol1
+        fb, qb = balanco(b)
+        iteracoes += 1
+        if fb is None:
+            return None, None, False, iteracoes
+
+    return b, None, False, iteracoes
+
+# Métodos disponíveis para o solver da face fria
+METODO_BRENT = "brent"
+METODO_PASSO = "passo"
+METODOS_SOLVER = (METODO_BRENT, METODO_PASSO)
+METODO_PADRAO = METODO_BRENT
+TOLERANCIA_RELATIVA = 1e-6
+
+def resolver_temperatura_face_fria(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                                   metodo=METODO_PADRAO, tolerancia_relativa=TOLERANCIA_RELATIVA, Tf_inicial=None,
+                                   Tf_margem=None):
+    """
+    Encontra a temperatura da face fria e retorna (Tf, q, convergiu, iteracoes)
+
+    Tf_inicial permite partir da solução de um caso vizinho (ex.: espessura anterior);
+    Tf_margem é o erro esperado dessa estimativa (só o solver de Brent a usa).
+    """
+    try:
+        k_media = k_func_registry.obter_integral(k_func_str).media
+    except KFuncError as ex:
+        logger.warning("Erro na fórmula k(T) k_func=%r erro=%s", k_func_str, ex)
+        solver_nonconvergence.inc(solver=metodo)
+        return None, None, False, 0
+
+    geometria = _fator_geometrico(L_total, geometry, pipe_diameter_m)
+    if geometria is None:
+        solver_nonconvergence.inc(solver=metodo)
+        return None, None, False, 0
+    divisor, outer_surface_diameter = geometria
+
+    def balanco(Tf):
+        return _balanco_face_fria(Tf, Tq, To, k_media, divisor, outer_surface_diameter, geometry, emissividade, wind_speed_ms)
+
+    if metodo == METODO_PASSO:
+        resultado = _face_fria_passo(balanco, To, Tf_inicial)
+    elif metodo == METODO_BRENT:
+        resultado = _face_fria_brent(balanco, Tq, To, tolerancia_relativa, Tf_inicial=Tf_inicial, Tf_margem=Tf_margem)
+    else:
+        raise ValueError(f"Método de solver desconhecido: {metodo}")
+
+    # Cada avaliação do balanço corresponde a uma avaliação de k(T)
+    Tf, _, convergiu, iteracoes = resultado
+    solver_iterations.observe(iteracoes, solver=metodo)
+    k_evaluations.inc(iteracoes, solver=metodo)
+    if not convergiu:
+        solver_nonconvergence.inc(solver=metodo)
+        logger.info("Solve da face fria não convergiu solver=%s Tq=%s To=%s L=%s geometria=%s iteracoes=%d",
+                    metodo, Tq, To, L_total, geometry, iteracoes)
+    elif logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Solve da face fria solver=%s Tq=%s To=%s L=%s Tf=%.3f iteracoes=%d",
+                     metodo, Tq, To, L_total, Tf, iteracoes)
+    return resultado
+
+def encontrar_temperatura_face_fria(Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                                    metodo=METODO_PADRAO, Tf_inicial=None):
+    """Encontra a temperatura da face fria através de iteração"""
+    Tf, q_transferencia, convergiu, _ = resolver_temperatura_face_fria(
+        Tq, To, L_total, k_func_str, geometry, emissividade, pipe_diameter_m, wind_speed_ms, metodo,
+        Tf_inicial=Tf_inicial
+    )
+    return Tf, q_transferencia, convergiu
+
+# Rótulo do solver multicamadas nas métricas
+METODO_MULTICAMADA = "multicamada"
+
+def _divisores_camadas(espessuras_m, geometry, pipe_diameter_m):
+    """
+    Divisores da condução por camada, referidos à superfície externa, e o diâmetro externo
+
+    Com q = k_i·(T_{i-1} - T_i)/d_i o fluxo é o mesmo em todas as camadas; a soma dos
+    d_i é o divisor de _fator_geometrico para a espessura total.
+    """
+    if not espessuras_m or any(L <= 0 for L in espessuras_m):
+        return None
+    if geometry == "Superfície Plana":
+        return list(espessuras_m), sum(espessuras_m)
+    if geometry == "Tubulação":
+        if not pipe_diameter_m or pipe_diameter_m <= 0:
+            return None
+        raios = [pipe_diameter_m / 2]
+        for L in espessuras_m:
+            raios.append(raios[-1] + L)
+        r_outer = raios[-1]
+        return [r_outer * math.log(r2 / r1) for r1, r2 in zip(raios, raios[1:])], r_outer * 2
+    return None
+
+def _resolver_tridiagonal(inferior, diagonal, superior, lado_direito):
+    """Algoritmo de Thomas: resolve o sistema tridiagonal em O(n)"""
+    n = len(diagonal)
+    c, d = [0.0] * n, [0.0] * n
+    c[0] = superior[0] / diagonal[0] if n > 1 else 0.0
+    d[0] = lado_direito[0] / diagonal[0]
+    for i in range(1, n):
+        m = diagonal[i] - inferior[i] * c[i - 1]
+        c[i] = superior[i] / m if i < n - 1 else 0.0
+        d[i] = (lado_direito[i] - inferior[i] * d[i - 1]) / m
+    for i in range(n - 2, -1, -1):
+        d[i] -= c[i] * d[i + 1]
+    return d
+
+def resolver_multicamada(Tq, To, espessuras_m, k_func_strs, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                         tolerancia_relativa=TOLERANCIA_RELATIVA, max_iter=50):
+    """
+    Resolve um isolamento de várias camadas (materiais diferentes) e retorna
+    (temperaturas, q, convergiu, iteracoes)
+
+    temperaturas são as das interfaces e a da face fria (uma por camada, da face
+    quente para a fria). As incógnitas são resolvidas juntas por Newton: o resíduo
+    de cada interface (fluxo que entra - fluxo que sai) só depende das temperaturas
+    vizinhas, então o Jacobiano é tridiagonal e cada iteração custa O(camadas).
+    """
+    n = len(espessuras_m)
+    if n == 0 or len(k_func_strs) != n:
+        raise ValueError("Informe um material por camada")
+    try:
+        integrais = [k_func_registry.obter_integral(k) for k in k_func_strs]
+    except KFuncError as ex:
+        logger.warning("Erro na fórmula k(T) multicamada erro=%s", ex)
+        solver_nonconvergence.inc(solver=METODO_MULTICAMADA)
+        return None, None, False, 0
+
+    geometria = _divisores_camadas(espessuras_m, geometry, pipe_diameter_m)
+    if geometria is None:
+        solver_nonconvergence.inc(solver=METODO_MULTICAMADA)
+        return None, None, False, 0
+    divisores, outer_surface_diameter = geometria
+
+    def transferencia(Tf):
+        h_conv = calcular_h_conv(Tf, To, geometry, outer_surface_diameter, wind_speed_ms)
+        return h_conv * (Tf - To) + emissividade * SIGMA * ((Tf + 273.15)**4 - (To + 273.15)**4)
+
+    avaliacoes_k = [0]
+
+    def conducao(temperaturas):
+        """
+        Fluxo de cada camada e suas derivadas em relação às temperaturas das duas faces
+
+        Com o fluxo = ∫ k dT / d entre as faces, as derivadas são exatas: k(T_quente)/d e -k(T_fria)/d.
+        """
+        avaliacoes_k[0] += 3 * n
+        fluxos, d_quente, d_fria = [], [], []
+        T_anterior = Tq
+        for integral, d, T in zip(integrais, divisores, temperaturas):
+            k = integral.media(T_anterior, T)
+            if k is None or not k > 0:
+                return None
+            fluxos.append(k * (T_anterior - T) / d)
+            d_quente.append(integral.k(T_anterior) / d)
+            d_fria.append(-integral.k(T) / d)
+            T_anterior = T
+        return fluxos, d_quente, d_fria
+
+    def residuos(temperaturas):
+        resultado = conducao(temperaturas)
+        if resultado is None:
+            return None, None
+        fluxos = resultado[0]
+        q_superficie = transferencia(temperaturas[-1])
+        return [fluxos[i] - fluxos[i + 1] for i in range(n - 1)] + [fluxos[-1] - q_superficie], resultado
+
+    # Estimativa inicial: resistências em série com k na temperatura média e h superficial típico
+    try:
+        T_media = (Tq + To) / 2
+        resistencias = [d / integral.k(T_media) for integral, d in zip(integrais, divisores)]
+        q = (Tq - To) / (sum(resistencias) + 0.1)
+        temperaturas, T_anterior = [], Tq
+        for R in resistencias:
+            T_anterior -= q * R
+            temperaturas.append(T_anterior)
+
+        T_min, T_max = min(To, Tq), max(To, Tq)
+        tol_T = tolerancia_relativa * max(abs(Tq - To), 1.0)
+        F, jacobiano = residuos(temperaturas)
+        iteracoes = 0
+        convergiu = False
+        while F is not None and iteracoes < max_iter:
+            iteracoes += 1
+            fluxos, d_quente, d_fria = jacobiano
+            delta_T = 1e-3 * max(abs(temperaturas[-1] - To), 1.0)
+            d_superficie = (transferencia(temperaturas[-1] + delta_T) - transferencia(temperaturas[-1] - delta_T)) / (2 * delta_T)
+
+            # Linha i: F_i = fluxo_i - fluxo_{i+1} (última: fluxo_n - transferência)
+            inferior = [0.0] + [d_quente[i] for i in range(1, n)]
+            diagonal = [d_fria[i] - d_quente[i + 1] for i in range(n - 1)] + [d_fria[-1] - d_superficie]
+            superior = [-d_fria[i + 1] for i in range(n - 1)] + [0.0]
+            passo = _resolver_tridiagonal(inferior, diagonal, superior, F)
+
+            # Busca linear: reduz o passo até o resíduo diminuir (mantendo T entre To e Tq)
+            norma = max(abs(f) for f in F)
+            fator = 1.0
+            for _ in range(12):
+                candidatas = [min(max(T - fator * p, T_min), T_max) for T, p in zip(temperaturas, passo)]
+                F_novo, jacobiano_novo = residuos(candidatas)
+                if F_novo is not None and max(abs(f) for f in F_novo) < norma:
+                    break
+                fator *= 0.5
+            if F_novo is None:
+                break
+            variacao = max(abs(a - b) for a, b in zip(candidatas, temperaturas))
+            temperaturas, F, jacobiano = candidatas, F_novo, jacobiano_novo
+            if variacao <= tol_T:
+                convergiu = True
+                break
+    except (ArithmeticError, ValueError) as ex:
+        logger.info("Solve multicamada falhou erro=%s", ex)
+        solver_nonconvergence.inc(solver=METODO_MULTICAMADA)
+        return None, None, False, 0
+
+    solver_iterations.observe(iteracoes, solver=METODO_MULTICAMADA)
+    k_evaluations.inc(avaliacoes_k[0], solver=METODO_MULTICAMADA)
+    if not convergiu:
+        solver_nonconvergence.inc(solver=METODO_MULTICAMADA)
+        logger.info("Solve multicamada não convergiu Tq=%s To=%s camadas=%d geometria=%s iteracoes=%d",
+                    Tq, To, n, geometry, iteracoes)
+        return temperaturas, None, False, iteracoes
+    return temperaturas, transferencia(temperaturas[-1]), True, iteracoes
+
+def calcular_perda_sem_isolante(Tq, To, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0):
+    """Calcula a perda de calor da superfície sem isolante (W/m²)"""
+    h_sem = calcular_h_conv(Tq, To, geometry, pipe_diameter_m, wind_speed_ms)
+    q_rad_sem = emissividade * SIGMA * ((Tq + 273.15)**4 - (To + 273.15)**4)
+    q_conv_sem = h_sem * (Tq - To)
+    return q_conv_sem + q_rad_sem
 
 def calcular_economia_financeira(perda_com_kw, perda_sem_kw, area_m2, horas_dia, dias_semana, valor_combustivel, poder_calorifico, eficiencia, fator_emissao):
     """Calcula a economia financeira e ambiental"""
@@ -125,6 +514,66 @@ def calcular_economia_financeira(perda_com_kw, perda_sem_kw, area_m2, horas_dia,
         'economia_kwh_ano': economia_kwh_ano
     }
 
+def calcular_volume_isolante(area_m2, L_total, geometry, pipe_diameter_m=None):
+    """
+    Volume de isolante (m³) para cobrir a área informada
+
+    Em tubulações a área é a superfície externa do tubo nu (π·D por metro), e o
+    volume é o da coroa circular entre o tubo e a face externa do isolante.
+    """
+    if geometry == "Tubulação" and pipe_diameter_m:
+        r_inner = pipe_diameter_m / 2
+        r_outer = r_inner + L_total
+        return area_m2 * (r_outer**2 - r_inner**2) / pipe_diameter_m
+    return area_m2 * L_total
+
+def calcular_indicadores_investimento(investimento, economia_anual, taxa_desconto, anos):
+    """Calcula payback simples (anos) e VPL do investimento em isolamento"""
+    payback = investimento / economia_anual if economia_anual > 0 else None
+    if taxa_desconto > 0:
+        fator_anuidade = (1 - (1 + taxa_desconto) ** -anos) / taxa_desconto
+    else:
+        fator_anuidade = anos
+    vpl = economia_anual * fator_anuidade - investimento
+    return payback, vpl
+
+# Meia largura do intervalo inicial da varredura, como fração da variação prevista de Tf
+FRACAO_MARGEM_PREDITOR = 0.25
+
+def varrer_espessuras(Tq, To, espessuras_mm, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                      metodo=METODO_PADRAO):
+    """
+    Resolve a face fria para uma sequência de espessuras (mm), em ordem
+
+    Cada solve parte de uma previsão feita a partir das espessuras vizinhas já
+    resolvidas (continuação). Com duas soluções, a extrapolação linear dá Tf_inicial
+    e o Brent começa num intervalo estreito em torno dela (meia largura de
+    FRACAO_MARGEM_PREDITOR × variação prevista), voltando ao intervalo completo se a
+    raiz estiver fora. O ganho é moderado: cerca de 5 avaliações de k por espessura
+    contra 8 a frio (~115 contra ~160 numa varredura de 20 espessuras).
+    Retorna lista de (espessura_mm, Tf, q, convergiu, iteracoes).
+    """
+    resultados = []
+    convergidos = []  # (espessura_mm, Tf) das duas últimas soluções, para o preditor
+    for espessura_mm in espessuras_mm:
+        # Preditor: extrapolação linear das duas últimas soluções. Com uma só, o erro da
+        # estimativa é desconhecido e a busca a partir dela custa mais que o solve a frio
+        Tf_inicial = Tf_margem = None
+        if len(convergidos) == 2:
+            (L1, T1), (L2, T2) = convergidos
+            variacao = (T2 - T1) * (espessura_mm - L2) / (L2 - L1) if L2 != L1 else 0.0
+            Tf_inicial = T2 + variacao
+            Tf_margem = max(FRACAO_MARGEM_PREDITOR * abs(variacao), TOLERANCIA_RELATIVA * abs(Tq - To))
+
+        Tf, q, convergiu, iteracoes = resolver_temperatura_face_fria(
+            Tq, To, espessura_mm / 1000, k_func_str, geometry, emissividade, pipe_diameter_m, wind_speed_ms,
+            metodo, Tf_inicial=Tf_inicial, Tf_margem=Tf_margem
+        )
+        if convergiu:
+            convergidos = (convergidos + [(espessura_mm, Tf)])[-2:]
+        resultados.append((espessura_mm, Tf, q, convergiu, iteracoes))
+    return resultados
+
 def calcular_temperatura_orvalho(temperatura_ambiente, umidade_relativa):
     """Calcula a temperatura de orvalho"""
     a_mag, b_mag = 17.27, 237.7
@@ -132,18 +581,155 @@ def calcular_temperatura_orvalho(temperatura_ambiente, umidade_relativa):
     T_orvalho = (b_mag * alfa) / (a_mag - alfa)
     return T_orvalho
 
-def encontrar_espessura_minima_condensacao(Ti, Ta, k_func_str, geometry, pipe_diameter_m, wind_speed, umidade_relativa, max_espessura_mm=500):
-    """Encontra a espessura mínima para evitar condensação"""
+# Limite da busca de espessura mínima contra condensação (mm), o mesmo em todos os caminhos
+ESPESSURA_MAX_CONDENSACAO_MM = 500
+
+def encontrar_espessura_minima_condensacao(Ti, Ta, k_func_str, geometry, pipe_diameter_m, wind_speed, umidade_relativa,
+                                           max_espessura_mm=ESPESSURA_MAX_CONDENSACAO_MM, margem_seguranca=0.0):
+    """
+    Encontra a espessura mínima (mm inteiros) para evitar condensação
+
+    A superfície deve ficar pelo menos margem_seguranca (°C) acima do ponto de orvalho.
+
+    A temperatura superficial cresce monotonicamente com a espessura, então a busca
+    dobra a espessura até atender (busca exponencial) e depois faz bisseção entre o
+    último valor que falhou e o primeiro que atendeu. O resultado é o mesmo da
+    varredura 1..max_espessura_mm, com ~2·log2(max) solves aquecidos pelo Tf anterior.
+    """
     T_orvalho = calcular_temperatura_orvalho(Ta, umidade_relativa)
-    
-    for L_teste_mm in range(1, max_espessura_mm + 1):
+    Tf_anterior = None
+
+    def atende(L_teste_mm):
+        nonlocal Tf_anterior
         L_teste = L_teste_mm * 0.001  # Converte para metros
         Tf, _, convergiu = encontrar_temperatura_face_fria(
-            Ti, Ta, L_teste, k_func_str, 
-            geometry, 0.9, pipe_diameter_m, wind_speed_ms=wind_speed
+            Ti, Ta, L_teste, k_func_str,
+            geometry, 0.9, pipe_diameter_m, wind_speed_ms=wind_speed,
+            Tf_inicial=Tf_anterior
         )
-        if convergiu and Tf >= T_orvalho:
-            return L_teste_mm, T_orvalho
-    
-    return None, T_orvalho
+        if convergiu:
+            Tf_anterior = Tf
+        return convergiu and Tf >= T_orvalho + margem_seguranca
+
+    if max_espessura_mm < 1:
+        return None, T_orvalho
+
+    # Busca exponencial: 1, 2, 4, ... até atender ou chegar ao limite
+    falha_mm, L_teste_mm = 0, 1
+    while not atende(L_teste_mm):
+        if L_teste_mm >= max_espessura_mm:
+            return None, T_orvalho
+        falha_mm, L_teste_mm = L_teste_mm, min(2 * L_teste_mm, max_espessura_mm)
+
+    # Bisseção: falha_mm não atende, L_teste_mm atende
+    while L_teste_mm - falha_mm > 1:
+        meio_mm = (falha_mm + L_teste_mm) // 2
+        if atende(meio_mm):
+            L_teste_mm = meio_mm
+        else:
+            falha_mm = meio_mm
+
+    return L_teste_mm, T_orvalho
+
+# Limites e precisão do dimensionamento inverso (mm)
+ESPESSURA_MIN_PROJETO_MM = 1
+ESPESSURA_MAX_PROJETO_MM = 500
+ESPESSURA_INICIAL_PROJETO_MM = 25
+TOLERANCIA_ESPESSURA_MM = 0.1
+
+# Restrições do dimensionamento (nomes expostos pela API)
+RESTRICAO_TEMPERATURA_MAXIMA = "temperaturaSuperficie"
+RESTRICAO_PERDA_MAXIMA = "perdaCalor"
+RESTRICAO_TEMPERATURA_MINIMA = "pontoOrvalho"
+
+def dimensionar_espessura_minima(Tq, To, k_func_str, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                                 T_superficie_max=None, q_max=None, T_superficie_min=None,
+                                 max_espessura_mm=ESPESSURA_MAX_PROJETO_MM, tolerancia_mm=TOLERANCIA_ESPESSURA_MM):
+    """
+    Espessura mínima (mm) que atende às restrições de projeto informadas
+
+    Restrições: face fria <= T_superficie_max (proteção pessoal, serviço quente),
+    |q| <= q_max (W/m²) e face fria >= T_superficie_min (orvalho + margem, serviço frio).
+    A folga de cada uma cresce com a espessura, então a menor espessura viável é a
+    raiz da menor folga (normalizada): a busca dobra ou divide a espessura até cercar
+    a raiz e depois estreita o intervalo por falsa posição (Illinois) em log(espessura),
+    até a largura tolerancia_mm. Cada sondagem parte da Tf da sondagem anterior.
+
+    Retorna (espessura_mm, Tf, q, restricao, sondagens): restricao é a restrição
+    determinante (None se a espessura mínima já atende); espessura_mm é None se nem
+    max_espessura_mm atende.
+    """
+    escala_T = max(abs(Tq - To), 1.0)
+    Tf_anterior = None
+    sondagens = 0
+
+    def sondar(L_mm):
+        """(folga, Tf, q, restrição de menor folga) na espessura L_mm"""
+        nonlocal Tf_anterior, sondagens
+        sondagens += 1
+        Tf, q, convergiu = encontrar_temperatura_face_fria(
+            Tq, To, L_mm / 1000, k_func_str, geometry, emissividade, pipe_diameter_m, wind_speed_ms,
+            Tf_inicial=Tf_anterior
+        )
+        if not convergiu:
+            return -math.inf, None, None, None
+        Tf_anterior = Tf
+        folgas = []
+        if T_superficie_max is not None:
+            folgas.append(((T_superficie_max - Tf) / escala_T, RESTRICAO_TEMPERATURA_MAXIMA))
+        if q_max is not None:
+            folgas.append(((q_max - abs(q)) / q_max, RESTRICAO_PERDA_MAXIMA))
+        if T_superficie_min is not None:
+            folgas.append(((Tf - T_superficie_min) / escala_T, RESTRICAO_TEMPERATURA_MINIMA))
+        folga, restricao = min(folgas) if folgas else (0.0, None)
+        return folga, Tf, q, restricao
+
+    # Intervalo: [lo, hi] com lo não atendendo e hi atendendo
+    hi = min(ESPESSURA_INICIAL_PROJETO_MM, max_espessura_mm)
+    f_hi, Tf_hi, q_hi, restricao_hi = sondar(hi)
+    if f_hi >= 0:
+        lo, f_lo, restricao = None, None, None
+        while hi > ESPESSURA_MIN_PROJETO_MM:
+            L = max(hi / 2, ESPESSURA_MIN_PROJETO_MM)
+            f, Tf, q, restricao_L = sondar(L)
+            if f < 0:
+                lo, f_lo, restricao = L, f, restricao_L
+                break
+            hi, f_hi, Tf_hi, q_hi = L, f, Tf, q
+        if lo is None:
+            return hi, Tf_hi, q_hi, None, sondagens
+    else:
+        lo, f_lo, restricao = hi, f_hi, restricao_hi
+        while True:
+            if hi >= max_espessura_mm:
+                return None, None, None, None, sondagens
+            hi = min(2 * hi, max_espessura_mm)
+            f, Tf, q, restricao_L = sondar(hi)
+            if f >= 0:
+                f_hi, Tf_hi, q_hi = f, Tf, q
+                break
+            lo, f_lo, restricao = hi, f, restricao_L
+
+    # Falsa posição (Illinois) em log(espessura); cada sondagem reduz o intervalo em pelo menos tolerancia_mm/2
+    lado = 0
+    while hi - lo > tolerancia_mm:
+        x0, x1 = math.log(lo), math.log(hi)
+        L = math.exp(x1 - f_hi * (x1 - x0) / (f_hi - f_lo)) if math.isfinite(f_lo) and f_hi != f_lo else (lo + hi) / 2
+        L = min(max(L, lo + tolerancia_mm / 2), hi - tolerancia_mm / 2)
+        f, Tf, q, restricao_L = sondar(L)
+        if f >= 0:
+            hi, f_hi, Tf_hi, q_hi = L, f, Tf, q
+            if lado == 1:
+                f_lo /= 2
+            lado = 1
+        else:
+            lo, f_lo, restricao = L, f, restricao_L
+            if lado == -1:
+                f_hi /= 2
+            lado = -1
+
+    return hi, Tf_hi, q_hi, restricao, sondagens
 
+def espessura_comercial(espessura_mm, espessuras_mm=ESPESSURAS_COMERCIAIS_MM):
+    """Menor espessura comercial maior ou igual a espessura_mm (None se não houver)"""
+    return next((e for e in sorted(espessuras_mm) if e >= espessura_mm - 1e-9), None)
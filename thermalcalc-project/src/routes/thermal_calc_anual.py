@@ -0,0 +1,173 @@
+"""
+Simulação anual hora a hora (8760 h) a partir de um perfil de ambiente/operação
+
+O perfil é consumido em blocos (ver src/utils/csv_stream.py) e cada bloco é
+resolvido pelo solver vetorizado do motor (resolver_vetorial, recebido como
+parâmetro); apenas os acumuladores ficam em memória.
+"""
+import numpy as np
+
+from src.utils.csv_stream import numero
+
+# Um ano bissexto completo
+MAX_HORAS_PERFIL = 8784
+
+# A cada quantas horas do bloco a face fria é resolvida a frio para servir de estimativa às demais
+INTERVALO_ANCORAS = 6
+
+
+class PerfilInvalido(ValueError):
+    """Linha do perfil horário inválida (mensagem pronta para o cliente)"""
+
+
+def _ler_bloco(bloco):
+    """Converte as linhas de um bloco em arrays (To, vento, operando) e rótulos de mês"""
+    n = len(bloco)
+    To, vento, operando = np.empty(n), np.empty(n), np.empty(n, dtype=bool)
+    meses = []
+    for j, (linha, campos) in enumerate(bloco):
+        try:
+            To[j] = numero(campos.get('ambienttemp'))
+            vento[j] = numero(campos.get('windspeed'), 0.0)
+            operando[j] = numero(campos.get('operating'), 1.0) != 0
+        except ValueError:
+            raise PerfilInvalido(f"Valor inválido na linha {linha} do perfil") from None
+        if vento[j] < 0 or not np.isfinite(To[j]):
+            raise PerfilInvalido(f"Valor inválido na linha {linha} do perfil")
+        # Agrupamento mensal opcional pela coluna timestamp (AAAA-MM...)
+        meses.append(campos.get('timestamp', '')[:7] or None)
+    return To, vento, operando, meses
+
+
+def _resolver_aquecido(resolver, Tq, To, vento, L_total, k_func_str, geometry, emissividade, pipe_diameter_m,
+                       Tf_anterior):
+    """
+    Resolve as horas de um bloco com estimativa inicial vinda das horas vizinhas
+
+    Primeiro resolve uma hora a cada INTERVALO_ANCORAS (partindo da última hora do
+    bloco anterior); as demais partem da interpolação entre essas âncoras.
+    Retorna (Tf, q_com, q_sem, convergiu, iteracoes).
+    """
+    n = To.shape[0]
+    ancoras = np.arange(0, n, INTERVALO_ANCORAS)
+    if ancoras[-1] != n - 1:
+        ancoras = np.append(ancoras, n - 1)
+
+    estimativa = None if Tf_anterior is None else np.full(ancoras.size, Tf_anterior)
+    Tf_a, q_a, q_sem_a, conv_a, it_a = resolver(
+        Tq, To[ancoras], L_total, k_func_str, geometry, emissividade, pipe_diameter_m, vento[ancoras],
+        Tf_inicial=estimativa
+    )
+
+    Tf, q, q_sem = np.full(n, np.nan), np.full(n, np.nan), np.full(n, np.nan)
+    convergiu, iteracoes = np.zeros(n, dtype=bool), np.zeros(n, dtype=int)
+    Tf[ancoras], q[ancoras], q_sem[ancoras], convergiu[ancoras], iteracoes[ancoras] = Tf_a, q_a, q_sem_a, conv_a, it_a
+
+    resto = np.setdiff1d(np.arange(n), ancoras)
+    if resto.size:
+        # Interpola o excesso sobre o ambiente (Tf - To), que varia pouco de hora em hora
+        excesso = np.where(conv_a, Tf_a - To[ancoras], np.nan)
+        validas = np.isfinite(excesso)
+        if validas.any():
+            estimativa = To[resto] + np.interp(resto, ancoras[validas], excesso[validas])
+        else:
+            estimativa = None
+        Tf[resto], q[resto], q_sem[resto], convergiu[resto], iteracoes[resto] = resolver(
+            Tq, To[resto], L_total, k_func_str, geometry, emissividade, pipe_diameter_m, vento[resto],
+            Tf_inicial=estimativa
+        )
+    return Tf, q, q_sem, convergiu, iteracoes
+
+
+def simular_ano(blocos, Tq, L_total, k_func_str, geometry, emissividade, pipe_diameter_m, financeiro, resolver,
+                limite_superficie=None):
+    """
+    Integra energia, custo e CO₂ de um perfil horário (uma linha por hora)
+
+    blocos: iterável de blocos de linhas do CSV (colunas ambientTemp, windSpeed e
+    operating opcionais, timestamp opcional para o resumo mensal).
+    financeiro: DadosFinanceiros do motor (área, combustível e seu valor).
+    resolver: solve vetorizado do motor (thermal_engine.resolver_vetorial).
+    Horas com operating = 0 não têm perda. Horas operando com ambiente na temperatura
+    de operação ou acima (To >= Tq) também não: ficam fora dos totais e são contadas
+    em horasSemPerda, como as não convergidas. Retorna um dicionário com os totais.
+    """
+    area_m2, valor_combustivel = financeiro.area_m2, financeiro.valor_combustivel
+    fator_combustivel = 1.0 / (financeiro.pc * financeiro.ef)
+    horas = horas_operando = horas_nao_convergidas = horas_sem_perda = horas_acima_limite = 0
+    energia_com = energia_sem = 0.0
+    soma_Tf, Tf_max, iteracoes_total = 0.0, -np.inf, 0
+    meses = {}
+    Tf_anterior = None
+
+    for bloco in blocos:
+        horas += len(bloco)
+        if horas > MAX_HORAS_PERFIL:
+            raise PerfilInvalido(f"O perfil deve ter no máximo {MAX_HORAS_PERFIL} horas")
+        To, vento, operando, rotulos = _ler_bloco(bloco)
+        # Sem diferença a favor da perda não há o que resolver (economia e CO₂ seriam negativos)
+        sem_perda = operando & (To >= Tq)
+        horas_sem_perda += int(sem_perda.sum())
+        idx = np.flatnonzero(operando & ~sem_perda)
+        if idx.size == 0:
+            continue
+
+        Tf, q_com, q_sem, convergiu, iteracoes = _resolver_aquecido(
+            resolver, Tq, To[idx], vento[idx], L_total, k_func_str, geometry, emissividade, pipe_diameter_m,
+            Tf_anterior
+        )
+        iteracoes_total += int(iteracoes.sum())
+        horas_nao_convergidas += int((~convergiu).sum())
+        ok = convergiu
+        if ok.any():
+            Tf_anterior = float(Tf[ok][-1])
+
+        # Energia em kWh: perda (kW/m²) x área x 1 h por linha
+        kwh_com = np.where(ok, q_com, 0.0) / 1000 * area_m2
+        kwh_sem = np.where(ok, q_sem, 0.0) / 1000 * area_m2
+        horas_operando += int(ok.sum())
+        energia_com += float(kwh_com.sum())
+        energia_sem += float(kwh_sem.sum())
+        soma_Tf += float(Tf[ok].sum())
+        if ok.any():
+            Tf_max = max(Tf_max, float(Tf[ok].max()))
+        if limite_superficie is not None:
+            horas_acima_limite += int((Tf[ok] > limite_superficie).sum())
+
+        for j, i in enumerate(idx):
+            mes = rotulos[i]
+            if mes is not None and ok[j]:
+                acumulado = meses.setdefault(mes, [0.0, 0.0])
+                acumulado[0] += float(kwh_com[j])
+                acumulado[1] += float(kwh_sem[j])
+
+    if horas == 0:
+        raise PerfilInvalido("O perfil não tem nenhuma hora")
+
+    def totais(kwh_com, kwh_sem):
+        economia_kwh = kwh_sem - kwh_com
+        combustivel_poupado = economia_kwh * fator_combustivel
+        return {
+            'energiaComIsolanteKwh': round(kwh_com, 1),
+            'energiaSemIsolanteKwh': round(kwh_sem, 1),
+            'economiaKwh': round(economia_kwh, 1),
+            'custoComIsolante': round(kwh_com * fator_combustivel * valor_combustivel, 2),
+            'economia': round(combustivel_poupado * valor_combustivel, 2),
+            'co2EvitadoTon': round(combustivel_poupado * financeiro.fator_emissao / 1000, 3)
+        }
+
+    resultado = {
+        'horas': horas,
+        'horasOperando': horas_operando,
+        'horasNaoConvergidas': horas_nao_convergidas,
+        'horasSemPerda': horas_sem_perda,
+        'temperaturaFaceFriaMedia': round(soma_Tf / horas_operando, 1) if horas_operando else None,
+        'temperaturaFaceFriaMax': round(Tf_max, 1) if horas_operando else None,
+        'iteracoes': iteracoes_total,
+        **totais(energia_com, energia_sem)
+    }
+    if limite_superficie is not None:
+        resultado['horasAcimaLimite'] = horas_acima_limite
+    if meses:
+        resultado['meses'] = [{'mes': mes, **totais(*valores)} for mes, valores in sorted(meses.items())]
+    return resultado
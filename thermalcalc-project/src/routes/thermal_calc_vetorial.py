@@ -0,0 +1,245 @@
+"""
+Versão vetorizada (NumPy) dos cálculos térmicos de thermal_calc.py
+
+Resolve N casos de uma vez: os casos são agrupados por k_func e todas as
+raias ainda não convergidas são iteradas juntas, com atualizações mascaradas.
+"""
+import numpy as np
+
+from src.routes.thermal_calc import SIGMA, TOLERANCIA_RELATIVA
+from src.utils.air_properties import grupos_conveccao_vetorial, obter_tabela_h_conv, L_C_PLACA
+from src.utils.k_func import k_func_registry
+from src.utils.metrics import solver_iterations, solver_nonconvergence, k_evaluations
+
+# Rótulo do solver vetorizado nas métricas
+METODO_VETORIAL = "vetorial"
+
+GEOMETRIA_PLANA = "Superfície Plana"
+GEOMETRIA_TUBO = "Tubulação"
+GEOMETRIAS = (GEOMETRIA_PLANA, GEOMETRIA_TUBO)
+
+def calcular_h_conv_vetorial(Tf, To, plana, outer_diameter_m, wind_speed_ms):
+    """Versão vetorizada de calcular_h_conv (mesmas correlações e tabelas, geometria por raia)"""
+    T_film_K = (Tf + To) / 2 + 273.15
+    nu, k_ar, fator_ra, pr_terco, fator_tubo = grupos_conveccao_vetorial(T_film_K)
+    delta_T = np.abs(Tf - To)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Convecção forçada (vento >= 1 m/s)
+        D = np.where(np.isfinite(outer_diameter_m) & (outer_diameter_m > 0), outer_diameter_m, 1.0)
+        L_c_forcada = np.where(plana, 1.0, D)
+        Re = (wind_speed_ms * L_c_forcada) / nu
+        Nu_forcada = np.where(
+            Re < 5e5,
+            0.664 * np.sqrt(Re) * pr_terco,
+            (0.037 * Re**0.8 - 871) * pr_terco
+        )
+
+        # Convecção natural
+        L_c_natural = np.where(plana, L_C_PLACA, outer_diameter_m)
+        Ra = fator_ra * delta_T * L_c_natural**3
+        Nu_plana = 0.27 * Ra**0.25
+        Nu_tubo = (0.60 + fator_tubo * Ra**(1/6))**2
+        Nu_natural = np.where(plana, Nu_plana, Nu_tubo)
+
+        forcada = wind_speed_ms >= 1.0
+        Nu = np.where(forcada, Nu_forcada, Nu_natural)
+        L_c = np.where(forcada, L_c_forcada, L_c_natural)
+        h = (Nu * k_ar) / L_c
+        h = _h_natural_tabelado(h, ~forcada, plana, delta_T, T_film_K, outer_diameter_m)
+
+    return np.where(delta_T == 0, 0.0, h)
+
+def _h_natural_tabelado(h, natural, plana, delta_T, T_film_K, outer_diameter_m):
+    """Substitui h nas raias de convecção natural pelo valor das tabelas, quando ativas e dentro da grade"""
+    for geometria, mascara in ((GEOMETRIA_PLANA, plana), (GEOMETRIA_TUBO, ~plana)):
+        tabela = obter_tabela_h_conv(geometria)
+        if tabela is None:
+            continue
+        idx = np.flatnonzero(natural & mascara)
+        if idx.size:
+            h_tabela = tabela.h(delta_T[idx], T_film_K[idx], outer_diameter_m[idx])
+            h[idx] = np.where(np.isnan(h_tabela), h[idx], h_tabela)
+    return h
+
+def calcular_perda_sem_isolante_vetorial(Tq, To, plana, pipe_diameter_m, emissividade, wind_speed_ms):
+    """Perda de calor da superfície nua (W/m²) por raia"""
+    h_sem = calcular_h_conv_vetorial(Tq, To, plana, pipe_diameter_m, wind_speed_ms)
+    q_rad_sem = emissividade * SIGMA * ((Tq + 273.15)**4 - (To + 273.15)**4)
+    return h_sem * (Tq - To) + q_rad_sem
+
+class _BalancoVetorial:
+    """Balanço condução - transferência superficial avaliado sobre subconjuntos de raias"""
+
+    def __init__(self, Tq, To, L_total, k_funcs, plana, pipe_diameter_m, emissividade, wind_speed_ms, k_multiplicador):
+        self.Tq, self.To = Tq, To
+        self.plana = plana
+        self.emissividade = emissividade
+        self.wind_speed_ms = wind_speed_ms
+        self.k_multiplicador = k_multiplicador
+
+        # Agrupamento por fórmula: cada grupo avalia sua condutividade média integral de uma vez
+        formulas, self.grupo = np.unique(np.asarray(k_funcs, dtype=object).astype(str), return_inverse=True)
+        self.funcoes = [k_func_registry.obter_integral(f).media_vetorial for f in formulas]
+        self.avaliacoes_k = 0
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            r_inner = pipe_diameter_m / 2
+            r_outer = r_inner + L_total
+            divisor_tubo = r_outer * np.log(r_outer / r_inner)
+        self.divisor = np.where(plana, L_total, divisor_tubo)
+        self.outer_surface_diameter = np.where(plana, L_total, 2 * r_outer)
+        self.valido = np.isfinite(self.divisor) & (self.divisor > 0)
+
+    def __call__(self, Tf, idx):
+        """Retorna (erro, q_transferencia) para as raias idx na temperatura Tf (erro NaN se k inválido)"""
+        Tq, To = self.Tq[idx], self.To[idx]
+        grupo = self.grupo[idx]
+        k = np.empty_like(Tf)
+        with np.errstate(all='ignore'):
+            for g in np.unique(grupo):
+                sel = grupo == g
+                k[sel] = self.funcoes[g](Tq[sel], Tf[sel])
+                self.avaliacoes_k += 1
+        k = k * self.k_multiplicador[idx]
+        k = np.where(np.isfinite(k) & (k > 0), k, np.nan)
+
+        q_conducao = k * (Tq - Tf) / self.divisor[idx]
+        h_conv = calcular_h_conv_vetorial(Tf, To, self.plana[idx], self.outer_surface_diameter[idx], self.wind_speed_ms[idx])
+        q_rad = self.emissividade[idx] * SIGMA * ((Tf + 273.15)**4 - (To + 273.15)**4)
+        q_transferencia = h_conv * (Tf - To) + q_rad
+        return q_conducao - q_transferencia, q_transferencia
+
+def _como_array(valor, n, padrao=np.nan):
+    """Converte escalar/lista em array float de tamanho n (None vira o valor padrão)"""
+    if valor is None:
+        return np.full(n, padrao, dtype=float)
+    return np.array(np.broadcast_to(np.asarray(valor, dtype=float), (n,)), dtype=float)
+
+def resolver_face_fria_vetorial(Tq, To, L_total, k_funcs, geometry, emissividade, pipe_diameter_m=None, wind_speed_ms=0,
+                                tolerancia_relativa=TOLERANCIA_RELATIVA, max_iter=100, Tf_inicial=None, k_multiplicador=1.0):
+    """
+    Resolve a temperatura da face fria para N casos de uma vez
+
+    Os argumentos aceitam arrays (ou escalares, replicados para todas as raias);
+    geometry é um array/lista de nomes de geometria e k_funcs de fórmulas k(T).
+    Usa falsa posição com a modificação de Illinois no intervalo garantido [To, Tq]
+    (o mesmo do solver de Brent escalar), convergindo por largura relativa do intervalo.
+    Tf_inicial (opcional) estreita o intervalo a partir de soluções vizinhas.
+
+    Retorna (Tf, q_transferencia, convergiu, iteracoes) como arrays; raias que não
+    convergiram têm q_transferencia NaN.
+    """
+    Tq = np.atleast_1d(np.asarray(Tq, dtype=float))
+    n = Tq.shape[0]
+    To = _como_array(To, n)
+    L_total = _como_array(L_total, n)
+    emissividade = _como_array(emissividade, n)
+    pipe_diameter_m = _como_array(pipe_diameter_m, n)
+    wind_speed_ms = _como_array(wind_speed_ms, n, 0.0)
+    k_multiplicador = _como_array(k_multiplicador, n, 1.0)
+    geometry = np.broadcast_to(np.asarray(geometry, dtype=object), (n,))
+    k_funcs = np.broadcast_to(np.asarray(k_funcs, dtype=object), (n,))
+    plana = geometry == GEOMETRIA_PLANA
+
+    balanco = _BalancoVetorial(Tq, To, L_total, k_funcs, plana, pipe_diameter_m, emissividade, wind_speed_ms, k_multiplicador)
+
+    Tf = np.full(n, np.nan)
+    q = np.full(n, np.nan)
+    convergiu = np.zeros(n, dtype=bool)
+    falhou = ~balanco.valido | ~np.isin(geometry, GEOMETRIAS)
+    iteracoes = np.zeros(n, dtype=int)
+
+    # Casos triviais Tq == To
+    trivial = ~falhou & (Tq == To)
+    Tf[trivial], q[trivial], convergiu[trivial] = To[trivial], 0.0, True
+
+    ativos = np.flatnonzero(~falhou & ~trivial)
+    x0, x1 = To[ativos].copy(), Tq[ativos].copy()
+
+    if Tf_inicial is not None and ativos.size:
+        # Estreita o intervalo: avalia a estimativa e um pequeno passo no sentido da raiz
+        T_min, T_max = np.minimum(x0, x1), np.maximum(x0, x1)
+        g = np.clip(_como_array(Tf_inicial, n)[ativos], T_min, T_max)
+        g = np.where(np.isfinite(g), g, (x0 + x1) / 2)
+        fg, qg = balanco(g, ativos)
+        sentido = np.where(fg > 0, 1.0, -1.0)
+        passo = np.maximum(1e-3 * (T_max - T_min), 1e-3)
+        g2 = np.clip(g + sentido * passo, T_min, T_max)
+        fg2, qg2 = balanco(g2, ativos)
+        iteracoes[ativos] += 2
+        troca = fg * fg2 <= 0
+        extremo = np.where(sentido > 0, T_max, T_min)
+        x0 = np.where(troca, g, g2)
+        f0 = np.where(troca, fg, fg2)
+        x1 = np.where(troca, g2, extremo)
+        f1 = fg2.copy()
+        precisa = ~troca
+        if precisa.any():
+            f1[precisa], _ = balanco(x1[precisa], ativos[precisa])
+            iteracoes[ativos[precisa]] += 1
+        q1 = np.where(troca, qg2, np.nan)
+    else:
+        f0, _ = balanco(x0, ativos)
+        f1, q1 = balanco(x1, ativos)
+        iteracoes[ativos] += 2
+
+    # Raias com k inválido ou sem troca de sinal no intervalo falham
+    ok = np.isfinite(f0) & np.isfinite(f1) & (f0 * f1 <= 0)
+    falhou[ativos[~ok]] = True
+    ativos, x0, f0, x1, f1, q1 = ativos[ok], x0[ok], f0[ok], x1[ok], f1[ok], q1[ok]
+
+    tol_T = tolerancia_relativa * np.maximum(np.abs(Tq[ativos] - To[ativos]), 1.0)
+
+    for _ in range(max_iter):
+        if ativos.size == 0:
+            break
+
+        # Raias convergidas: raiz exata em um extremo ou intervalo estreito
+        raiz0 = f0 == 0
+        pronto = raiz0 | (f1 == 0) | (np.abs(x1 - x0) <= tol_T)
+        if pronto.any():
+            idx = ativos[pronto]
+            Tf[idx] = np.where(raiz0[pronto], x0[pronto], x1[pronto])
+            q[idx] = q1[pronto]
+            precisa_q = ~np.isfinite(q[idx]) | raiz0[pronto]
+            if precisa_q.any():
+                _, q[idx[precisa_q]] = balanco(Tf[idx[precisa_q]], idx[precisa_q])
+            convergiu[idx] = True
+            resta = ~pronto
+            ativos, x0, f0, x1, f1, q1, tol_T = (
+                ativos[resta], x0[resta], f0[resta], x1[resta], f1[resta], q1[resta], tol_T[resta]
+            )
+            if ativos.size == 0:
+                break
+
+        # Passo de falsa posição (sempre dentro do intervalo)
+        x2 = x1 - f1 * (x1 - x0) / (f1 - f0)
+        f2, q2 = balanco(x2, ativos)
+        iteracoes[ativos] += 1
+
+        invalido = ~np.isfinite(f2)
+        if invalido.any():
+            falhou[ativos[invalido]] = True
+            resta = ~invalido
+            ativos, x0, f0, x1, f1, x2, f2, q2, tol_T = (
+                ativos[resta], x0[resta], f0[resta], x1[resta], f1[resta], x2[resta], f2[resta], q2[resta], tol_T[resta]
+            )
+
+        # Illinois: se o novo ponto não troca de sinal com x1, o extremo retido tem f pela metade
+        troca = f2 * f1 < 0
+        x0 = np.where(troca, x1, x0)
+        f0 = np.where(troca, f1, f0 * 0.5)
+        x1, f1, q1 = x2, f2, q2
+
+    # Raias que esgotaram max_iter ficam com a melhor estimativa e convergiu=False
+    if ativos.size:
+        Tf[ativos] = x1
+    Tf[falhou] = np.nan
+
+    solver_iterations.observe_many(iteracoes, solver=METODO_VETORIAL)
+    k_evaluations.inc(int(iteracoes.sum()), solver=METODO_VETORIAL)
+    nao_convergidos = int(n - convergiu.sum())
+    if nao_convergidos:
+        solver_nonconvergence.inc(nao_convergidos, solver=METODO_VETORIAL)
+    return Tf, q, convergiu, iteracoes
@@ -0,0 +1,246 @@
+"""
+Propriedades do ar tabeladas pela temperatura de filme
+
+As tabelas são montadas uma única vez na importação, numa grade uniforme de
+temperatura de filme, e interpoladas linearmente (versão escalar em Python puro
+para o solver escalar e versão NumPy para o vetorizado). Além de nu, alpha, k_ar
+e Pr, guardam os grupos usados pelas correlações de convecção, para que o solver
+não recalcule potências fracionárias a cada iteração.
+
+Opcionalmente (THERMALCALC_TABELA_HCONV=1) também é montada uma tabela de
+h_conv natural por geometria; ver TabelaHConv.
+"""
+import itertools
+import math
+import os
+
+import numpy as np
+
+G = 9.81
+
+# Grade da temperatura de filme (K); fora dela as propriedades são calculadas diretamente
+T_FILME_MIN = 150.0
+T_FILME_MAX = 1250.0
+PASSO_T_FILME = 0.5
+
+# Colunas das tabelas
+COLUNAS = ('nu', 'alpha', 'k_ar', 'Pr', 'fator_ra', 'pr_terco', 'fator_tubo')
+
+
+def _propriedades_exatas(T_film_K):
+    """
+    Propriedades do ar e grupos das correlações (escalar ou array NumPy)
+
+    nu e alpha seguem as leis de potência já usadas pelo solver; k_ar varia com a
+    temperatura (0,0263 W/m·K a 300 K), em vez do valor constante anterior.
+    """
+    nu = 1.589e-5 * (T_film_K / 293.15)**0.7
+    alpha = 2.25e-5 * (T_film_K / 293.15)**0.8
+    k_ar = 0.0263 * (T_film_K / 300.0)**0.81
+    Pr = nu / alpha
+    fator_ra = G / (T_film_K * nu * alpha)                        # Ra = fator_ra * ΔT * L³
+    pr_terco = Pr**(1 / 3)
+    fator_tubo = 0.387 / (1 + (0.559 / Pr)**(9 / 16))**(8 / 27)  # Churchill-Chu
+    return nu, alpha, k_ar, Pr, fator_ra, pr_terco, fator_tubo
+
+
+_N_PONTOS = int(round((T_FILME_MAX - T_FILME_MIN) / PASSO_T_FILME)) + 1
+_GRADE = np.linspace(T_FILME_MIN, T_FILME_MAX, _N_PONTOS)
+_TABELA = np.column_stack(_propriedades_exatas(_GRADE))
+# Cópia em listas de tuplas para a interpolação escalar (evita overhead do NumPy por chamada)
+_LINHAS = [tuple(linha) for linha in _TABELA.tolist()]
+_INV_PASSO = 1.0 / PASSO_T_FILME
+
+
+def _interpolar(T_film_K):
+    """Linha interpolada da tabela (escalar)"""
+    posicao = (T_film_K - T_FILME_MIN) * _INV_PASSO
+    i = int(posicao)
+    if posicao < 0 or i >= _N_PONTOS - 1:
+        return _propriedades_exatas(T_film_K)
+    f = posicao - i
+    a, b = _LINHAS[i], _LINHAS[i + 1]
+    return tuple(x + (y - x) * f for x, y in zip(a, b))
+
+
+def propriedades_ar(T_film_K):
+    """Retorna (nu, alpha, k_ar, Pr) do ar na temperatura de filme (K)"""
+    return _interpolar(T_film_K)[:4]
+
+
+# Grupos das correlações como pares (valor, incremento até o próximo ponto), por intervalo
+_GRUPOS = [tuple(v for j in (0, 2, 4, 5, 6) for v in (a[j], b[j] - a[j])) for a, b in zip(_LINHAS, _LINHAS[1:])]
+
+
+def grupos_conveccao(T_film_K):
+    """Retorna (nu, k_ar, fator_ra, pr_terco, fator_tubo) para as correlações de convecção"""
+    posicao = (T_film_K - T_FILME_MIN) * _INV_PASSO
+    i = int(posicao)
+    if posicao < 0 or i >= _N_PONTOS - 1:
+        nu, _, k_ar, _, fator_ra, pr_terco, fator_tubo = _propriedades_exatas(T_film_K)
+        return nu, k_ar, fator_ra, pr_terco, fator_tubo
+    f = posicao - i
+    c = _GRUPOS[i]
+    return c[0] + c[1] * f, c[2] + c[3] * f, c[4] + c[5] * f, c[6] + c[7] * f, c[8] + c[9] * f
+
+
+# Colunas contíguas (valor no início do intervalo, incremento até o próximo ponto) para a versão vetorizada
+_BASE = [np.ascontiguousarray(_TABELA[:-1, j]) for j in range(len(COLUNAS))]
+_DELTA = [np.ascontiguousarray(np.diff(_TABELA[:, j])) for j in range(len(COLUNAS))]
+
+
+def _interpolar_vetorial(T_film_K, colunas):
+    """Colunas da tabela interpoladas por raia (fora da grade, valores exatos)"""
+    T = np.atleast_1d(np.asarray(T_film_K, dtype=float))
+    posicao = (T - T_FILME_MIN) * _INV_PASSO
+    fora = ~((posicao >= 0) & (posicao < _N_PONTOS - 1))
+    if fora.any():
+        posicao = np.where(fora, 0.0, posicao)
+    i = posicao.astype(np.intp)
+    f = posicao - i
+    valores = [_BASE[j].take(i) + _DELTA[j].take(i) * f for j in colunas]
+    if fora.any():
+        with np.errstate(divide='ignore', invalid='ignore'):
+            exatos = _propriedades_exatas(T[fora])
+        for v, j in zip(valores, colunas):
+            v[fora] = exatos[j]
+    return tuple(valores)
+
+
+def propriedades_ar_vetorial(T_film_K):
+    """Versão vetorizada de propriedades_ar: tupla de arrays (nu, alpha, k_ar, Pr)"""
+    return _interpolar_vetorial(T_film_K, (0, 1, 2, 3))
+
+
+def grupos_conveccao_vetorial(T_film_K):
+    """Versão vetorizada de grupos_conveccao: tupla de arrays (nu, k_ar, fator_ra, pr_terco, fator_tubo)"""
+    return _interpolar_vetorial(T_film_K, (0, 2, 4, 5, 6))
+
+
+# Comprimento característico da placa plana em convecção natural (m)
+L_C_PLACA = 0.1
+
+
+def h_natural_vetorial(delta_T, T_film_K, L_c, tubo):
+    """Coeficiente de convecção natural (W/m²·K) pelas correlações do solver, por raia"""
+    _, k_ar, fator_ra, _, fator_tubo = grupos_conveccao_vetorial(T_film_K)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        Ra = fator_ra * delta_T * L_c**3
+        Nu = np.where(tubo, (0.60 + fator_tubo * Ra**(1 / 6))**2, 0.27 * Ra**0.25)
+        return Nu * k_ar / L_c
+
+
+class TabelaHConv:
+    """
+    Tabela de h_conv natural por geometria, interpolada em (log ΔT, T_filme[, log D])
+
+    A interpolação é multilinear sobre log(h). O erro relativo máximo contra a
+    correlação exata é medido na montagem, nos pontos centrais de todas as células
+    (onde o erro da interpolação linear é máximo), e fica em `erro_relativo_max`;
+    com a grade padrão ele fica abaixo de 0,1% nas duas geometrias. Consultas fora
+    da grade retornam None e o chamador usa a correlação exata.
+
+    Com os grupos de convecção já tabelados, a correlação direta é tão rápida
+    quanto a consulta (log/exp dominam o custo), por isso a tabela fica desligada
+    por padrão.
+    """
+
+    # Eixos: (nome, transformação, mínimo, máximo, pontos)
+    EIXO_DELTA_T = ('delta_T', 'log', 1e-3, 1500.0, 121)
+    EIXO_T_FILME = ('T_film', 'lin', 200.0, 1100.0, 91)
+    EIXO_DIAMETRO = ('D', 'log', 5e-3, 5.0, 61)
+
+    def __init__(self, tubo):
+        self.tubo = tubo
+        self.eixos = [self.EIXO_DELTA_T, self.EIXO_T_FILME] + ([self.EIXO_DIAMETRO] if tubo else [])
+        self._inicio = [self._transformar(t, lo) for _, t, lo, _, _ in self.eixos]
+        self._passo = [(self._transformar(t, hi) - self._transformar(t, lo)) / (n - 1)
+                       for _, t, lo, hi, n in self.eixos]
+        self._n = [n for *_, n in self.eixos]
+
+        nos = [np.linspace(a, a + p * (n - 1), n) for a, p, n in zip(self._inicio, self._passo, self._n)]
+        self._log_h = np.log(self._h_exato(*np.meshgrid(*self._reais(nos), indexing='ij')))
+        self._valores = self._log_h.ravel().tolist()
+        self._estrides = [int(s // self._log_h.itemsize) for s in self._log_h.strides]
+        self.erro_relativo_max = self._medir_erro(nos)
+
+    @staticmethod
+    def _transformar(tipo, x):
+        return math.log(x) if tipo == 'log' else x
+
+    def _reais(self, coordenadas):
+        """Converte coordenadas transformadas de volta para as variáveis físicas"""
+        return [np.exp(c) if t == 'log' else c for c, (_, t, *_) in zip(coordenadas, self.eixos)]
+
+    def _h_exato(self, delta_T, T_film_K, D=None):
+        forma = np.shape(delta_T)
+        L_c = np.ravel(D) if self.tubo else L_C_PLACA
+        h = h_natural_vetorial(np.ravel(delta_T), np.ravel(T_film_K), L_c, self.tubo)
+        return h.reshape(forma)
+
+    def _medir_erro(self, nos):
+        centros = [(c[:-1] + c[1:]) / 2 for c in nos]
+        pontos = [m.ravel() for m in np.meshgrid(*self._reais(centros), indexing='ij')]
+        exato = self._h_exato(*pontos)
+        aproximado = self.h(*pontos)
+        return float(np.max(np.abs(aproximado / exato - 1)))
+
+    def h(self, delta_T, T_film_K, D=None):
+        """h_conv interpolado por raia (NaN fora da grade)"""
+        argumentos = [delta_T, T_film_K] + ([D] if self.tubo else [])
+        indices, pesos, dentro = [], [], True
+        for valor, (_, tipo, *_), a, p, n in zip(argumentos, self.eixos, self._inicio, self._passo, self._n):
+            valor = np.asarray(valor, dtype=float)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                posicao = ((np.log(valor) if tipo == 'log' else valor) - a) / p
+            dentro = dentro & (posicao >= 0) & (posicao <= n - 1)
+            posicao = np.clip(np.nan_to_num(posicao), 0, n - 1)
+            i = np.minimum(posicao.astype(np.intp), n - 2)
+            indices.append(i)
+            pesos.append(posicao - i)
+
+        log_h = 0.0
+        for canto in itertools.product((0, 1), repeat=len(indices)):
+            peso = 1.0
+            for c, f in zip(canto, pesos):
+                peso = peso * (f if c else 1 - f)
+            log_h = log_h + peso * self._log_h[tuple(i + c for i, c in zip(indices, canto))]
+        return np.where(dentro, np.exp(log_h), np.nan)
+
+    def h_escalar(self, delta_T, T_film_K, D=None):
+        """h_conv interpolado para um único caso (None fora da grade)"""
+        argumentos = (delta_T, T_film_K, D) if self.tubo else (delta_T, T_film_K)
+        base, pesos = 0, []
+        for valor, (_, tipo, *_), a, p, n, estride in zip(argumentos, self.eixos, self._inicio,
+                                                          self._passo, self._n, self._estrides):
+            if valor is None or valor <= 0:
+                return None
+            posicao = ((math.log(valor) if tipo == 'log' else valor) - a) / p
+            if posicao < 0 or posicao > n - 1:
+                return None
+            i = min(int(posicao), n - 2)
+            base += i * estride
+            pesos.append((posicao - i, estride))
+
+        v = self._valores
+        (f0, s0), (f1, s1) = pesos[0], pesos[1]
+
+        def bilinear(b):
+            return (1 - f0) * ((1 - f1) * v[b] + f1 * v[b + s1]) + f0 * ((1 - f1) * v[b + s0] + f1 * v[b + s0 + s1])
+
+        if len(pesos) == 2:
+            return math.exp(bilinear(base))
+        f2, s2 = pesos[2]
+        return math.exp((1 - f2) * bilinear(base) + f2 * bilinear(base + s2))
+
+
+# Tabelas de h_conv natural (opcionais), montadas uma vez na importação
+TABELA_HCONV_ATIVA = os.environ.get('THERMALCALC_TABELA_HCONV', '0').lower() in ('1', 'true', 'yes')
+_tabelas_h_conv = {}
+if TABELA_HCONV_ATIVA:
+    _tabelas_h_conv = {"Superfície Plana": TabelaHConv(tubo=False), "Tubulação": TabelaHConv(tubo=True)}
+
+
+def obter_tabela_h_conv(geometry):
+    """Tabela de h_conv natural da geometria, ou None se as tabelas estiverem desativadas"""
+    return _tabelas_h_conv.get(geometry)
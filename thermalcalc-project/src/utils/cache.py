@@ -0,0 +1,77 @@
+"""
+Cache LRU com expiração (TTL) para resultados de cálculo
+
+Thread-safe e limitado em número de entradas; acertos e falhas são contados
+no próprio cache e nas métricas da aplicação (/api/metrics).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from src.utils.metrics import metrics
+
+cache_hits = metrics.counter('thermalcalc_cache_hits_total', 'Acertos nos caches de resultados', rotulos=('cache',))
+cache_misses = metrics.counter('thermalcalc_cache_misses_total', 'Falhas nos caches de resultados', rotulos=('cache',))
+
+# Sentinela para diferenciar "não encontrado" de um valor None armazenado
+_AUSENTE = object()
+
+
+def canonizar_float(valor, digitos=12):
+    """Normaliza um número para uso em chaves (ex.: 50, 50.0 e 50.000000000001 viram '50')"""
+    if valor is None:
+        return None
+    return format(float(valor) + 0.0, f'.{digitos}g')
+
+
+class LRUTTLCache:
+    """Cache LRU limitado em entradas, com expiração por TTL (segundos)"""
+
+    def __init__(self, nome, tamanho_maximo=4096, ttl=3600.0):
+        self.nome = nome
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl = ttl
+        self._dados = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chave, padrao=None):
+        """Retorna o valor da chave (ou o padrão se ausente/expirado)"""
+        agora = time.monotonic()
+        with self._lock:
+            item = self._dados.get(chave, _AUSENTE)
+            if item is not _AUSENTE and item[0] > agora:
+                self._dados.move_to_end(chave)
+                self.hits += 1
+                cache_hits.inc(cache=self.nome)
+                return item[1]
+            if item is not _AUSENTE:
+                del self._dados[chave]
+            self.misses += 1
+        cache_misses.inc(cache=self.nome)
+        return padrao
+
+    def set(self, chave, valor):
+        """Armazena o valor, descartando as entradas menos usadas se necessário"""
+        with self._lock:
+            self._dados[chave] = (time.monotonic() + self.ttl, valor)
+            self._dados.move_to_end(chave)
+            while len(self._dados) > self.tamanho_maximo:
+                self._dados.popitem(last=False)
+
+    def clear(self):
+        """Esvazia o cache"""
+        with self._lock:
+            self._dados.clear()
+
+    def estatisticas(self):
+        """Retorna acertos, falhas e ocupação do cache"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._dados),
+                'maxSize': self.tamanho_maximo,
+                'ttl': self.ttl
+            }
@@ -0,0 +1,65 @@
+"""
+Leitura incremental de CSV enviado pelo cliente
+
+O arquivo é lido linha a linha e entregue em blocos de tamanho fixo, para que
+perfis e inventários grandes nunca fiquem inteiros em memória. Aceita ',' ou
+';' como separador (exportações do Excel em português) e vírgula decimal.
+"""
+import csv
+
+
+class CSVInvalido(ValueError):
+    """CSV sem cabeçalho ou com colunas obrigatórias ausentes"""
+
+
+def _decodificar(linhas, encoding):
+    """Decodifica as linhas binárias (UTF-8 com ou sem BOM; cp1252 como alternativa)"""
+    primeira = True
+    for linha in linhas:
+        try:
+            texto = linha.decode(encoding)
+        except UnicodeDecodeError:
+            texto = linha.decode('cp1252', errors='replace')
+        if primeira:
+            texto = texto.lstrip('﻿')
+            primeira = False
+        yield texto
+
+
+def ler_csv_em_blocos(arquivo, tamanho_bloco=1024, obrigatorias=(), encoding='utf-8'):
+    """
+    Lê um CSV binário e produz blocos de [(número da linha, {coluna: valor}), ...]
+
+    Os nomes das colunas são normalizados (sem espaços, em minúsculas); linhas em
+    branco são ignoradas. Levanta CSVInvalido se faltar alguma coluna obrigatória.
+    """
+    linhas = _decodificar(arquivo, encoding)
+    cabecalho_bruto = next(linhas, None)
+    if cabecalho_bruto is None or not cabecalho_bruto.strip():
+        raise CSVInvalido("CSV vazio ou sem cabeçalho")
+    delimitador = ';' if cabecalho_bruto.count(';') > cabecalho_bruto.count(',') else ','
+    cabecalho = [c.strip().lower() for c in next(csv.reader([cabecalho_bruto], delimiter=delimitador))]
+
+    faltando = [c for c in obrigatorias if c.lower() not in cabecalho]
+    if faltando:
+        raise CSVInvalido(f"Colunas obrigatórias ausentes no CSV: {', '.join(faltando)}")
+
+    bloco = []
+    for numero, valores in enumerate(csv.reader(linhas, delimiter=delimitador), start=2):
+        if not any(v.strip() for v in valores):
+            continue
+        bloco.append((numero, dict(zip(cabecalho, (v.strip() for v in valores)))))
+        if len(bloco) >= tamanho_bloco:
+            yield bloco
+            bloco = []
+    if bloco:
+        yield bloco
+
+
+def numero(valor, padrao=None):
+    """Converte um campo do CSV em float (aceita vírgula decimal); vazio retorna o padrão"""
+    if valor is None or valor == '':
+        if padrao is None:
+            raise ValueError("valor ausente")
+        return padrao
+    return float(valor.replace(',', '.') if ',' in valor and '.' not in valor else valor)
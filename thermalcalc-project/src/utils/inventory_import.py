@@ -0,0 +1,134 @@
+"""
+Importação de inventário de planta (CSV) com resultados transmitidos em NDJSON
+
+As linhas são lidas em blocos (src/utils/csv_stream.py), validadas e resolvidas
+em um pool de threads (o solver vetorizado passa a maior parte do tempo no NumPy).
+Os blocos são escritos na ordem do arquivo assim que ficam prontos, com no máximo
+uma janela limitada de blocos em andamento: nem o arquivo nem os resultados ficam
+inteiros em memória.
+"""
+import json
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from src.utils.csv_stream import numero
+
+logger = logging.getLogger(__name__)
+
+# Linhas por bloco: pequeno o bastante para o primeiro resultado sair rápido
+TAMANHO_BLOCO_IMPORTACAO = 256
+
+# Threads do pool de importação (configurável por ambiente)
+MAX_WORKERS_IMPORTACAO = int(os.environ.get('THERMALCALC_IMPORT_WORKERS', min(4, os.cpu_count() or 1)))
+
+COLUNAS_OBRIGATORIAS = ('tag', 'geometry', 'temperature', 'material', 'thickness')
+
+# Nomes de geometria aceitos no CSV (em minúsculas)
+GEOMETRIAS_ALIAS = {
+    'superfície plana': "Superfície Plana", 'superficie plana': "Superfície Plana", 'plana': "Superfície Plana",
+    'flat': "Superfície Plana",
+    'tubulação': "Tubulação", 'tubulacao': "Tubulação", 'tubo': "Tubulação", 'pipe': "Tubulação",
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Retorna o pool de threads compartilhado (criado na primeira chamada)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS_IMPORTACAO, thread_name_prefix='import')
+    return _executor
+
+
+def item_do_inventario(campos, padroes):
+    """
+    Converte uma linha do inventário no formato de item do cálculo em lote
+
+    Colunas: tag, geometry, diameter (mm), temperature (°C), material, finish,
+    thickness (mm) e, opcionalmente, ambientTemp e windSpeed; finish, ambientTemp e
+    windSpeed ausentes usam os padrões da requisição. Levanta ValueError com a
+    mensagem para o cliente se algum número for inválido.
+    """
+    def campo_numerico(nome, padrao=None):
+        try:
+            return numero(campos.get(nome.lower()), padrao)
+        except ValueError:
+            raise ValueError(f"Valor inválido em {nome}") from None
+
+    geometria = campos.get('geometry', '')
+    item = {
+        'material': campos.get('material'),
+        'finish': campos.get('finish') or padroes.get('finish'),
+        'geometry': GEOMETRIAS_ALIAS.get(geometria.lower(), geometria),
+        'hotTemp': campo_numerico('temperature'),
+        'ambientTemp': campo_numerico('ambientTemp', padroes.get('ambientTemp', 25.0)),
+        'layerThicknesses': [campo_numerico('thickness')],
+        'windSpeed': campo_numerico('windSpeed', padroes.get('windSpeed', 0.0)),
+    }
+    if campos.get('diameter'):
+        item['pipeDiameter'] = campo_numerico('diameter')
+    return item
+
+
+def _processar_bloco(bloco, padroes, validar, resolver):
+    """Valida e resolve um bloco; retorna as linhas NDJSON já serializadas"""
+    resultados, casos, posicoes = [], [], []
+    for linha, campos in bloco:
+        resultado = {'line': linha, 'tag': campos.get('tag')}
+        try:
+            caso, erro = validar(item_do_inventario(campos, padroes))
+        except ValueError as ex:
+            caso, erro = None, str(ex)
+        if erro:
+            resultado.update({'success': False, 'error': erro})
+        else:
+            casos.append(caso)
+            posicoes.append(len(resultados))
+        resultados.append(resultado)
+
+    if casos:
+        for posicao, resolvido in zip(posicoes, resolver(casos)):
+            resultados[posicao].update(resolvido)
+    return ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in resultados).encode('utf-8'), \
+        sum(1 for r in resultados if r.get('success'))
+
+
+def importar_inventario(blocos, padroes, validar, resolver, workers=None):
+    """
+    Gera o NDJSON da importação: uma linha por linha do CSV e uma linha final de resumo
+
+    validar(item) -> (caso, erro) e resolver(casos) -> [resultado, ...] são as mesmas
+    funções do cálculo em lote. Até 2 x workers blocos ficam em andamento por vez.
+    """
+    workers = max(1, min(workers or MAX_WORKERS_IMPORTACAO, MAX_WORKERS_IMPORTACAO))
+    executor = get_executor()
+    pendentes = deque()
+    total = sucesso = 0
+
+    def drenar():
+        nonlocal sucesso
+        try:
+            conteudo, n_ok = pendentes.popleft().result()
+        except Exception as ex:
+            logger.exception("Falha ao processar bloco da importação")
+            return (json.dumps({'success': False, 'error': f"Falha ao processar bloco: {ex}"}) + '\n').encode('utf-8')
+        sucesso += n_ok
+        return conteudo
+
+    for bloco in blocos:
+        total += len(bloco)
+        pendentes.append(executor.submit(_processar_bloco, bloco, padroes, validar, resolver))
+        # Escreve o que já terminou (em ordem) e limita os blocos em andamento
+        while pendentes and (pendentes[0].done() or len(pendentes) >= 2 * workers):
+            yield drenar()
+    while pendentes:
+        yield drenar()
+
+    yield (json.dumps({'summary': {'total': total, 'success': sucesso, 'errors': total - sucesso}}) + '\n').encode('utf-8')
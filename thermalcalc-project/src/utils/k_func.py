@@ -0,0 +1,533 @@
+"""
+Registro de funções de condutividade térmica k(T) compiladas
+
+As fórmulas k_func dos materiais são validadas por uma AST restrita
+(apenas T, números, aritmética com expoentes constantes limitados e math.exp/math.log)
+e compiladas uma única vez em funções Python reutilizáveis, evitando o eval() a cada
+iteração do solver.
+
+Para a condução o solver usa a condutividade média integral
+k̄(T1, T2) = ∫ k dT / (T1 - T2) (transformação de Kirchhoff), exata para k variável.
+Polinômios em T e a·exp(b·T) são reconhecidos na AST e têm k̄ em forma fechada;
+as demais fórmulas usam uma tabela da primitiva de k(T) calculada uma vez por
+quadratura (ver IntegralK).
+"""
+import ast
+import math
+import threading
+from collections import OrderedDict
+from types import SimpleNamespace
+
+# Nós permitidos na expressão k(T)
+_OPERADORES_BINARIOS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow)
+_OPERADORES_UNARIOS = (ast.UAdd, ast.USub)
+_FUNCOES_PERMITIDAS = ('exp', 'log')
+
+# Tamanho máximo do cache de fórmulas fornecidas pelo usuário
+TAMANHO_CACHE_USUARIO = 256
+
+# Formas de k(T) com integral em forma fechada
+FORMA_POLINOMIO = 'polinomio'
+FORMA_EXPONENCIAL = 'exponencial'
+FORMA_QUADRATURA = 'quadratura'
+
+# Maior grau reconhecido como polinômio (potências inteiras de T)
+GRAU_MAXIMO_POLINOMIO = 8
+
+# Tabela da primitiva de k(T) para fórmulas sem forma fechada (°C)
+QUADRATURA_T_MIN = -270.0
+QUADRATURA_T_MAX = 2000.0
+QUADRATURA_PASSO = 0.5
+
+
+class KFuncError(ValueError):
+    """Erro de validação ou compilação de uma fórmula k(T)"""
+
+
+def normalizar_k_func(k_func_str):
+    """Normaliza a fórmula (aceita vírgula como separador decimal)"""
+    return str(k_func_str).replace(',', '.').strip()
+
+
+def _constante_numerica(no):
+    """Valor de uma constante numérica (com sinal unário opcional) ou None"""
+    sinal = 1
+    while isinstance(no, ast.UnaryOp) and isinstance(no.op, _OPERADORES_UNARIOS):
+        sinal = -sinal if isinstance(no.op, ast.USub) else sinal
+        no = no.operand
+    if isinstance(no, ast.Constant) and isinstance(no.value, (int, float)) and not isinstance(no.value, bool):
+        return sinal * no.value
+    return None
+
+
+def _validar_no(no, expr):
+    """Valida recursivamente um nó da AST da fórmula k(T)"""
+    if isinstance(no, ast.Expression):
+        _validar_no(no.body, expr)
+    elif isinstance(no, ast.Constant):
+        if isinstance(no.value, bool) or not isinstance(no.value, (int, float)):
+            raise KFuncError(f"Constante inválida na fórmula k(T) '{expr}': {no.value!r}")
+    elif isinstance(no, ast.Name):
+        if no.id != 'T':
+            raise KFuncError(f"Variável não permitida na fórmula k(T) '{expr}': {no.id}")
+    elif isinstance(no, ast.BinOp):
+        if not isinstance(no.op, _OPERADORES_BINARIOS):
+            raise KFuncError(f"Operador não permitido na fórmula k(T) '{expr}'")
+        if isinstance(no.op, ast.Pow):
+            # Expoentes grandes (ex.: 9**9**9) travariam a avaliação
+            expoente = _constante_numerica(no.right)
+            if expoente is None or abs(expoente) > GRAU_MAXIMO_POLINOMIO:
+                raise KFuncError(f"O expoente na fórmula k(T) '{expr}' deve ser uma constante entre "
+                                 f"-{GRAU_MAXIMO_POLINOMIO} e {GRAU_MAXIMO_POLINOMIO}")
+        _validar_no(no.left, expr)
+        _validar_no(no.right, expr)
+    elif isinstance(no, ast.UnaryOp):
+        if not isinstance(no.op, _OPERADORES_UNARIOS):
+            raise KFuncError(f"Operador não permitido na fórmula k(T) '{expr}'")
+        _validar_no(no.operand, expr)
+    elif isinstance(no, ast.Call):
+        funcao = no.func
+        if not (isinstance(funcao, ast.Attribute)
+                and isinstance(funcao.value, ast.Name)
+                and funcao.value.id == 'math'
+                and funcao.attr in _FUNCOES_PERMITIDAS):
+            raise KFuncError(f"Função não permitida na fórmula k(T) '{expr}' (use math.exp ou math.log)")
+        if len(no.args) != 1 or no.keywords:
+            raise KFuncError(f"math.{funcao.attr} deve receber exatamente um argumento em '{expr}'")
+        _validar_no(no.args[0], expr)
+    else:
+        raise KFuncError(f"Expressão não permitida na fórmula k(T) '{expr}': {type(no).__name__}")
+
+
+def _modulo_numpy():
+    """Substituto de 'math' com exp/log do NumPy, para avaliar k(T) sobre arrays"""
+    import numpy as np
+    return SimpleNamespace(exp=np.exp, log=np.log)
+
+
+def compilar_k_func(k_func_str, vetorial=False):
+    """
+    Valida e compila a fórmula k(T) em uma função k(T) -> float
+
+    Com vetorial=True a função aceita arrays NumPy (math.exp/math.log viram np.exp/np.log).
+    """
+    expr = normalizar_k_func(k_func_str)
+    try:
+        arvore = ast.parse(expr, mode='eval')
+    except SyntaxError as ex:
+        raise KFuncError(f"Fórmula k(T) inválida '{k_func_str}': {ex.msg}") from None
+    _validar_no(arvore, expr)
+
+    # Constantes inteiras viram float: potências de constantes estouram (OverflowError)
+    # em vez de crescer como inteiros de precisão arbitrária
+    for no in ast.walk(arvore):
+        if isinstance(no, ast.Constant) and isinstance(no.value, int) and not isinstance(no.value, bool):
+            no.value = float(no.value)
+
+    # A expressão já validada vira o corpo de uma lambda compilada uma única vez
+    funcao = ast.Expression(body=ast.Lambda(
+        args=ast.arguments(posonlyargs=[], args=[ast.arg(arg='T')], kwonlyargs=[],
+                           kw_defaults=[], defaults=[]),
+        body=arvore.body
+    ))
+    ast.fix_missing_locations(funcao)
+    codigo = compile(funcao, f'<k_func: {expr}>', 'eval')
+    modulo = _modulo_numpy() if vetorial else math
+    return eval(codigo, {'__builtins__': {}, 'math': modulo})
+
+
+class _FormaNaoReconhecida(Exception):
+    """Sub-expressão fora das formas com integral fechada"""
+
+
+def _multiplicar_polinomios(p, q):
+    produto = [0.0] * (len(p) + len(q) - 1)
+    for i, a in enumerate(p):
+        for j, b in enumerate(q):
+            produto[i + j] += a * b
+    if len(produto) - 1 > GRAU_MAXIMO_POLINOMIO:
+        raise _FormaNaoReconhecida
+    return produto
+
+
+def _somar_polinomios(p, q, sinal=1.0):
+    soma = [0.0] * max(len(p), len(q))
+    for i, a in enumerate(p):
+        soma[i] += a
+    for i, b in enumerate(q):
+        soma[i] += sinal * b
+    return soma
+
+
+def _constante(p):
+    """Valor de um polinômio constante (levanta _FormaNaoReconhecida se depender de T)"""
+    if any(c != 0 for c in p[1:]):
+        raise _FormaNaoReconhecida
+    return p[0]
+
+
+def _forma_no(no):
+    """
+    Reduz um nó da AST a ('p', [c0, c1, ...]) (polinômio) ou ('e', a, b) (a·exp(b·T))
+
+    Levanta _FormaNaoReconhecida para qualquer outra forma.
+    """
+    if isinstance(no, ast.Constant):
+        return ('p', [float(no.value)])
+    if isinstance(no, ast.Name):
+        return ('p', [0.0, 1.0])
+    if isinstance(no, ast.UnaryOp):
+        forma = _forma_no(no.operand)
+        if isinstance(no.op, ast.UAdd):
+            return forma
+        return ('p', [-c for c in forma[1]]) if forma[0] == 'p' else ('e', -forma[1], forma[2])
+    if isinstance(no, ast.Call):
+        # math.exp(c0 + c1·T) = exp(c0)·exp(c1·T); math.log só como constante
+        argumento = _forma_no(no.args[0])
+        if argumento[0] != 'p' or len(argumento[1]) > 2:
+            raise _FormaNaoReconhecida
+        c0, c1 = (argumento[1] + [0.0])[:2]
+        if no.func.attr == 'exp':
+            return ('e', math.exp(c0), c1) if c1 != 0 else ('p', [math.exp(c0)])
+        return ('p', [math.log(_constante(argumento[1]))])
+    if isinstance(no, ast.BinOp):
+        esquerda, direita = _forma_no(no.left), _forma_no(no.right)
+        if isinstance(no.op, (ast.Add, ast.Sub)):
+            sinal = 1.0 if isinstance(no.op, ast.Add) else -1.0
+            if esquerda[0] == 'p' and direita[0] == 'p':
+                return ('p', _somar_polinomios(esquerda[1], direita[1], sinal))
+            if esquerda[0] == 'e' and direita[0] == 'e' and esquerda[2] == direita[2]:
+                return ('e', esquerda[1] + sinal * direita[1], esquerda[2])
+            raise _FormaNaoReconhecida
+        if isinstance(no.op, ast.Mult):
+            if esquerda[0] == 'p' and direita[0] == 'p':
+                return ('p', _multiplicar_polinomios(esquerda[1], direita[1]))
+            if esquerda[0] == 'e' and direita[0] == 'e':
+                return ('e', esquerda[1] * direita[1], esquerda[2] + direita[2])
+            exponencial, polinomio = (esquerda, direita) if esquerda[0] == 'e' else (direita, esquerda)
+            return ('e', exponencial[1] * _constante(polinomio[1]), exponencial[2])
+        if isinstance(no.op, ast.Div):
+            if direita[0] == 'e':
+                return ('e', _constante(esquerda[1]) / direita[1], -direita[2]) if esquerda[0] == 'p' else \
+                    ('e', esquerda[1] / direita[1], esquerda[2] - direita[2])
+            divisor = _constante(direita[1])
+            if divisor == 0:
+                raise _FormaNaoReconhecida
+            return ('p', [c / divisor for c in esquerda[1]]) if esquerda[0] == 'p' else \
+                ('e', esquerda[1] / divisor, esquerda[2])
+        if isinstance(no.op, ast.Pow):
+            expoente = _constante(direita[1]) if direita[0] == 'p' else None
+            if expoente is None or expoente != int(expoente) or expoente < 0:
+                raise _FormaNaoReconhecida
+            expoente = int(expoente)
+            if esquerda[0] == 'e':
+                return ('e', esquerda[1] ** expoente, esquerda[2] * expoente)
+            base = list(esquerda[1])
+            while len(base) > 1 and base[-1] == 0:
+                base.pop()
+            # Base constante: potência direta; base em T: grau limitado antes de expandir
+            if len(base) == 1:
+                return ('p', [float(base[0]) ** expoente])
+            if (len(base) - 1) * expoente > GRAU_MAXIMO_POLINOMIO:
+                raise _FormaNaoReconhecida
+            resultado = [1.0]
+            for _ in range(expoente):
+                resultado = _multiplicar_polinomios(resultado, base)
+            return ('p', resultado)
+    raise _FormaNaoReconhecida
+
+
+def reconhecer_forma(k_func_str):
+    """
+    Reconhece k(T) polinomial em T ou da forma a·exp(b·T)
+
+    Retorna (FORMA_POLINOMIO, (c0, c1, ...)) com k = Σ cᵢ·Tⁱ,
+    (FORMA_EXPONENCIAL, (a, b)) com k = a·exp(b·T), ou None para outras fórmulas.
+    A fórmula deve ser válida (ver compilar_k_func).
+    """
+    arvore = ast.parse(normalizar_k_func(k_func_str), mode='eval')
+    try:
+        forma = _forma_no(arvore.body)
+    except (_FormaNaoReconhecida, ArithmeticError, ValueError):
+        return None
+    if forma[0] == 'e':
+        return (FORMA_EXPONENCIAL, (forma[1], forma[2]))
+    coeficientes = list(forma[1])
+    while len(coeficientes) > 1 and coeficientes[-1] == 0:
+        coeficientes.pop()
+    return (FORMA_POLINOMIO, tuple(coeficientes))
+
+
+def _expressao_media_polinomio(coeficientes):
+    """
+    Expressão de k̄(T1, T2) para k = Σ cᵢ·Tⁱ
+
+    ∫ Tⁱ dT / (T1 - T2) = Σⱼ T1ʲ·T2ⁱ⁻ʲ / (i + 1): sem divisão por T1 - T2, vale também para T1 = T2.
+    """
+    termos = []
+    for i, c in enumerate(coeficientes):
+        if c == 0:
+            continue
+        if i == 0:
+            termos.append(repr(c))
+            continue
+        monomios = ' + '.join('*'.join(['T1'] * j + ['T2'] * (i - j)) for j in range(i + 1))
+        termos.append(f'{c!r} * ({monomios}) / {i + 1}')
+    return ' + '.join(termos) or '0.0'
+
+
+def _compilar_media(expressao, modulo):
+    """Compila a expressão de k̄ em uma função (T1, T2)"""
+    codigo = compile(f'lambda T1, T2: {expressao}', f'<k_media: {expressao}>', 'eval')
+    return eval(codigo, {'__builtins__': {}, 'math': modulo})
+
+
+class _TabelaPrimitiva:
+    """
+    Primitiva F(T) = ∫ k dT tabelada em QUADRATURA_PASSO, para fórmulas sem forma fechada
+
+    Cada célula é integrada por Gauss-Legendre de 4 pontos; dentro da célula F é
+    interpolada por Hermite cúbico (F e F' = k nos nós). Células com k inválido
+    são contadas para que uma integral que as atravesse resulte em NaN.
+    """
+
+    def __init__(self, k_vetorial):
+        import numpy as np
+
+        n = int(round((QUADRATURA_T_MAX - QUADRATURA_T_MIN) / QUADRATURA_PASSO))
+        nos = QUADRATURA_T_MIN + QUADRATURA_PASSO * np.arange(n + 1)
+        x, w = np.polynomial.legendre.leggauss(4)
+        with np.errstate(all='ignore'):
+            k_nos = np.broadcast_to(np.asarray(k_vetorial(nos), dtype=float), nos.shape)
+            pontos = (nos[:-1, None] + QUADRATURA_PASSO * (x + 1) / 2)
+            k_pontos = np.broadcast_to(np.asarray(k_vetorial(pontos), dtype=float), pontos.shape)
+        celulas = (k_pontos * w).sum(axis=1) * QUADRATURA_PASSO / 2
+        invalidas = ~np.isfinite(celulas) | ~np.isfinite(k_nos[:-1]) | ~np.isfinite(k_nos[1:])
+
+        self.k = np.array(k_nos)
+        self.F = np.concatenate(([0.0], np.cumsum(np.where(invalidas, 0.0, celulas))))
+        self.invalidas = np.concatenate(([0], np.cumsum(invalidas)))
+        self.celula_invalida = invalidas
+        # Cópias em listas para o caminho escalar (indexar listas é mais barato que arrays)
+        self._k, self._F = self.k.tolist(), self.F.tolist()
+        self._invalidas, self._celula_invalida = self.invalidas.tolist(), invalidas.tolist()
+        self.n = n
+
+    def primitiva(self, T):
+        """(F(T), nº de células inválidas antes de T), F NaN em célula inválida; None fora da tabela"""
+        posicao = (T - QUADRATURA_T_MIN) / QUADRATURA_PASSO
+        if not 0 <= posicao <= self.n:
+            return None
+        i = min(int(posicao), self.n - 1)
+        if self._celula_invalida[i]:
+            return math.nan, self._invalidas[i]
+        s = posicao - i
+        s2, s3 = s * s, s * s * s
+        F = ((2 * s3 - 3 * s2 + 1) * self._F[i] + (-2 * s3 + 3 * s2) * self._F[i + 1]
+             + QUADRATURA_PASSO * ((s3 - 2 * s2 + s) * self._k[i] + (s3 - s2) * self._k[i + 1]))
+        return F, self._invalidas[i]
+
+    def primitiva_vetorial(self, T):
+        """Versão de primitiva() para arrays: (F, contagem de inválidas, dentro da tabela)"""
+        import numpy as np
+
+        posicao = (T - QUADRATURA_T_MIN) / QUADRATURA_PASSO
+        dentro = (posicao >= 0) & (posicao <= self.n)
+        i = np.clip(np.where(dentro, posicao, 0).astype(int), 0, self.n - 1)
+        s = np.where(dentro, posicao, 0) - i
+        s2, s3 = s * s, s * s * s
+        F = ((2 * s3 - 3 * s2 + 1) * self.F[i] + (-2 * s3 + 3 * s2) * self.F[i + 1]
+             + QUADRATURA_PASSO * ((s3 - 2 * s2 + s) * self.k[i] + (s3 - s2) * self.k[i + 1]))
+        return np.where(self.celula_invalida[i], np.nan, F), self.invalidas[i], dentro
+
+
+class IntegralK:
+    """
+    Condutividade média integral k̄(T1, T2) = ∫ k dT / (T1 - T2) de uma fórmula k(T)
+
+    O fluxo de condução de uma camada é k̄(Tq, Tf)·(Tq - Tf)/divisor, sem avaliar k na
+    temperatura média. forma/coeficientes registram a forma reconhecida da fórmula.
+    media(T1, T2) opera sobre floats e media_vetorial(T1, T2) sobre arrays NumPy.
+    """
+
+    __slots__ = ('expr', 'forma', 'coeficientes', 'k', 'media', 'media_vetorial', '_k_vetorial', '_tabela')
+
+    def __init__(self, k_func_str):
+        expr = normalizar_k_func(k_func_str)
+        self.expr = expr
+        self.k = compilar_k_func(expr)
+        self._k_vetorial = None
+        self._tabela = None
+        reconhecida = reconhecer_forma(expr)
+        if reconhecida is None:
+            self.forma, self.coeficientes = FORMA_QUADRATURA, None
+            self.media, self.media_vetorial = self._media_quadratura, self._media_quadratura_vetorial
+        elif reconhecida[0] == FORMA_POLINOMIO:
+            self.forma, self.coeficientes = reconhecida
+            expressao = _expressao_media_polinomio(self.coeficientes)
+            self.media = _compilar_media(expressao, math)
+            self.media_vetorial = _compilar_media(f'({expressao}) + 0 * T1 * T2', math)
+        else:
+            self.forma, self.coeficientes = reconhecida
+            self.media, self.media_vetorial = self._media_exponencial, self._media_exponencial_vetorial
+
+    def _media_exponencial(self, T1, T2):
+        a, b = self.coeficientes
+        x = b * (T1 - T2)
+        base = a * math.exp(b * T2)
+        return base if x == 0 else base * math.expm1(x) / x
+
+    def _media_exponencial_vetorial(self, T1, T2):
+        import numpy as np
+
+        a, b = self.coeficientes
+        x = b * (T1 - T2)
+        base = a * np.exp(b * T2)
+        nulo = x == 0
+        return np.where(nulo, base, base * np.expm1(x) / np.where(nulo, 1.0, x))
+
+    def _obter_tabela(self):
+        """Primitiva tabelada, calculada na primeira integral numérica desta fórmula"""
+        if self._tabela is None:
+            self._k_vetorial = compilar_k_func(self.expr, vetorial=True)
+            self._tabela = _TabelaPrimitiva(self._k_vetorial)
+        return self._tabela
+
+    def _gauss(self, T1, T2):
+        """k̄ por Gauss-Legendre de 8 pontos direto no intervalo (fora da tabela; levanta ValueError se k inválido)"""
+        import numpy as np
+
+        x, w = np.polynomial.legendre.leggauss(8)
+        meio, metade = (T1 + T2) / 2, (T1 - T2) / 2
+        return float(np.dot(w, [self.k(meio + metade * xi) for xi in x])) / 2
+
+    def _media_quadratura(self, T1, T2):
+        delta = T1 - T2
+        if abs(delta) <= 1e-9 * max(1.0, abs(T1)):
+            return self.k((T1 + T2) / 2)
+        tabela = self._obter_tabela()
+        p1, p2 = tabela.primitiva(T1), tabela.primitiva(T2)
+        if p1 is None or p2 is None:
+            return self._gauss(T1, T2)
+        if p1[1] != p2[1]:
+            return math.nan
+        return (p1[0] - p2[0]) / delta
+
+    def _media_quadratura_vetorial(self, T1, T2):
+        import numpy as np
+
+        T1, T2 = np.broadcast_arrays(np.asarray(T1, dtype=float), np.asarray(T2, dtype=float))
+        tabela = self._obter_tabela()
+        F1, n1, ok1 = tabela.primitiva_vetorial(T1)
+        F2, n2, ok2 = tabela.primitiva_vetorial(T2)
+        delta = T1 - T2
+        proximo = np.abs(delta) <= 1e-9 * np.maximum(1.0, np.abs(T1))
+        with np.errstate(all='ignore'):
+            media = np.where((n1 == n2) & ~proximo, (F1 - F2) / np.where(proximo, 1.0, delta), np.nan)
+            if proximo.any():
+                media = np.where(proximo, self._k_vetorial((T1 + T2) / 2), media)
+        fora = ~(ok1 & ok2) & ~proximo
+        if fora.any():
+            # Fora da tabela: Gauss direto em cada raia
+            for i in np.flatnonzero(fora):
+                try:
+                    media.flat[i] = self._gauss(float(T1.flat[i]), float(T2.flat[i]))
+                except (ArithmeticError, ValueError):
+                    media.flat[i] = np.nan
+        return media
+
+
+class KFuncRegistry:
+    """
+    Registro de fórmulas k(T) compiladas
+
+    Fórmulas do catálogo ficam fixas no registro, junto com a forma reconhecida e a
+    integral de k(T) (IntegralK); fórmulas avulsas (ex.: fornecidas pelo usuário)
+    ficam em um cache LRU limitado.
+    """
+
+    def __init__(self, tamanho_cache=TAMANHO_CACHE_USUARIO):
+        self.tamanho_cache = tamanho_cache
+        self._catalogo = {}
+        self._cache = OrderedDict()
+        self._vetoriais = OrderedDict()
+        self._integrais_catalogo = {}
+        self._integrais = OrderedDict()
+        self._lock = threading.Lock()
+
+    def registrar(self, k_func_str):
+        """Compila e fixa uma fórmula do catálogo (levanta KFuncError se inválida)"""
+        chave = normalizar_k_func(k_func_str)
+        funcao = self._catalogo.get(chave)
+        if funcao is None:
+            integral = IntegralK(chave)
+            funcao = integral.k
+            with self._lock:
+                self._catalogo[chave] = funcao
+                self._integrais_catalogo[chave] = integral
+        return funcao
+
+    def obter(self, k_func_str):
+        """Retorna a função compilada para a fórmula (levanta KFuncError se inválida)"""
+        chave = normalizar_k_func(k_func_str)
+        funcao = self._catalogo.get(chave)
+        if funcao is not None:
+            return funcao
+
+        with self._lock:
+            funcao = self._cache.get(chave)
+            if funcao is not None:
+                self._cache.move_to_end(chave)
+                return funcao
+
+        funcao = compilar_k_func(chave)
+        with self._lock:
+            self._cache[chave] = funcao
+            self._cache.move_to_end(chave)
+            while len(self._cache) > self.tamanho_cache:
+                self._cache.popitem(last=False)
+        return funcao
+
+    def obter_vetorial(self, k_func_str):
+        """Retorna a versão da fórmula que opera sobre arrays NumPy (levanta KFuncError se inválida)"""
+        chave = normalizar_k_func(k_func_str)
+        with self._lock:
+            funcao = self._vetoriais.get(chave)
+            if funcao is not None:
+                self._vetoriais.move_to_end(chave)
+                return funcao
+
+        funcao = compilar_k_func(chave, vetorial=True)
+        with self._lock:
+            self._vetoriais[chave] = funcao
+            self._vetoriais.move_to_end(chave)
+            # Fórmulas do catálogo não contam para o limite do cache
+            limite = self.tamanho_cache + len(self._catalogo)
+            while len(self._vetoriais) > limite:
+                self._vetoriais.popitem(last=False)
+        return funcao
+
+    def obter_integral(self, k_func_str):
+        """Retorna a IntegralK da fórmula (levanta KFuncError se inválida)"""
+        chave = normalizar_k_func(k_func_str)
+        integral = self._integrais_catalogo.get(chave)
+        if integral is not None:
+            return integral
+
+        with self._lock:
+            integral = self._integrais.get(chave)
+            if integral is not None:
+                self._integrais.move_to_end(chave)
+                return integral
+
+        integral = IntegralK(chave)
+        with self._lock:
+            self._integrais[chave] = integral
+            self._integrais.move_to_end(chave)
+            while len(self._integrais) > self.tamanho_cache:
+                self._integrais.popitem(last=False)
+        return integral
+
+
+# Instância global para uso na aplicação
+k_func_registry = KFuncRegistry()
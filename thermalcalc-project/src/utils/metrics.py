@@ -0,0 +1,178 @@
+"""
+Métricas da aplicação (contadores e histogramas) no formato texto do Prometheus
+
+Implementação mínima e thread-safe, sem dependências externas. As métricas são
+registradas na instância global `metrics` e expostas em /api/metrics.
+"""
+import threading
+from bisect import bisect_left
+from collections import Counter as _Contagem
+
+# Buckets padrão (segundos) para latência de requisições
+BUCKETS_LATENCIA = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Buckets padrão para número de iterações do solver
+BUCKETS_ITERACOES = (1, 2, 4, 6, 8, 10, 15, 20, 30, 50, 100, 200, 500, 1000)
+
+
+def _formatar_rotulos(nomes, valores, extra=None):
+    """Formata os rótulos no padrão {nome="valor",...}"""
+    pares = [f'{n}="{_escapar(v)}"' for n, v in zip(nomes, valores)]
+    if extra:
+        pares.append(extra)
+    return '{' + ','.join(pares) + '}' if pares else ''
+
+
+def _escapar(valor):
+    """Escapa um valor de rótulo para o formato texto do Prometheus"""
+    return str(valor).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _formatar_numero(valor):
+    """Formata um número (inteiros sem casas decimais, +Inf para infinito)"""
+    if valor == float('inf'):
+        return '+Inf'
+    if float(valor).is_integer():
+        return str(int(valor))
+    return repr(float(valor))
+
+
+class Counter:
+    """Contador monotônico, opcionalmente com rótulos"""
+
+    tipo = 'counter'
+
+    def __init__(self, nome, descricao, rotulos=()):
+        self.nome = nome
+        self.descricao = descricao
+        self.rotulos = tuple(rotulos)
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def inc(self, valor=1, **rotulos):
+        """Incrementa o contador"""
+        chave = tuple(str(rotulos.get(r, '')) for r in self.rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def valor(self, **rotulos):
+        """Retorna o valor atual do contador"""
+        chave = tuple(str(rotulos.get(r, '')) for r in self.rotulos)
+        return self._valores.get(chave, 0)
+
+    def render(self):
+        """Linhas no formato texto do Prometheus"""
+        with self._lock:
+            itens = sorted(self._valores.items())
+        if not itens and not self.rotulos:
+            itens = [((), 0)]
+        return [f'{self.nome}{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(v)}' for chave, v in itens]
+
+
+class Histogram:
+    """Histograma cumulativo com buckets fixos, opcionalmente com rótulos"""
+
+    tipo = 'histogram'
+
+    def __init__(self, nome, descricao, buckets, rotulos=()):
+        self.nome = nome
+        self.descricao = descricao
+        self.buckets = tuple(sorted(buckets))
+        self.rotulos = tuple(rotulos)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _serie(self, chave):
+        serie = self._series.get(chave)
+        if serie is None:
+            serie = self._series[chave] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        return serie
+
+    def observe(self, valor, **rotulos):
+        """Registra uma observação"""
+        chave = tuple(str(rotulos.get(r, '')) for r in self.rotulos)
+        indice = bisect_left(self.buckets, valor)
+        with self._lock:
+            serie = self._serie(chave)
+            serie[0][indice] += 1
+            serie[1] += valor
+            serie[2] += 1
+
+    def observe_many(self, valores, **rotulos):
+        """Registra várias observações de uma vez (ex.: iterações de um lote vetorizado)"""
+        chave = tuple(str(rotulos.get(r, '')) for r in self.rotulos)
+        contagem = _Contagem(valores.tolist() if hasattr(valores, 'tolist') else valores)
+        with self._lock:
+            serie = self._serie(chave)
+            for valor, n in contagem.items():
+                serie[0][bisect_left(self.buckets, valor)] += n
+                serie[1] += valor * n
+                serie[2] += n
+
+    def render(self):
+        """Linhas no formato texto do Prometheus"""
+        with self._lock:
+            itens = sorted((chave, ([*c], s, n)) for chave, (c, s, n) in self._series.items())
+        linhas = []
+        for chave, (contagens, soma, total) in itens:
+            acumulado = 0
+            for limite, n in zip(self.buckets + (float('inf'),), contagens):
+                acumulado += n
+                le = f'le="{_formatar_numero(limite)}"'
+                linhas.append(f'{self.nome}_bucket{_formatar_rotulos(self.rotulos, chave, le)} {acumulado}')
+            linhas.append(f'{self.nome}_sum{_formatar_rotulos(self.rotulos, chave)} {_formatar_numero(soma)}')
+            linhas.append(f'{self.nome}_count{_formatar_rotulos(self.rotulos, chave)} {total}')
+        return linhas
+
+
+class MetricsRegistry:
+    """Registro de métricas da aplicação"""
+
+    def __init__(self):
+        self._metricas = []
+
+    def counter(self, nome, descricao, rotulos=()):
+        """Cria e registra um contador"""
+        metrica = Counter(nome, descricao, rotulos)
+        self._metricas.append(metrica)
+        return metrica
+
+    def histogram(self, nome, descricao, buckets, rotulos=()):
+        """Cria e registra um histograma"""
+        metrica = Histogram(nome, descricao, buckets, rotulos)
+        self._metricas.append(metrica)
+        return metrica
+
+    def render(self):
+        """Todas as métricas no formato texto do Prometheus (versão 0.0.4)"""
+        linhas = []
+        for metrica in self._metricas:
+            linhas.append(f'# HELP {metrica.nome} {metrica.descricao}')
+            linhas.append(f'# TYPE {metrica.nome} {metrica.tipo}')
+            linhas.extend(metrica.render())
+        return '\n'.join(linhas) + '\n'
+
+
+# Instância global para uso na aplicação
+metrics = MetricsRegistry()
+
+request_latency = metrics.histogram(
+    'thermalcalc_request_duration_seconds',
+    'Latência das requisições da API por endpoint',
+    BUCKETS_LATENCIA, rotulos=('endpoint', 'method')
+)
+solver_iterations = metrics.histogram(
+    'thermalcalc_solver_iterations',
+    'Avaliações do balanço térmico por solve da face fria',
+    BUCKETS_ITERACOES, rotulos=('solver',)
+)
+solver_nonconvergence = metrics.counter(
+    'thermalcalc_solver_nonconvergence_total',
+    'Solves da face fria que não convergiram',
+    rotulos=('solver',)
+)
+k_evaluations = metrics.counter(
+    'thermalcalc_k_evaluations_total',
+    'Avaliações de k(T) realizadas pelos solvers',
+    rotulos=('solver',)
+)
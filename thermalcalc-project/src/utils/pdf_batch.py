@@ -0,0 +1,158 @@
+"""
+Geração de relatórios PDF em lote, empacotados em um ZIP transmitido incrementalmente
+
+Os PDFs são renderizados em um pool de processos (reaproveitando PDFGenerator em
+cada processo) e escritos no ZIP à medida que ficam prontos; apenas uma janela
+limitada de relatórios fica em memória por vez. Falhas individuais não
+interrompem o lote e são registradas no manifest.json ao final do arquivo.
+"""
+import io
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+REPORT_TYPES = ('thermal', 'condensation')
+
+# Número máximo de processos do pool (configurável por ambiente)
+MAX_WORKERS = int(os.environ.get('THERMALCALC_PDF_WORKERS', os.cpu_count() or 1))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def render_report(report_type, data):
+    """Renderiza um relatório e retorna os bytes do PDF (executado nos processos do pool)"""
+    from src.utils.pdf_generator import get_pdf_generator
+    return get_pdf_generator().render_report(report_type, data)
+
+
+def get_executor():
+    """
+    Retorna o pool de processos compartilhado (criado na primeira chamada)
+
+    Usa 'spawn' para não herdar threads do servidor; retorna None se o ambiente não
+    permitir processos filhos (ex.: alguns runtimes serverless), e o lote é renderizado
+    no próprio processo.
+    """
+    global _executor
+    if _executor is None and MAX_WORKERS > 1:
+        with _executor_lock:
+            if _executor is None:
+                try:
+                    _executor = ProcessPoolExecutor(
+                        max_workers=MAX_WORKERS,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                except (OSError, NotImplementedError, ValueError) as ex:
+                    logger.warning("Pool de processos indisponível, renderizando no processo atual: %s", ex)
+                    return None
+    return _executor
+
+
+class _ChunkStream(io.RawIOBase):
+    """Destino não-pesquisável do ZIP: acumula os bytes escritos até serem consumidos"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def take(self):
+        """Retorna e descarta os bytes acumulados"""
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _ImmediateFuture:
+    """Resultado já calculado com a interface de Future usada aqui"""
+
+    def __init__(self, fn, *args):
+        try:
+            self._result, self._error = fn(*args), None
+        except Exception as ex:
+            self._result, self._error = None, ex
+
+    def result(self):
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def _safe_name(name):
+    """Remove caracteres problemáticos de um nome de arquivo"""
+    return re.sub(r'[^\w.\- ]+', '_', str(name)).strip() or 'relatorio'
+
+
+def report_filename(index, report):
+    """Nome do arquivo de um relatório dentro do ZIP"""
+    name = report.get('name') or f"{index + 1:04d}_{report['type']}"
+    name = _safe_name(name)
+    return name if name.lower().endswith('.pdf') else f'{name}.pdf'
+
+
+def generate_zip(reports, workers=None):
+    """
+    Gera o ZIP com os relatórios, produzindo os bytes incrementalmente
+
+    reports: lista de {'type': 'thermal'|'condensation', 'data': {...}, 'name': opcional}
+    workers: limite de relatórios renderizando em paralelo (até MAX_WORKERS)
+    """
+    workers = max(1, min(workers or MAX_WORKERS, MAX_WORKERS))
+    executor = get_executor() if workers > 1 else None
+    stream = _ChunkStream()
+    manifest = {'generatedAt': datetime.now().isoformat(timespec='seconds'), 'total': len(reports),
+                'files': [], 'failures': []}
+    used_names = set()
+
+    def submit(index):
+        report = reports[index]
+        if executor is None:
+            return _ImmediateFuture(render_report, report['type'], report.get('data', {}))
+        return executor.submit(render_report, report['type'], report.get('data', {}))
+
+    with zipfile.ZipFile(stream, 'w', compression=zipfile.ZIP_STORED) as archive:
+        pending = deque()
+        next_index = 0
+        while next_index < len(reports) or pending:
+            # Mantém no máximo 'workers' relatórios em andamento (memória limitada)
+            while next_index < len(reports) and len(pending) < workers:
+                pending.append((next_index, submit(next_index)))
+                next_index += 1
+
+            index, future = pending.popleft()
+            report = reports[index]
+            try:
+                pdf_bytes = future.result()
+            except Exception as ex:
+                logger.warning("Falha ao gerar relatório %d (%s): %s", index, report.get('type'), ex)
+                manifest['failures'].append({'index': index, 'name': report.get('name'), 'error': str(ex)})
+            else:
+                filename = report_filename(index, report)
+                if filename in used_names:
+                    filename = f'{index + 1:04d}_{filename}'
+                used_names.add(filename)
+                archive.writestr(zipfile.ZipInfo(filename, date_time=datetime.now().timetuple()[:6]), pdf_bytes)
+                manifest['files'].append({'index': index, 'file': filename, 'bytes': len(pdf_bytes)})
+            del future
+            chunk = stream.take()
+            if chunk:
+                yield chunk
+
+        archive.writestr(zipfile.ZipInfo('manifest.json', date_time=datetime.now().timetuple()[:6]),
+                         json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8'))
+    yield stream.take()
@@ -5,58 +5,126 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
 from reportlab.pdfgen import canvas
+from reportlab.lib.utils import ImageReader
 from datetime import datetime
+from io import BytesIO
 import os
+import threading
+
+# Imagens de fundo por tipo de relatório
+BACKGROUND_FILES = {
+    'thermal': 'fundo_relatorio.png',
+    'condensation': 'fundo_relatorio_frio.png',
+}
+
+# Resolução das imagens de fundo embutidas no PDF (A4 a 150 dpi)
+BACKGROUND_DPI = 150
+BACKGROUND_JPEG_QUALITY = 88
+
+_styles = None
+_backgrounds = {}
+_cache_lock = threading.Lock()
+
+def get_styles():
+    """Retorna a folha de estilos do relatório, criada uma única vez por processo"""
+    global _styles
+    if _styles is None:
+        with _cache_lock:
+            if _styles is None:
+                styles = getSampleStyleSheet()
+                PDFGenerator.setup_custom_styles(styles)
+                _styles = styles
+    return _styles
+
+def get_background_image(report_type='thermal'):
+    """
+    Retorna um ImageReader da imagem de fundo do relatório (ou None se não existir)
+
+    O PNG original é lido, reduzido para BACKGROUND_DPI e recodificado em JPEG uma única
+    vez por processo; o ReportLab embute JPEG sem recomprimir, então cada página só
+    copia os bytes já prontos. Um ImageReader novo é criado sobre os bytes em cache
+    a cada uso, para que threads diferentes não compartilhem a posição de leitura.
+    """
+    filename = BACKGROUND_FILES.get(report_type, BACKGROUND_FILES['thermal'])
+    data = _backgrounds.get(filename)
+    if data is None:
+        with _cache_lock:
+            data = _backgrounds.get(filename)
+            if data is None:
+                data = _backgrounds[filename] = _load_background(filename)
+    return ImageReader(BytesIO(data)) if data else None
+
+def _load_background(filename):
+    """Lê, reduz e recodifica em JPEG uma imagem de fundo (b'' se o arquivo não existir)"""
+    from PIL import Image as PILImage
+
+    background_path = os.path.join(os.path.dirname(__file__), '..', 'static', filename)
+    if not os.path.exists(background_path):
+        return b''
+    with PILImage.open(background_path) as image:
+        image = image.convert('RGB')
+        width = int(A4[0] / inch * BACKGROUND_DPI)
+        if image.width > width:
+            image = image.resize((width, round(image.height * width / image.width)), PILImage.LANCZOS)
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', quality=BACKGROUND_JPEG_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+def preload_backgrounds():
+    """Decodifica antecipadamente todas as imagens de fundo"""
+    for report_type in BACKGROUND_FILES:
+        get_background_image(report_type)
 
 class PDFGenerator:
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.setup_custom_styles()
+        # Estilos compartilhados entre instâncias (somente leitura durante a geração)
+        self.styles = get_styles()
     
-    def setup_custom_styles(self):
+    @staticmethod
+    def setup_custom_styles(styles):
         """Configura estilos customizados para o PDF"""
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomTitle',
-            parent=self.styles['Title'],
+            parent=styles['Title'],
             fontSize=22,
             spaceAfter=20,
             alignment=TA_CENTER,
             textColor=colors.HexColor('#1976D2')
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='GreenTitleStyle',
-            parent=self.styles['CustomTitle'], # Herda do título principal
+            parent=styles['CustomTitle'], # Herda do título principal
             textColor=colors.HexColor('#7CB342') # Muda a cor para verde
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomSubtitle',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=16,
             spaceAfter=12,
             alignment=TA_CENTER,
             textColor=colors.HexColor('#424242')
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomNormal',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=11,
             spaceAfter=6,
             leading=14,
             alignment=TA_LEFT
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='JustifyNormal',
-            parent=self.styles['CustomNormal'],
+            parent=styles['CustomNormal'],
             alignment=TA_JUSTIFY
         ))
 
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ResultValueStyle',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=15,
             fontName='Helvetica-Bold',
             alignment=TA_CENTER,
@@ -64,43 +132,56 @@ class PDFGenerator:
             leading=16
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ResultLabelStyle',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=8,
             alignment=TA_CENTER,
             textColor=colors.HexColor('#424242'),
             leading=9
         ))
         
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='FooterStyle',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=8,
             alignment=TA_RIGHT,
             textColor=colors.black
         ))
 
         # NOVO ESTILO - Valor do resultado em azul
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ResultValueStyleBlue',
-            parent=self.styles['ResultValueStyle'], # Herda as propriedades do estilo verde
+            parent=styles['ResultValueStyle'], # Herda as propriedades do estilo verde
             textColor=colors.HexColor('#1976D2')  # Mas troca a cor para o azul do título
         ))
 
     def add_background_image(self, canvas, doc, report_type='thermal'):
         """Adiciona a imagem de fundo ao PDF com base no tipo de relatório"""
-        if report_type == 'condensation':
-            filename = 'fundo_relatorio_frio.png'
+        background = get_background_image(report_type)
+        if background is not None:
+            canvas.drawImage(background, 0, 0, width=A4[0], height=A4[1], preserveAspectRatio=False)
+
+    def render_report(self, report_type, data):
+        """
+        Gera o relatório ('thermal' ou 'condensation') em memória e retorna os bytes do PDF
+
+        Se o payload não trouxer 'results', eles são calculados pelo motor térmico
+        (os mesmos números da API).
+        """
+        from src.models.thermal_engine import completar_resultados
+        data = completar_resultados(report_type, data)
+        buffer = BytesIO()
+        if report_type == 'thermal':
+            self.generate_thermal_report(data, buffer)
+        elif report_type == 'condensation':
+            self.generate_condensation_report(data, buffer)
         else:
-            filename = 'fundo_relatorio.png'
-        
-        background_path = os.path.join(os.path.dirname(__file__), '..', 'static', filename)
-        if os.path.exists(background_path):
-            canvas.drawImage(background_path, 0, 0, width=A4[0], height=A4[1], preserveAspectRatio=False)
+            raise ValueError(f"Tipo de relatório inválido: {report_type}")
+        return buffer.getvalue()
 
     def generate_thermal_report(self, data, output_path):
-        """Gera relatório PDF para cálculo térmico com o design final de cards"""
+        """Gera relatório PDF para cálculo térmico com o design final de cards (output_path: caminho ou arquivo binário)"""
         
         def footer_canvas(canvas, doc):
             canvas.saveState()
@@ -206,7 +287,7 @@ class PDFGenerator:
         return output_path
 
     def generate_condensation_report(self, data, output_path):
-        """Gera relatório PDF para cálculo de condensação com o novo design"""
+        """Gera relatório PDF para cálculo de condensação com o novo design (output_path: caminho ou arquivo binário)"""
         
         def footer_canvas(canvas, doc):
             canvas.saveState()
@@ -287,4 +368,13 @@ class PDFGenerator:
         on_each_page = lambda c, d: (self.add_background_image(c, d, report_type='condensation'), footer_canvas(c, d))
         doc.build(story, onFirstPage=on_each_page, onLaterPages=on_each_page)
         
-        return output_path
\ No newline at end of file
+        return output_path
+
+_generator = None
+
+def get_pdf_generator():
+    """Retorna o gerador de PDF compartilhado do processo"""
+    global _generator
+    if _generator is None:
+        _generator = PDFGenerator()
+    return _generator
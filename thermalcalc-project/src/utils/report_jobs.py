@@ -0,0 +1,184 @@
+"""
+Fila assíncrona de geração de relatórios PDF
+
+POST /api/reports enfileira um job e responde imediatamente; um pool limitado de
+threads renderiza com PDFGenerator. A fila tem tamanho máximo (backpressure: o
+chamador recebe QueueFullError em vez de acumular threads) e os PDFs prontos
+expiram por TTL e por um limite total de bytes em memória.
+"""
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from src.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Estados de um job
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+report_jobs_rejected = metrics.counter(
+    'thermalcalc_report_jobs_rejected_total',
+    'Jobs de relatório recusados por fila cheia'
+)
+
+
+class QueueFullError(Exception):
+    """Fila de relatórios cheia; retry_after indica em quantos segundos tentar de novo"""
+
+    def __init__(self, retry_after):
+        super().__init__("Fila de relatórios cheia")
+        self.retry_after = retry_after
+
+
+class ReportJob:
+    """Estado de um job de relatório"""
+
+    __slots__ = ('id', 'report_type', 'data', 'status', 'created_at', 'finished_at', 'result', 'error')
+
+    def __init__(self, report_type, data):
+        self.id = uuid.uuid4().hex
+        self.report_type = report_type
+        self.data = data
+        self.status = STATUS_QUEUED
+        self.created_at = time.time()
+        self.finished_at = None
+        self.result = None
+        self.error = None
+
+    def to_dict(self):
+        """Representação JSON do estado do job (sem os bytes do PDF)"""
+        return {
+            'jobId': self.id,
+            'type': self.report_type,
+            'status': self.status,
+            'createdAt': self.created_at,
+            'finishedAt': self.finished_at,
+            'bytes': len(self.result) if self.result is not None else None,
+            'error': self.error
+        }
+
+
+class ReportJobQueue:
+    """Fila limitada de jobs de relatório com pool fixo de threads"""
+
+    def __init__(self, workers=2, max_queue=32, ttl=600.0, max_bytes=200 * 1024 * 1024, render=None):
+        self.workers = workers
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._render = render
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._jobs = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._threads = []
+        self._render_time = 1.0  # média móvel do tempo de renderização (s)
+
+    def _start_workers(self):
+        """Inicia as threads do pool na primeira submissão"""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f'report-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _default_render(self, report_type, data):
+        from src.utils.pdf_generator import get_pdf_generator
+        return get_pdf_generator().render_report(report_type, data)
+
+    def _worker(self):
+        render = self._render or self._default_render
+        while True:
+            job = self._queue.get()
+            try:
+                job.status = STATUS_RUNNING
+                inicio = time.perf_counter()
+                result = render(job.report_type, job.data)
+                duracao = time.perf_counter() - inicio
+                with self._lock:
+                    self._render_time = 0.8 * self._render_time + 0.2 * duracao
+                    job.result = result
+                    job.data = None
+                    job.status = STATUS_DONE
+                    job.finished_at = time.time()
+                    self._bytes += len(result)
+                    self._enforce_limits()
+            except Exception as ex:
+                logger.warning("Falha no job de relatório %s: %s", job.id, ex)
+                with self._lock:
+                    job.error = str(ex)
+                    job.data = None
+                    job.status = STATUS_FAILED
+                    job.finished_at = time.time()
+            finally:
+                self._queue.task_done()
+
+    def _enforce_limits(self):
+        """Remove jobs finalizados expirados e, se preciso, os mais antigos até caber no limite de bytes"""
+        agora = time.time()
+        for job_id in list(self._jobs):
+            job = self._jobs[job_id]
+            if job.finished_at is not None and job.finished_at + self.ttl < agora:
+                self._remove(job_id)
+        for job_id in list(self._jobs):
+            if self._bytes <= self.max_bytes:
+                break
+            if self._jobs[job_id].status == STATUS_DONE:
+                self._remove(job_id)
+
+    def _remove(self, job_id):
+        job = self._jobs.pop(job_id)
+        if job.result is not None:
+            self._bytes -= len(job.result)
+
+    def retry_after(self):
+        """Estimativa (s) de quando a fila terá espaço"""
+        return max(1, int(round(self._render_time * max(1, self._queue.qsize()) / self.workers)))
+
+    def submit(self, report_type, data):
+        """Enfileira um job e retorna-o; levanta QueueFullError se a fila estiver cheia"""
+        job = ReportJob(report_type, data)
+        with self._lock:
+            self._enforce_limits()
+            self._start_workers()
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                report_jobs_rejected.inc()
+                raise QueueFullError(self.retry_after()) from None
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id):
+        """Retorna o job (ou None se não existir ou tiver expirado)"""
+        with self._lock:
+            self._enforce_limits()
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        """Ocupação da fila e da memória de resultados"""
+        with self._lock:
+            self._enforce_limits()
+            return {
+                'queued': self._queue.qsize(),
+                'jobs': len(self._jobs),
+                'bytes': self._bytes,
+                'workers': self.workers
+            }
+
+
+# Instância global para uso na aplicação
+report_queue = ReportJobQueue(
+    workers=int(os.environ.get('THERMALCALC_REPORT_WORKERS', 2)),
+    max_queue=int(os.environ.get('THERMALCALC_REPORT_QUEUE', 32)),
+    ttl=float(os.environ.get('THERMALCALC_REPORT_TTL', 600)),
+    max_bytes=int(os.environ.get('THERMALCALC_REPORT_MAX_BYTES', 200 * 1024 * 1024))
+)
@@ -0,0 +1,110 @@
+"""
+Amostragem de distribuições e resumo estatístico para a análise de incerteza (Monte Carlo)
+
+Cada parâmetro incerto é descrito por um número (valor fixo) ou por um objeto
+{"type": "normal"|"uniform"|"triangular", ...}; as amostras são geradas com NumPy
+e resolvidas de uma vez pelo solver vetorizado.
+"""
+import numpy as np
+
+# Limite de amostras por requisição
+MAX_AMOSTRAS = 100000
+AMOSTRAS_PADRAO = 10000
+PERCENTIS_PADRAO = (5, 50, 95)
+
+
+class DistribuicaoInvalida(ValueError):
+    """Descrição de distribuição inválida (mensagem pronta para o cliente)"""
+
+
+def _numero(spec, campo, nome):
+    valor = spec.get(campo)
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)) or not np.isfinite(valor):
+        raise DistribuicaoInvalida(f"{nome}: campo numérico obrigatório '{campo}'")
+    return float(valor)
+
+
+def valor_nominal(spec, nome, padrao=None):
+    """
+    Valor central da distribuição (média, ponto médio ou moda), usado nas validações
+
+    Retorna None se spec não for um número finito nem uma distribuição conhecida;
+    levanta DistribuicaoInvalida se um parâmetro usado não for numérico.
+    """
+    if spec is None:
+        return padrao
+    if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+        return float(spec) if np.isfinite(spec) else None
+    if not isinstance(spec, dict):
+        return None
+    tipo = spec.get('type')
+    if tipo == 'normal':
+        return _numero(spec, 'mean', nome)
+    if tipo == 'uniform':
+        return (_numero(spec, 'min', nome) + _numero(spec, 'max', nome)) / 2
+    if tipo == 'triangular':
+        return _numero(spec, 'mode', nome)
+    return None
+
+
+def amostrar(spec, n, rng, nome, padrao=None, minimo=None, maximo=None):
+    """
+    Gera n amostras da distribuição descrita por spec
+
+    spec: número (fixo), None (usa o padrão) ou {"type": "normal", "mean", "std"[, "min", "max"]},
+    {"type": "uniform", "min", "max"} ou {"type": "triangular", "min", "mode", "max"}.
+    minimo/maximo limitam fisicamente as amostras (ex.: emissividade entre 0 e 1).
+    """
+    if spec is None:
+        spec = padrao
+    if spec is None:
+        raise DistribuicaoInvalida(f"Campo obrigatório: {nome}")
+
+    if isinstance(spec, (int, float)) and not isinstance(spec, bool):
+        if not np.isfinite(spec):
+            raise DistribuicaoInvalida(f"{nome}: informe um número ou uma distribuição")
+        amostras = np.full(n, float(spec))
+    elif isinstance(spec, dict):
+        tipo = spec.get('type')
+        if tipo == 'normal':
+            media, desvio = _numero(spec, 'mean', nome), _numero(spec, 'std', nome)
+            if desvio < 0:
+                raise DistribuicaoInvalida(f"{nome}: 'std' deve ser não negativo")
+            amostras = rng.normal(media, desvio, n)
+            if 'min' in spec or 'max' in spec:
+                lo = _numero(spec, 'min', nome) if 'min' in spec else -np.inf
+                hi = _numero(spec, 'max', nome) if 'max' in spec else np.inf
+                amostras = np.clip(amostras, lo, hi)
+        elif tipo == 'uniform':
+            lo, hi = _numero(spec, 'min', nome), _numero(spec, 'max', nome)
+            if hi < lo:
+                raise DistribuicaoInvalida(f"{nome}: 'max' deve ser maior ou igual a 'min'")
+            amostras = rng.uniform(lo, hi, n)
+        elif tipo == 'triangular':
+            lo, moda, hi = _numero(spec, 'min', nome), _numero(spec, 'mode', nome), _numero(spec, 'max', nome)
+            if not lo <= moda <= hi:
+                raise DistribuicaoInvalida(f"{nome}: exige min <= mode <= max")
+            amostras = rng.triangular(lo, moda, hi, n) if hi > lo else np.full(n, moda)
+        else:
+            raise DistribuicaoInvalida(f"{nome}: tipo de distribuição inválido (use normal, uniform ou triangular)")
+    else:
+        raise DistribuicaoInvalida(f"{nome}: informe um número ou uma distribuição")
+
+    if minimo is not None or maximo is not None:
+        amostras = np.clip(amostras, minimo if minimo is not None else -np.inf, maximo if maximo is not None else np.inf)
+    return amostras
+
+
+def resumir(valores, percentis=PERCENTIS_PADRAO, casas=3):
+    """Média, desvio padrão, extremos e percentis de um array (ignorando NaN)"""
+    valores = valores[np.isfinite(valores)]
+    if valores.size == 0:
+        return None
+    pontos = np.percentile(valores, percentis)
+    return {
+        'mean': round(float(valores.mean()), casas),
+        'std': round(float(valores.std()), casas),
+        'min': round(float(valores.min()), casas),
+        'max': round(float(valores.max()), casas),
+        'percentiles': {f'p{p:g}': round(float(v), casas) for p, v in zip(percentis, pontos)}
+    }
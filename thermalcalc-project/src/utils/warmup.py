@@ -0,0 +1,208 @@
+"""
+Aquecimento da aplicação na inicialização (cold start)
+
+create_app() executa as etapas abaixo para que a primeira requisição de cada
+instância não pague a compilação das fórmulas k(T), o primeiro solve de cada
+geometria e, opcionalmente, o import do ReportLab e a decodificação das imagens
+de fundo dos PDFs. O estado fica em estado_aquecimento e é exposto em /api/ready;
+o tempo de import dos módulos também é registrado e comparado com um orçamento.
+"""
+import logging
+import threading
+import time
+
+import numpy as np
+
+from src.utils.metrics import metrics, BUCKETS_LATENCIA
+
+logger = logging.getLogger(__name__)
+
+# Modos de aquecimento (THERMALCALC_WARMUP)
+MODO_SINCRONO = 'sync'
+MODO_SEGUNDO_PLANO = 'background'
+MODO_DESLIGADO = 'off'
+MODOS_AQUECIMENTO = (MODO_SINCRONO, MODO_SEGUNDO_PLANO, MODO_DESLIGADO)
+
+# Estados do aquecimento
+STATUS_PENDING = 'pending'
+STATUS_RUNNING = 'running'
+STATUS_READY = 'ready'
+STATUS_FAILED = 'failed'
+
+# Orçamento padrão para o import dos módulos da aplicação (ms)
+ORCAMENTO_IMPORT_MS = 1000
+
+# Condição do solve representativo de cada geometria
+TQ_AQUECIMENTO = 200.0
+TO_AQUECIMENTO = 25.0
+ESPESSURA_AQUECIMENTO_M = 0.05
+DIAMETRO_AQUECIMENTO_M = 0.1143
+
+warmup_duration = metrics.histogram(
+    'thermalcalc_warmup_duration_seconds',
+    'Duração do import e das etapas de aquecimento na inicialização',
+    BUCKETS_LATENCIA, rotulos=('etapa',)
+)
+
+
+def compilar_k_funcs():
+    """Avalia k(T), a versão vetorial e a média integral de cada material do catálogo"""
+    from src.models.materials_internal import materials_db
+    from src.utils.k_func import k_func_registry
+
+    for material in materials_db.get_materials():
+        T1, T2 = float(material['t_min']), float(material['t_max'])
+        k_func_registry.obter(material['k_func'])(T2)
+        k_func_registry.obter_vetorial(material['k_func'])(np.array([T1, T2]))
+        integral = k_func_registry.obter_integral(material['k_func'])
+        integral.media(T1, T2)
+        integral.media_vetorial(np.array([T1]), np.array([T2]))
+
+
+def serializar_catalogos():
+    """Garante os catálogos pré-serializados (JSON + ETag) em memória"""
+    from src.models.materials_internal import materials_db
+
+    for nome in ('materials', 'finishes', 'fuels', 'pipes'):
+        materials_db.get_catalog_json(nome)
+
+
+def resolver_geometrias():
+    """Um solve representativo por geometria, escalar (motor) e vetorial"""
+    from src.models.materials_internal import materials_db
+    from src.models.thermal_engine import CasoTermico, resolver, resolver_vetorial
+    from src.routes.thermal_calc_vetorial import GEOMETRIAS, GEOMETRIA_PLANA
+
+    material = next(m for m in materials_db.get_materials() if m['t_min'] <= TQ_AQUECIMENTO <= m['t_max'])
+    emissividade = materials_db.get_finishes()[0]['emissividade']
+    for geometry in GEOMETRIAS:
+        diametro = None if geometry == GEOMETRIA_PLANA else DIAMETRO_AQUECIMENTO_M
+        resolver(CasoTermico(
+            Tq=TQ_AQUECIMENTO, To=TO_AQUECIMENTO, espessuras_m=(ESPESSURA_AQUECIMENTO_M,),
+            k_funcs=(material['k_func'],), geometry=geometry, emissividade=emissividade,
+            pipe_diameter_m=diametro
+        ))
+        resolver_vetorial(
+            np.array([TQ_AQUECIMENTO]), TO_AQUECIMENTO, ESPESSURA_AQUECIMENTO_M, material['k_func'],
+            geometry, emissividade, diametro
+        )
+
+
+def carregar_reportlab():
+    """Importa o ReportLab e cria o gerador de PDF compartilhado (estilos)"""
+    from src.utils.pdf_generator import get_pdf_generator
+
+    get_pdf_generator()
+
+
+def carregar_fundos_pdf():
+    """Decodifica e recodifica as imagens de fundo dos relatórios"""
+    from src.utils.pdf_generator import preload_backgrounds
+
+    preload_backgrounds()
+
+
+# Etapas na ordem de execução: (nome, função, somente com aquecimento dos PDFs)
+ETAPAS = (
+    ('k_funcs', compilar_k_funcs, False),
+    ('catalogos', serializar_catalogos, False),
+    ('solver', resolver_geometrias, False),
+    ('reportlab', carregar_reportlab, True),
+    ('fundos_pdf', carregar_fundos_pdf, True),
+)
+
+
+class EstadoAquecimento:
+    """Estado do aquecimento e tempo de import do processo (thread-safe)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.status = STATUS_PENDING
+        self.modo = None
+        self.etapas = {}
+        self.erro = None
+        self.duracao = None
+        self.tempo_import = None
+        self.orcamento_import = None
+        self._thread = None
+
+    def registrar_import(self, segundos, orcamento_ms=ORCAMENTO_IMPORT_MS):
+        """Registra o tempo de import dos módulos e avisa se passou do orçamento"""
+        with self._lock:
+            self.tempo_import = segundos
+            self.orcamento_import = orcamento_ms / 1000
+        warmup_duration.observe(segundos, etapa='import')
+        if segundos * 1000 > orcamento_ms:
+            logger.warning("Import da aplicação levou %.0f ms (orçamento de %d ms)", segundos * 1000, orcamento_ms)
+
+    def iniciar(self, modo=MODO_SINCRONO, incluir_pdf=False):
+        """Executa as etapas no modo pedido ('sync', 'background' ou 'off')"""
+        if modo not in MODOS_AQUECIMENTO:
+            raise ValueError(f"Modo de aquecimento inválido: {modo} (use {', '.join(MODOS_AQUECIMENTO)})")
+        with self._lock:
+            if self.status in (STATUS_RUNNING, STATUS_READY):
+                return
+            self.modo = modo
+            if modo == MODO_DESLIGADO:
+                self.status = STATUS_READY
+                return
+            self.status = STATUS_RUNNING
+        etapas = [(nome, funcao) for nome, funcao, pdf in ETAPAS if incluir_pdf or not pdf]
+        if modo == MODO_SEGUNDO_PLANO:
+            self._thread = threading.Thread(target=self._executar, args=(etapas,), name='aquecimento', daemon=True)
+            self._thread.start()
+        else:
+            self._executar(etapas)
+
+    def _executar(self, etapas):
+        inicio = time.perf_counter()
+        for nome, funcao in etapas:
+            inicio_etapa = time.perf_counter()
+            try:
+                funcao()
+            except Exception as ex:
+                logger.warning("Falha na etapa de aquecimento %s: %s", nome, ex)
+                with self._lock:
+                    self.status, self.erro = STATUS_FAILED, f"{nome}: {ex}"
+                    self.duracao = time.perf_counter() - inicio
+                return
+            duracao = time.perf_counter() - inicio_etapa
+            warmup_duration.observe(duracao, etapa=nome)
+            with self._lock:
+                self.etapas[nome] = duracao
+        with self._lock:
+            self.status = STATUS_READY
+            self.duracao = time.perf_counter() - inicio
+
+    def aguardar(self, timeout=None):
+        """Espera o aquecimento em segundo plano terminar; retorna True se estiver pronto"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        return self.pronto
+
+    @property
+    def pronto(self):
+        return self.status == STATUS_READY
+
+    def resumo(self):
+        """Estado para o endpoint de prontidão (tempos em ms)"""
+        def ms(segundos):
+            return None if segundos is None else round(segundos * 1000, 1)
+
+        with self._lock:
+            return {
+                'status': self.status,
+                'modo': self.modo,
+                'etapas': {nome: ms(duracao) for nome, duracao in self.etapas.items()},
+                'duracaoMs': ms(self.duracao),
+                'erro': self.erro,
+                'importMs': ms(self.tempo_import),
+                'orcamentoImportMs': ms(self.orcamento_import),
+                'importDentroDoOrcamento': None if self.tempo_import is None
+                else self.tempo_import <= self.orcamento_import
+            }
+
+
+# Instância global para uso na aplicação
+estado_aquecimento = EstadoAquecimento()